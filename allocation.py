@@ -0,0 +1,209 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Optimized share of the gain between the inversor stages
+
+The calculators give every inversor the same gain, gain**(1/inversors), but the stages are not
+alike: each one has its own RC, is loaded by the next one and has its own headroom. This module
+takes the gain of each inversor as a free variable, only their product is fixed, and searches the
+share that maximizes the output swing (the smallest swing of the stages, referred to the output) or
+minimizes the supply current, without making the real gain less accurate than with the equal share
+(unless a tolerance is given). The gains are moved in log space around the best share found so far,
+a batch of candidates at a time designed with the `batch` module and evaluated with the `analysis`
+module, and the step shrinks after every batch, so the search ends in a few milliseconds.
+
+..note::
+    This module depends on `numpy`, on the `batch` module and on the `analysis` module
+    <https://numpy.org/doc/stable/>
+"""
+
+import functools
+from typing import NamedTuple, Tuple
+
+import numpy as np #Used to design and evaluate every candidate of a batch at once
+
+from analysis import VCE_MIN, evaluateStage, stageArrays
+from batch import designTopologyBatch
+from engine import Design, TABLES, designCascade
+
+#Objectives of the search and True for the ones that are better when they are larger
+OBJECTIVES = {"swing": True, "current": False}
+#Candidates designed in each batch
+CANDIDATES = 128
+#Maximum number of batches
+ITERATIONS = 20
+#First step of the search, in log(gain) of each stage
+STEP = 1.0
+#Factor of the step after each batch
+SHRINK = 0.6
+#The search stops when the step is smaller than this
+MIN_STEP = 1e-3
+#Lowest gain of an inversor
+MIN_STAGE_GAIN = 1.2
+#Relative gain error accepted above the one of the equal share, 0 keeps the gain as accurate as the
+#equal share
+TOLERANCE = 0.0
+#Relative improvement over the equal share needed to change the gains
+MIN_IMPROVEMENT = 0.01
+#Seed of the candidates, the same design always gets the same share
+SEED = 0
+
+class Allocation(NamedTuple):
+    """
+    Result of the search of the gain of each inversor
+
+        Parameters
+        ----------
+        design: Design
+            The design with the gains found, the same design if no share is MIN_IMPROVEMENT better
+        gains: tuple
+            Gain of each inversor from the input to the output
+        swing: Float
+            Peak to peak output swing of the design
+        current: Float
+            Current drawn from Vcc by the design
+        gainError: Float
+            Relative error of the gain of the design
+        tolerance: Float
+            Largest relative gain error that was accepted, the one of the equal share plus the tolerance asked
+        evaluations: Int
+            Number of candidates designed
+
+    """
+
+    design: Design
+    gains: Tuple[float, ...]
+    swing: float
+    current: float
+    gainError: float
+    tolerance: float
+    evaluations: int
+
+def evaluateShares(name, gain, beta, vcc, choices, gains):
+    """
+    Designs and evaluates many shares of the gain for the same design
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        choices: tuple
+            Index of the resistor used in each table
+        gains: ndarray
+            An array (size, inversors) with the gain of each inversor from the input to the output
+
+        Return
+        -------
+        A dict of arrays: swing (smallest swing of the stages referred to the output), current, gainError
+        and valid (False for negative resistors or saturated stages)
+
+    """
+
+    size = len(gains)
+    dual = name.endswith("Dual")
+    records = designTopologyBatch(name, np.full(size, gain), np.full(size, beta), np.full(size, vcc), choices, gains=gains)
+    valid = np.ones(size, dtype=bool)
+    for field in records.dtype.names:
+        if field[:2] in ("RC", "RE", "R1", "R2", "RB"):
+            valid &= records[field] > 0
+    current = 0
+    total = 1
+    swing = np.inf
+    load = None
+    with np.errstate(all="ignore"):
+        #From the output, the swing of a stage is multiplied by the gain of the stages after it
+        for suffix, stage in reversed(stageArrays(name, records)):
+            values = evaluateStage(stage, records["beta"], records["vcc"], dual, load)
+            valid &= values["VCE"] > VCE_MIN
+            RL = stage["RC"] if "RC" in stage else stage["RE"]
+            RL = RL if load is None else (1/RL+1/load)**-1
+            IE = values["IC"] if "RC" in stage else values["IC"]+values["IB"]
+            stageSwing = 2*np.maximum(np.minimum(values["VCE"]-VCE_MIN, IE*RL), 0)
+            swing = np.minimum(swing, stageSwing*total)
+            total = total*values["gain"]
+            current = current+values["current"]
+            load = values["Rin"]
+        gainError = np.abs(total-gain)/gain
+    valid &= np.isfinite(swing) & np.isfinite(current) & np.isfinite(gainError)
+    return {"swing": swing, "current": current, "gainError": gainError, "valid": valid}
+
+def _shares(center, step, size, rng):
+    #Candidates around the center (the first one), the last log gain keeps the sum of the others
+    moves = rng.uniform(-step, step, (size, center.size))
+    moves[0] = 0
+    logs = center+moves
+    return logs-(logs.mean(axis=1, keepdims=True)-center.mean())
+
+@functools.lru_cache(maxsize=4096)
+def allocate(design, objective="swing", tolerance=TOLERANCE, candidates=CANDIDATES, iterations=ITERATIONS, seed=SEED):
+    """
+    Searches the gain of each inversor of a design that optimizes an objective, keeping its resistor
+    tables choices and the product of the gains
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        objective: str
+            "swing" to maximize the output swing or "current" to minimize the supply current
+        tolerance: Float
+            Relative gain error accepted above the one of the equal share
+        candidates: Int
+            Candidates designed in each batch
+        iterations: Int
+            Maximum number of batches
+        seed: Int
+            Seed of the candidates
+
+        Return
+        -------
+        The Allocation, the gain error of the design found is not larger than the one of the equal share
+        plus tolerance and every stage has a gain of MIN_STAGE_GAIN or more
+
+    """
+
+    if objective not in OBJECTIVES:
+        raise ValueError("objective must be one of %s" % ", ".join(OBJECTIVES))
+    name, gain, beta, vcc = design.topology, design.gain, design.beta, design.vcc
+    n = len(TABLES[name])-design.follower
+    rng = np.random.default_rng(seed)
+    sign = -1 if OBJECTIVES[objective] else 1
+    center = np.full(n, np.log(gain)/n)
+    equal = best = None
+    step = STEP
+    evaluations = 0
+    for _ in range(iterations if n > 1 else 1):
+        logs = _shares(center, step, candidates if n > 1 else 1, rng)
+        values = evaluateShares(name, gain, beta, vcc, design.choices, np.exp(logs))
+        evaluations += len(logs)
+        if equal is None:
+            #The equal share is the first candidate, the others can't make the real gain less accurate
+            limit = values["gainError"][0]+tolerance
+        feasible = values["valid"] & (values["gainError"] <= limit) & (logs.min(axis=1) >= np.log(MIN_STAGE_GAIN))
+        score = np.where(feasible, sign*values[objective], np.inf)
+        if equal is None:
+            equal = best = (score[0], logs[0], {field: float(value[0]) for field, value in values.items()})
+        k = int(np.argmin(score))
+        if score[k] < best[0]:
+            best = (score[k], logs[k], {field: float(value[k]) for field, value in values.items()})
+            center = logs[k]
+        step *= SHRINK
+        if step < MIN_STEP:
+            break
+    if np.isfinite(equal[0]) and equal[0]-best[0] < MIN_IMPROVEMENT*abs(equal[0]):
+        best = equal
+    _, logs, values = best
+    gains = tuple(float(g) for g in np.exp(logs))
+    if best is equal:
+        result = design
+    else:
+        table = TABLES[name]
+        resistors = [options[i] for options, i in zip(table, design.choices)][::-1]
+        result = design._replace(stages=designCascade(gain, beta, vcc, resistors, design.follower, design.dual, gains))
+    return Allocation(result, gains, values["swing"], values["current"], values["gainError"], float(limit), evaluations)
@@ -0,0 +1,191 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Evaluation of designed amplifiers from their resistors, over NumPy arrays
+
+The calculators choose the resistors assuming a collector current and VBE = 0.7 V. This module does
+the inverse work: from the resistors and beta it finds the bias of every stage with the Thevenin
+equivalent of its voltage divider, and the mid band gain with the same small signal expressions of
+the calculators (rpi = beta*0.025/IC, unbypassed RE, each stage loaded by the input of the next one).
+Every value is an array, so thousands of designs or Monte Carlo samples are evaluated at once.
+
+..note::
+    This module depends on `numpy` and on the `batch` module
+    <https://numpy.org/doc/stable/>
+"""
+
+import numpy as np #Used to evaluate every design as whole array operations
+
+from batch import stageFields
+
+#Thermal voltage used by the calculators
+VT = 0.025
+#Base to emitter voltage used by the calculators
+VBE = 0.7
+#Lowest collector to emitter voltage accepted in a stage, below it the transistor is near saturation
+VCE_MIN = 0.2
+
+def _parallel(*resistors):
+    return 1/sum(1/r for r in resistors)
+
+def stageArrays(name, records):
+    """
+    Splits the structured array of a design in one dict of arrays per stage
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        records: ndarray
+            Structured array from the batch module
+
+        Return
+        -------
+        A list of (suffix, dict) from the input to the output
+
+    """
+
+    return [(suffix, {field: records[field+suffix] for field in fields}) for suffix, fields in stageFields(name)]
+
+def designStages(design):
+    """
+    The resistors of each stage of a design of the engine module, as used by evaluateStages
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+
+        Return
+        -------
+        A list of (suffix, dict of floats) from the input to the output
+
+    """
+
+    n = len(design.stages)-design.follower
+    suffixes = ["_%d" % (i+1) for i in range(n)]+(["_S"] if design.follower else [])
+    out = []
+    for suffix, stage in zip(suffixes, design.stages):
+        if stage.RC is not None:
+            values = {"RC": stage.RC, "RE": stage.RE, "R1": stage.R1, "R2": stage.R2}
+        elif stage.R1 is not None:
+            values = {"RE": stage.RE, "R1": stage.R1, "R2": stage.R2}
+        else:
+            values = {"RE": stage.RE, "RB": stage.RB}
+        out.append((suffix, values))
+    return out
+
+def evaluateStage(stage, beta, vcc, dual=False, load=None):
+    """
+    Finds the bias and the gain of one stage
+
+        Parameters
+        ----------
+        stage: dict
+            Arrays of the resistors of the stage, the follower stage is the one without RC
+        beta: ndarray
+            The beta values
+        vcc: ndarray
+            The vcc values (and -Vee for the dual supply)
+        dual: bool
+            True for the dual supply design
+        load: ndarray
+            Input resistance of the next stage, None to leave the output open
+
+        Return
+        -------
+        A dict of arrays: IC, IB, VCE, gain (magnitude), Rin (input resistance of the stage) and
+        current (drawn from Vcc by the stage and its divider)
+
+    """
+
+    vee = -vcc if dual else 0*vcc
+    RE = stage["RE"]
+    if "RB" in stage and "R1" not in stage:
+        #Single supply follower, its base is fed by RB from Vcc
+        VTH, Rth = vcc, stage["RB"]
+        current = 0
+    else:
+        R1, R2 = stage["R1"], stage["R2"]
+        VTH, Rth = vee+(vcc-vee)*R2/(R1+R2), _parallel(R1, R2)
+        current = (vcc-vee)/(R1+R2)
+    IB = np.maximum((VTH-VBE-vee)/(Rth+(beta+1)*RE), 0)
+    IC = beta*IB
+    RC = stage.get("RC")
+    VCE = vcc-vee-IC*(0 if RC is None else RC)-(beta+1)*IB*RE
+    rpi = beta*VT/np.maximum(IC, 1e-300)
+    Req = rpi+(beta+1)*RE
+    if RC is None:
+        #Follower, the load of the last stage is not known so it is left open
+        RL = RE if load is None else _parallel(RE, load)
+        gain = (beta+1)*RL/(rpi+(beta+1)*RL)
+    else:
+        RL = RC if load is None else _parallel(RC, load)
+        gain = beta*RL/Req
+    return {"IC": IC, "IB": IB, "VCE": VCE, "gain": gain, "Rin": _parallel(Rth, Req), "current": current+IC+IB}
+
+def evaluateStages(stages, beta, vcc, dual=False):
+    """
+    Finds the bias and the gain of a chain of stages
+
+        Parameters
+        ----------
+        stages: list
+            (suffix, dict of arrays) from the input to the output, the follower stage is the one without RC
+        beta: ndarray
+            The beta values (it may have one value per stage as a list)
+        vcc: ndarray
+            The vcc values (and -Vee for the dual supply)
+        dual: bool
+            True for the dual supply design
+
+        Return
+        -------
+        A dict of arrays: gain (magnitude of the total gain), current (drawn from Vcc), power, Rin (input
+        resistance of the amplifier) and IC, IB, VCE of each stage with its suffix
+
+    """
+
+    betas = beta if isinstance(beta, (list, tuple)) else [beta]*len(stages)
+    out = {}
+    current = 0
+    gain = 1
+    load = None
+    #Each stage is loaded by the next one, so the chain is evaluated from the output
+    for (suffix, stage), b in reversed(list(zip(stages, betas))):
+        values = evaluateStage(stage, b, vcc, dual, load)
+        load = values["Rin"]
+        gain = values["gain"]*gain
+        current = values["current"]+current
+        out["IC"+suffix], out["IB"+suffix], out["VCE"+suffix] = values["IC"], values["IB"], values["VCE"]
+    vee = -vcc if dual else 0*vcc
+    out["gain"] = gain
+    out["current"] = current
+    out["power"] = current*(vcc-vee)
+    out["Rin"] = load
+    return out
+
+def evaluate(name, records, beta=None, vcc=None):
+    """
+    Finds the bias and the gain of designs from the batch module
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        records: ndarray
+            Structured array from the batch module
+        beta: ndarray
+            Beta values used instead of the ones of the records
+        vcc: ndarray
+            Vcc values used instead of the ones of the records
+
+        Return
+        -------
+        The dict of evaluateStages
+
+    """
+
+    beta = records["beta"] if beta is None else beta
+    vcc = records["vcc"] if vcc is None else vcc
+    return evaluateStages(stageArrays(name, records), beta, vcc, name.endswith("Dual"))
@@ -0,0 +1,373 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Batch designer, computes many amplifiers at once over NumPy arrays
+
+The equations are the same ones of the `engine` module, written as whole array operations so
+a design sweep of millions of points takes seconds. The roots of the equations are the kernels of
+the `kernels` module, solved once with sympy and loaded from a file afterwards, results only differ
+from `engine` when a value falls on a rounding tie.
+
+..note::
+    This module depends on `numpy` and on the `kernels` module
+    <https://numpy.org/doc/stable/>
+"""
+
+import numpy as np #Used to compute every design as whole array operations
+
+from engine import MAX_GAIN_DUAL, TABLES, VOFFSET, VC_DUAL, cascade, topology
+from kernels import load
+
+def _round(x):
+    """
+    Rounds to two decimals as the calculators do
+    """
+
+    return np.round(x, 2)
+
+def _kernel(name):
+    """
+    Kernel of an equation of the `kernels` module, solved once with sympy and then loaded from its file
+    """
+
+    return load()[name]
+
+def followerStage(beta, vcc, RE):
+    """
+    Array version of engine.followerStage
+
+        Parameters
+        ----------
+        beta: ndarray
+            The beta values
+        vcc: ndarray
+            The vcc values
+        RE: ndarray
+            The emitter resistors of the stage
+
+        Return
+        -------
+        A dict with the arrays RE, RB, IC and Rin
+
+    """
+
+    vce=(vcc)/2
+    RB=_round((0.7+vce)/((vce/RE)/beta))
+    Rin = (1/RB+1/(((beta*0.025)/(vce/RE))+(beta+1)*RE))**-1
+    return {"RE": RE, "RB": RB, "IC": vce/RE, "Rin": Rin}
+
+def inversorStage(gain, beta, vcc, RC, RL=None):
+    """
+    Array version of engine.inversorStage
+
+        Parameters
+        ----------
+        gain: ndarray
+            The gains required in the stage
+        beta: ndarray
+            The beta values
+        vcc: ndarray
+            The vcc values
+        RC: ndarray
+            The collector resistors of the stage
+        RL: ndarray
+            The input resistances of the next stage, None for the last stage
+
+        Return
+        -------
+        A dict with the arrays RC, RE, R1, R2, IC and Rin
+
+    """
+
+    vce=(vcc)/2
+    if RL is None:
+        RE = _round(_kernel("emitterResistanceUnloaded")(gain,beta,vce,RC))
+    else:
+        RE = _round(_kernel("emitterResistance")(gain,beta,vce,RC,RL))
+    IC=vce/(RE+RC)
+    R2=_round((beta)*RE/10)
+    VB=0.7+(IC*RE)
+    R1=_round((vcc*R2/VB)-R2)
+    Rin = (1/R1+1/R2+1/(((beta*0.025)/(vce/(RE+RC)))+(beta+1)*RE))**-1
+    return {"RC": RC, "RE": RE, "R1": R1, "R2": R2, "IC": IC, "Rin": Rin}
+
+def dualFollowerStage(beta, vcc, RE, Voffset=VOFFSET):
+    """
+    Array version of engine.dualFollowerStage
+
+        Parameters
+        ----------
+        beta: ndarray
+            The beta values
+        vcc: ndarray
+            The vcc values (and -Vee)
+        RE: ndarray
+            The emitter resistors of the stage
+        Voffset: Float
+            The emitter voltage assumed in the stage
+
+        Return
+        -------
+        A dict with the arrays RE, R1, R2, RB, IC and Rin
+
+    """
+
+    vee = -vcc
+    VE = Voffset
+    IE = (VE-vee)/RE
+    Rpi = (0.025*beta)/IE
+    Req = Rpi+((beta+1)*RE)
+    Rin = _round((Req)/2)
+    Rth = _round(_kernel("theveninResistance")(Req,Rin))
+    VB = 0.7 + VE
+    IB = IE/beta
+    VTH = ((IB*Rth)+VB)+vcc
+    Veq = VTH/((vcc-vee)-VTH)
+    R1 = _round(_kernel("dividerResistance")(Veq,Rth))
+    R2 = _round(Veq*R1)
+    return {"RE": RE, "R1": R1, "R2": R2, "RB": (1/R1+1/R2)**-1, "IC": IE, "Rin": Rin}
+
+def dualInversorStage(gain, beta, vcc, RC, RL, VC=VC_DUAL):
+    """
+    Array version of engine.dualInversorStage
+
+        Parameters
+        ----------
+        gain: ndarray
+            The gains required in the stage
+        beta: ndarray
+            The beta values
+        vcc: ndarray
+            The vcc values (and -Vee)
+        RC: ndarray
+            The collector resistors of the stage
+        RL: ndarray
+            The input resistances of the next stage
+        VC: Float
+            The collector voltage assumed in the stage
+
+        Return
+        -------
+        A dict with the arrays RC, RE, R1, R2, IC and Rin
+
+    """
+
+    vee = -vcc
+    VRC = vcc-VC
+    IC = VRC/RC
+    Rpi = (0.025*beta)/IC
+    RE = _round(_kernel("emitterResistanceDual")(gain,beta,Rpi,RC,RL))
+    Req = Rpi+((beta+1)*RE)
+    Rin = _round(Req/2)
+    Rth = _round(_kernel("theveninResistance")(Req,Rin))
+    VRE = RE*IC
+    VE = VRE+vee
+    VB = 0.7 + VE
+    IB = IC/beta
+    VTH = ((IB*Rth)+VB)+vcc
+    Veq = VTH/((vcc-vee)-VTH)
+    R1 = _round(_kernel("dividerResistance")(Veq,Rth))
+    R2 = _round(Veq*R1)
+    return {"RC": RC, "RE": RE, "R1": R1, "R2": R2, "IC": IC, "Rin": Rin}
+
+def stageFields(name):
+    """
+    Names of the values stored for each stage of a design, numbered from the input (1) to the
+    output, the follower stage uses the suffix _S as in makeCircuit
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+
+        Return
+        -------
+        A list of (suffix, fields) for each stage from the input to the output
+
+    """
+
+    dual = name.endswith("Dual")
+    follower = dual or name.endswith("F")
+    n = len(TABLES[name])-follower
+    stages = [("_%d" % (i+1), ("RC", "RE", "R1", "R2", "IC")) for i in range(n)]
+    if follower:
+        stages.append(("_S", ("RE", "R1", "R2", "RB", "IC") if dual else ("RE", "RB", "IC")))
+    return stages
+
+def recordType(name):
+    """
+    NumPy dtype of the structured array returned for a design
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+
+        Return
+        -------
+        The dtype
+
+    """
+
+    fields = [("index", np.int64), ("gain", np.float64), ("beta", np.float64), ("vcc", np.float64),
+              ("choices", np.int8, (len(TABLES[name]),))]
+    for suffix, names in stageFields(name):
+        fields += [(field+suffix, np.float64) for field in names]
+    return np.dtype(fields)
+
+def pickChoices(name, size, rng=None):
+    """
+    Picks randomly the resistor of each stage for many designs
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        size: Int
+            Number of designs
+        rng: Generator
+            NumPy random generator, a new one is created if it is None
+
+        Return
+        -------
+        An array (size, stages) with the index chosen in each table
+
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+    table = TABLES[name]
+    choices = np.zeros((size, len(table)), dtype=np.int8)
+    for j, options in enumerate(table):
+        if len(options) > 1:
+            choices[:, j] = rng.integers(0, len(options), size)
+    return choices
+
+def designTopologyBatch(name, gain, beta, vcc, choices=None, rng=None, voffset=VOFFSET, vc=VC_DUAL, gains=None):
+    """
+    Calculates every stage of a given design for arrays of inputs
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        gain: ndarray
+            The gain values
+        beta: ndarray
+            The beta values
+        vcc: ndarray
+            The vcc values
+        choices: ndarray
+            Index of the resistor used in each table, a tuple for every design or an array
+            (size, stages), they are picked randomly if it is None
+        rng: Generator
+            NumPy random generator used when choices is None
+        voffset: ndarray
+            Emitter voltage assumed in the follower of the dual supply design, one value or one per design
+        vc: ndarray
+            Collector voltage assumed in the inversors of the dual supply design, one value, one per design
+            or an array (size, inversors) with the inversors from the input to the output
+        gains: ndarray
+            Gain of each inversor, an array (size, inversors) or one row for every design, from the input
+            to the output. None gives every inversor gain**(1/inversors)
+
+        Return
+        -------
+        A structured array with one record per design
+
+    """
+
+    gain, beta, vcc = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (gain, beta, vcc)))
+    gain, beta, vcc = gain.ravel(), beta.ravel(), vcc.ravel()
+    size = gain.size
+    table = TABLES[name]
+    if choices is None:
+        choices = pickChoices(name, size, rng)
+    choices = np.broadcast_to(np.asarray(choices, dtype=np.int8), (size, len(table)))
+    dual = name.endswith("Dual")
+    follower = dual or name.endswith("F")
+    n = len(table)-follower
+    if gains is None:
+        gains = np.repeat((gain**(1/n))[:, None], n, axis=1)
+    gains = np.broadcast_to(np.asarray(gains, dtype=np.float64), (size, n))
+    voffset = np.broadcast_to(np.asarray(voffset, dtype=np.float64), (size,))
+    vc = np.asarray(vc, dtype=np.float64)
+    vc = np.broadcast_to(vc if vc.ndim == 2 else vc[..., None], (size, n))
+    stages = []
+    RL = None
+    for j, options in enumerate(table):
+        value = np.asarray(options, dtype=np.float64)[choices[:, j]]
+        if follower and j == 0:
+            stage = dualFollowerStage(beta, vcc, value, voffset) if dual else followerStage(beta, vcc, value)
+        elif dual:
+            #TABLES goes from the output, the columns of vc and gains from the input
+            stage = dualInversorStage(gains[:, n-j], beta, vcc, value, RL, vc[:, n-j])
+        else:
+            stage = inversorStage(gains[:, n-1-j+follower], beta, vcc, value, RL)
+        stages.append(stage)
+        RL = stage["Rin"]
+    stages.reverse()
+    out = np.empty(size, dtype=recordType(name))
+    out["index"] = np.arange(size)
+    out["gain"], out["beta"], out["vcc"], out["choices"] = gain, beta, vcc, choices
+    for (suffix, names), stage in zip(stageFields(name), stages):
+        for field in names:
+            out[field+suffix] = stage[field]
+    return out
+
+def designBatch(gain, beta, vcc, follower=False, dual=False, choices=None, rng=None):
+    """
+    Designs many amplifiers at once, each input goes to the design that makeCircuit would pick for its gain
+
+        Parameters
+        ----------
+        gain: ndarray
+            The gain values
+        beta: ndarray
+            The beta values
+        vcc: ndarray
+            The vcc values
+        follower: bool
+            True if a follower stage is added
+        dual: bool
+            True for the dual supply design, with more than four stages above MAX_GAIN_DUAL
+        choices: dict
+            Optional tuple of choices used for every design of a name, keyed by the name of the design
+        rng: Generator
+            NumPy random generator used for the designs without choices
+
+        Return
+        -------
+        A dict with a structured array for every design used, its field "index" is the position of
+        each record in the inputs
+
+    """
+
+    gain, beta, vcc = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (gain, beta, vcc)))
+    gain, beta, vcc = gain.ravel(), beta.ravel(), vcc.ravel()
+    if rng is None:
+        rng = np.random.default_rng()
+    if dual:
+        #Same number of stages as engine.dualStages
+        stages = np.full(gain.size, 4)
+        n = 4
+        while (gain > MAX_GAIN_DUAL**(n/4)).any():
+            stages[gain > MAX_GAIN_DUAL**(n/4)] = n+1
+            n += 1
+        groups = {cascade(n, dual=True): np.flatnonzero(stages == n) for n in np.unique(stages).tolist()}
+    else:
+        #Same ranges as makeCircuit, gains between 5 and 6 go to three stages there too
+        one = (2<=gain)&(gain<=5)
+        two = ~one&(6<=gain)&(gain<=25)
+        groups = {topology(2, follower): np.flatnonzero(one),
+                  topology(6, follower): np.flatnonzero(two),
+                  topology(26, follower): np.flatnonzero(~one&~two)}
+    results = {}
+    for name, index in groups.items():
+        if index.size == 0:
+            continue
+        picked = None if choices is None else choices.get(name)
+        out = designTopologyBatch(name, gain[index], beta[index], vcc[index], picked, rng)
+        out["index"] = index
+        results[name] = out
+    return results
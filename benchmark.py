@@ -0,0 +1,240 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Benchmark of the stage calculators
+
+Every calculator of `main` (calculateOneStage ... calculateThreeStagesF and the math of
+makeCircuitDual) is a call to engine.designTopology, this module times that call over a grid of
+inputs drawn from a fixed seed, with the design cache disabled so every call calculates. It reports
+the percentiles of the latency, the throughput and the peak memory of each calculator, saves them as
+JSON and compares them with a saved baseline.
+
+..note::
+    This module depends on `time`, `tracemalloc`, `json`, `argparse` and on the `engine` module
+    <https://docs.python.org/3/library/time.html>
+"""
+
+import argparse #Used to read the options of the command
+import gc #Used to keep the collector out of the timings
+import json #Used to save the results
+import platform #Used to describe the machine in the results
+import random #Used to draw the grid of inputs
+import sys #Used to write the report
+import time #Used to time every call
+import tracemalloc #Used to find the peak memory
+
+from engine import BETA_RANGE, VCC_RANGE, designTopology
+
+#Calculators of main and the design each one calculates
+TARGETS = {
+    "calculateOneStage": "OneStage",
+    "calculateTwoStages": "TwoStages",
+    "calculateThreeStages": "ThreeStages",
+    "calculateOneStageF": "OneStageF",
+    "calculateTwoStagesF": "TwoStagesF",
+    "calculateThreeStagesF": "ThreeStagesF",
+    "makeCircuitDual": "FourStagesDual",
+}
+#Gains used for each design, the ranges that makeCircuit and makeAmp2 send to it
+GAINS = {"OneStage": (2, 5), "TwoStages": (6, 25), "ThreeStages": (26, 125),
+         "OneStageF": (2, 5), "TwoStagesF": (6, 25), "ThreeStagesF": (26, 125), "FourStagesDual": (126, 250)}
+#Default seed of the grid
+SEED = 2023
+#Percentiles of the latency in the results
+PERCENTILES = (50, 90, 99)
+#Relative change of a value that is reported as a regression
+THRESHOLD = 0.1
+
+def points(name, count, seed=SEED):
+    """
+    Grid of inputs of a design, drawn from a seed
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        count: Int
+            Number of points
+        seed: Int
+            Seed of the grid
+
+        Return
+        -------
+        A list of (gain, beta, vcc, choices seed)
+
+    """
+
+    rng = random.Random("%d:%s" % (seed, name))
+    low, high = GAINS[name]
+    return [(rng.randint(low, high), rng.randint(*BETA_RANGE), rng.randint(*VCC_RANGE), rng.random()) for _ in range(count)]
+
+def _percentile(values, p):
+    #Values must be sorted, linear interpolation between the closest ranks
+    k = (len(values)-1)*p/100
+    i = int(k)
+    j = min(i+1, len(values)-1)
+    return values[i]+(values[j]-values[i])*(k-i)
+
+def run(name, grid, repeat=5):
+    """
+    Times the design of every point of a grid
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        grid: list
+            Points of points()
+        repeat: Int
+            Number of times the grid is designed
+
+        Return
+        -------
+        A dict with calls, the latency percentiles, mean and max in microseconds, throughput in calls
+        per second and peakMemory in bytes
+
+    """
+
+    rng = random.Random()
+    timer = time.perf_counter_ns
+    latencies = []
+    for gain, beta, vcc, seed in grid[:min(len(grid), 50)]:
+        designTopology(name, gain, beta, vcc, rng=rng, cache=None)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for gain, beta, vcc, seed in grid:
+                rng.seed(seed)
+                start = timer()
+                designTopology(name, gain, beta, vcc, rng=rng, cache=None)
+                latencies.append(timer()-start)
+    finally:
+        if enabled:
+            gc.enable()
+    #The memory is measured in its own pass, tracemalloc slows every allocation
+    tracemalloc.start()
+    for gain, beta, vcc, seed in grid:
+        rng.seed(seed)
+        designTopology(name, gain, beta, vcc, rng=rng, cache=None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    latencies.sort()
+    total = sum(latencies)
+    result = {"calls": len(latencies)}
+    for p in PERCENTILES:
+        result["p%d" % p] = _percentile(latencies, p)/1000
+    result["mean"] = total/len(latencies)/1000
+    result["max"] = latencies[-1]/1000
+    result["throughput"] = len(latencies)/(total/1e9)
+    result["peakMemory"] = peak
+    return result
+
+def benchmark(count=2000, repeat=5, seed=SEED, targets=None):
+    """
+    Times every calculator
+
+        Parameters
+        ----------
+        count: Int
+            Number of points of the grid of each calculator
+        repeat: Int
+            Number of times each grid is designed
+        seed: Int
+            Seed of the grids
+        targets: list
+            Names of the calculators, all of TARGETS if it is None
+
+        Return
+        -------
+        A dict with the description of the run in "meta" and the result of each calculator in "results"
+
+    """
+
+    meta = {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "system": platform.system(), "points": count, "repeat": repeat,
+            "seed": seed, "date": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    results = {}
+    for target in targets or TARGETS:
+        results[target] = run(TARGETS[target], points(TARGETS[target], count, seed), repeat)
+    return {"meta": meta, "results": results}
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """
+    Compares the results of two runs, the latencies and the memory are worse when they grow and
+    the throughput when it falls
+
+        Parameters
+        ----------
+        current: dict
+            Results of benchmark()
+        baseline: dict
+            Results of a previous run
+        threshold: Float
+            Relative change reported as a regression
+
+        Return
+        -------
+        A list of (calculator, value, baseline, current, change) of every regression
+
+    """
+
+    regressions = []
+    for target, values in current["results"].items():
+        old = baseline["results"].get(target)
+        if old is None:
+            continue
+        for field in ["p%d" % p for p in PERCENTILES]+["mean", "throughput", "peakMemory"]:
+            if not old.get(field):
+                continue
+            change = values[field]/old[field]-1
+            worse = -change if field == "throughput" else change
+            if worse > threshold:
+                regressions.append((target, field, old[field], values[field], change))
+    return regressions
+
+def main(argv=None):
+    """
+    Command line of the benchmark
+
+        Parameters
+        ----------
+        argv: list
+            The arguments, sys.argv[1:] if it is None
+
+        Return
+        -------
+        1 if there are regressions against the baseline, 0 otherwise
+
+    """
+
+    parser = argparse.ArgumentParser(prog="BJTpy benchmark", description="Times the stage calculators")
+    parser.add_argument("--points", type=int, default=2000, help="points of the grid of each calculator")
+    parser.add_argument("--repeat", type=int, default=5, help="times each grid is designed")
+    parser.add_argument("--seed", type=int, default=SEED, help="seed of the grids")
+    parser.add_argument("--only", nargs="+", choices=list(TARGETS), default=None, help="calculators to time")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    parser.add_argument("--baseline", default=None, help="JSON file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="relative change reported as a regression")
+    args = parser.parse_args(argv)
+    current = benchmark(args.points, args.repeat, args.seed, args.only)
+    sys.stdout.write("%-22s %10s %10s %10s %12s %12s\n" % ("calculator", "p50 us", "p90 us", "p99 us", "calls/s", "peak KiB"))
+    for target, values in current["results"].items():
+        sys.stdout.write("%-22s %10.2f %10.2f %10.2f %12.0f %12.1f\n" % (
+            target, values["p50"], values["p90"], values["p99"], values["throughput"], values["peakMemory"]/1024))
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(current, baseline, args.threshold)
+    for target, field, old, new, change in regressions:
+        sys.stdout.write("REGRESSION %s %s: %.6g -> %.6g (%+.1f%%)\n" % (target, field, old, new, 100*change))
+    if not regressions:
+        sys.stdout.write("No regressions against %s\n" % args.baseline)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Deterministic choice of the resistors of a design
+
+The calculators pick the RC (or RE_S) of every stage randomly from its table. This module designs
+every combination of the tables at once with the `batch` module, evaluates them with the `analysis`
+module and ranks them by a weighted score of the gain error, the bias current and the power, so the
+same inputs always give the same design.
+
+..note::
+    This module depends on `numpy`, on the `batch` module and on the `analysis` module
+    <https://numpy.org/doc/stable/>
+"""
+
+import numpy as np #Used to design and score every combination at once
+
+from analysis import VCE_MIN, evaluate
+from batch import designTopologyBatch, recordType
+from engine import TABLES, topology
+
+#Weights of the score, the gain error is relative to the gain required and the current and the power
+#are relative to the lowest ones among the combinations
+WEIGHTS = {"gainError": 1.0, "current": 0.5, "power": 0.5}
+
+def allChoices(name):
+    """
+    Every combination of the tables of a design, in the order of TABLES
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+
+        Return
+        -------
+        An array (combinations, stages) with the index used in each table
+
+    """
+
+    sizes = [len(options) for options in TABLES[name]]
+    return np.indices(sizes, dtype=np.int8).reshape(len(sizes), -1).T
+
+def rankTopology(name, gain, beta, vcc, weights=WEIGHTS):
+    """
+    Designs and scores every combination of the tables of a design
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        weights: dict
+            Weight of gainError, current and power in the score
+
+        Return
+        -------
+        A structured array with the fields of the batch module plus gainError, current, power and
+        score, sorted from the best combination to the worst one. Combinations with a negative
+        resistor or a stage in saturation have an infinite score
+
+    """
+
+    choices = allChoices(name)
+    size = len(choices)
+    records = designTopologyBatch(name, np.full(size, gain), np.full(size, beta), np.full(size, vcc), choices)
+    values = evaluate(name, records)
+    resistors = [records[field] for field in records.dtype.names if field[:2] in ("RC", "RE", "R1", "R2", "RB")]
+    valid = np.logical_and.reduce([r > 0 for r in resistors])
+    for field, VCE in values.items():
+        if field.startswith("VCE"):
+            valid &= VCE > VCE_MIN
+    gainError = np.abs(values["gain"]-gain)/gain
+    current, power = values["current"], values["power"]
+    with np.errstate(invalid="ignore"):
+        score = weights["gainError"]*gainError
+        if valid.any():
+            score = score+weights["current"]*(current/current[valid].min()-1)
+            score = score+weights["power"]*(power/power[valid].min()-1)
+    score = np.where(valid & np.isfinite(score), score, np.inf)
+    dtype = recordType(name)
+    out = np.empty(len(records), dtype=np.dtype(dtype.descr+[(field, np.float64) for field in ("gainError", "current", "power", "score")]))
+    for field in dtype.names:
+        out[field] = records[field]
+    out["gainError"], out["current"], out["power"], out["score"] = gainError, current, power, score
+    return out[np.argsort(score, kind="stable")]
+
+def rank(gain, beta, vcc, follower=False, dual=False, weights=WEIGHTS):
+    """
+    Same as rankTopology, for the design that makeCircuit would pick for the gain
+
+        Parameters
+        ----------
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        follower: bool
+            True if a follower stage is added
+        dual: bool
+            True for the four stages design with dual supply
+        weights: dict
+            Weight of gainError, current and power in the score
+
+        Return
+        -------
+        The structured array of rankTopology
+
+    """
+
+    return rankTopology(topology(gain, follower, dual), gain, beta, vcc, weights)
+
+def bestChoices(name, gain, beta, vcc, weights=WEIGHTS):
+    """
+    Choices of the combination with the best score
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        weights: dict
+            Weight of gainError, current and power in the score
+
+        Return
+        -------
+        A tuple with the index of each table, it can be passed as choices to engine.design
+
+    """
+
+    return tuple(int(i) for i in rankTopology(name, gain, beta, vcc, weights)[0]["choices"])
@@ -0,0 +1,133 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Cache of the designs already calculated
+
+The key of a design has every input that changes its result: the name of the design, gain, beta,
+vcc and the resistor chosen in each table. The random choices are made before looking in the cache,
+so a seeded generator gives the same designs with or without it. A `DesignStore` can be set as the
+store of the cache, then the designs that are not in memory are looked for in its file before
+calculating them.
+
+..note::
+    This module depends on `threading` and `collections`
+    <https://docs.python.org/3/library/collections.html>
+"""
+
+import threading #Used to share the cache between threads
+from collections import OrderedDict
+
+#Default number of designs kept
+MAX_SIZE = 4096
+
+class DesignCache:
+    """
+    Least recently used cache of designs
+
+        Parameters
+        ----------
+        maxSize: Int
+            Number of designs kept, 0 disables the cache
+        hits: Int
+            Number of designs found in the cache
+        misses: Int
+            Number of designs calculated
+        evictions: Int
+            Number of designs dropped to respect the size
+        store: DesignStore
+            Persistent store used for the designs that are not in memory, None to calculate them
+
+    """
+
+    def __init__(self, maxSize=MAX_SIZE, store=None):
+        self.maxSize = maxSize
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._designs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, calculate):
+        """
+        Returns the design of a key, calculating and storing it if it is not in the cache
+
+            Parameters
+            ----------
+            key: tuple
+                The inputs of the design
+            calculate: function
+                Called without arguments to calculate the design
+
+            Return
+            -------
+            The Design
+
+        """
+
+        with self._lock:
+            result = self._designs.get(key)
+            if result is not None:
+                self._designs.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+            store = self.store
+        result = calculate() if store is None else store.get(key, calculate)
+        if self.maxSize > 0:
+            with self._lock:
+                self._designs[key] = result
+                self._evict()
+        return result
+
+    def resize(self, maxSize):
+        """
+        Changes the number of designs kept, dropping the oldest ones if needed
+
+            Parameters
+            ----------
+            maxSize: Int
+                Number of designs kept, 0 disables the cache
+
+            Return
+            -------
+            Void
+
+        """
+
+        with self._lock:
+            self.maxSize = maxSize
+            self._evict()
+
+    def _evict(self):
+        while len(self._designs) > self.maxSize:
+            self._designs.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every design and resets the counters
+        """
+
+        with self._lock:
+            self._designs.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Counters of the cache
+
+            Parameters
+            ----------
+            Void
+
+            Return
+            -------
+            A dict with size, maxSize, hits, misses, evictions and hitRate
+
+        """
+
+        with self._lock:
+            total = self.hits+self.misses
+            return {"size": len(self._designs), "maxSize": self.maxSize, "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "hitRate": self.hits/total if total else 0.0}
@@ -0,0 +1,261 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Persistent store of the designs already calculated, in a SQLite file
+
+The store has the same get() of `DesignCache`, and a DesignCache can use it to keep its designs
+between sessions. New designs are written in batches inside a single transaction, the file uses
+WAL mode so many processes can read it while one writes. The designs are indexed by their inputs
+and by the number of stages and beta, so range queries don't scan the whole table.
+
+..note::
+    This module depends on `sqlite3`, `json`, `threading` and on the `engine` module (imported on first use)
+    <https://docs.python.org/3/library/sqlite3.html>
+"""
+
+import atexit #Used to write the pending designs when the program ends
+import json #Used to store the stages of each design
+import sqlite3 #Used to keep the designs in a file
+import threading #Used to share the store between threads
+
+#Default number of new designs written in each transaction
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS designs (
+    topology TEXT NOT NULL,
+    gain REAL NOT NULL,
+    beta REAL NOT NULL,
+    vcc REAL NOT NULL,
+    choices TEXT NOT NULL,
+    follower INTEGER NOT NULL,
+    dual INTEGER NOT NULL,
+    stages INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (topology, gain, beta, vcc, choices)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS designs_stages ON designs (stages, beta, gain);
+CREATE INDEX IF NOT EXISTS designs_beta ON designs (beta, vcc);
+"""
+
+class DesignStore:
+    """
+    Designs kept in a SQLite file
+
+        Parameters
+        ----------
+        path: str
+            Path of the file, ":memory:" for a store that is not kept
+        batchSize: Int
+            Number of new designs written in each transaction
+        hits: Int
+            Number of designs found in the store
+        misses: Int
+            Number of designs calculated
+
+    """
+
+    def __init__(self, path, batchSize=BATCH_SIZE):
+        self.path = path
+        self.batchSize = batchSize
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        atexit.register(self.close)
+
+    def get(self, key, calculate):
+        """
+        Returns the design of a key, calculating and storing it if it is not in the store
+
+            Parameters
+            ----------
+            key: tuple
+                (name, gain, beta, vcc, choices) as in engine.designTopology
+            calculate: function
+                Called without arguments to calculate the design
+
+            Return
+            -------
+            The Design
+
+        """
+
+        name, gain, beta, vcc, choices = key
+        with self._lock:
+            result = self._pending.get(key)
+            if result is None:
+                row = self._connection.execute(
+                    "SELECT topology, gain, beta, vcc, follower, dual, choices, data FROM designs "
+                    "WHERE topology=? AND gain=? AND beta=? AND vcc=? AND choices=?",
+                    (name, gain, beta, vcc, _choices(choices))).fetchone()
+                result = None if row is None else _design(row)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = calculate()
+        self.put(result)
+        return result
+
+    def put(self, design):
+        """
+        Adds a design, it is written with the next batch
+
+            Parameters
+            ----------
+            design: Design
+                The design of the engine module
+
+            Return
+            -------
+            Void
+
+        """
+
+        with self._lock:
+            self._pending[(design.topology, design.gain, design.beta, design.vcc, tuple(design.choices))] = design
+            if len(self._pending) >= self.batchSize:
+                self._flush()
+
+    def putMany(self, designs):
+        """
+        Adds many designs, they are written in batches of batchSize
+
+            Parameters
+            ----------
+            designs: iterable
+                Designs of the engine module, it may be a generator
+
+            Return
+            -------
+            Void
+
+        """
+
+        for design in designs:
+            self.put(design)
+        self.flush()
+
+    def flush(self):
+        """
+        Writes the pending designs
+        """
+
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending or self._connection is None:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO designs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_row(design) for design in self._pending.values()])
+        self._pending.clear()
+
+    def query(self, topology=None, stages=None, gain=None, beta=None, vcc=None, follower=None, dual=None):
+        """
+        Designs in the store inside the given ranges, the pending designs are written first
+
+            Parameters
+            ----------
+            topology: str
+                Key of the design in TABLES
+            stages: Int
+                Number of stages, without the follower stage
+            gain: tuple
+                (lowest, highest) gain, both included
+            beta: tuple
+                (lowest, highest) beta, both included
+            vcc: tuple
+                (lowest, highest) vcc, both included
+            follower: bool
+                True for the designs with a follower stage
+            dual: bool
+                True for the dual supply designs
+
+            Return
+            -------
+            A generator of Design
+
+        """
+
+        where = []
+        values = []
+        for column, value in (("topology", topology), ("stages", stages), ("follower", follower), ("dual", dual)):
+            if value is not None:
+                where.append("%s=?" % column)
+                values.append(int(value) if isinstance(value, bool) else value)
+        for column, limits in (("gain", gain), ("beta", beta), ("vcc", vcc)):
+            if limits is not None:
+                where.append("%s BETWEEN ? AND ?" % column)
+                values += list(limits)
+        sql = "SELECT topology, gain, beta, vcc, follower, dual, choices, data FROM designs"
+        if where:
+            sql += " WHERE "+" AND ".join(where)
+        with self._lock:
+            self._flush()
+            rows = self._connection.execute(sql, values).fetchall()
+        for row in rows:
+            yield _design(row)
+
+    def __len__(self):
+        with self._lock:
+            self._flush()
+            return self._connection.execute("SELECT COUNT(*) FROM designs").fetchone()[0]
+
+    def stats(self):
+        """
+        Counters of the store
+
+            Parameters
+            ----------
+            Void
+
+            Return
+            -------
+            A dict with path, pending, hits, misses and hitRate
+
+        """
+
+        with self._lock:
+            total = self.hits+self.misses
+            return {"path": self.path, "pending": len(self._pending), "hits": self.hits, "misses": self.misses,
+                    "hitRate": self.hits/total if total else 0.0}
+
+    def close(self):
+        """
+        Writes the pending designs and closes the file
+        """
+
+        with self._lock:
+            if self._connection is not None:
+                self._flush()
+                self._connection.close()
+                self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _choices(choices):
+    return ",".join(str(int(i)) for i in choices)
+
+def _row(design):
+    stages = len(design.stages)-design.follower
+    data = json.dumps([list(stage) for stage in design.stages])
+    return (design.topology, design.gain, design.beta, design.vcc, _choices(design.choices),
+            int(design.follower), int(design.dual), stages, data)
+
+def _design(row):
+    from engine import Design, Stage
+    topology, gain, beta, vcc, follower, dual, choices, data = row
+    stages = tuple(Stage(*stage) for stage in json.loads(data))
+    return Design(topology, gain, beta, vcc, bool(follower), bool(dual), tuple(int(i) for i in choices.split(",")), stages)
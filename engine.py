@@ -0,0 +1,678 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Design engine of the amplifiers, independent of the graphic interface
+
+The engine reproduces the calculators of `main` without touching Tk or global variables, every call
+returns an immutable `Design` with one `Stage` per transistor, so it can be used from scripts, services
+and worker pools. Designs are memoized in `designs`, a thread safe cache keyed on the inputs and the
+resistors chosen, and optionally in a SQLite file with useStore().
+
+..note::
+    This module depends on `random`, on the `solver` module, on the `designcache` module, on the
+    `instrument` module, on the `designstore` module (imported by useStore) and on the `eseries`
+    module (imported to use standard values)
+    <https://docs.python.org/3/library/random.html>
+"""
+
+import operator #Used to check that the choices are integers
+import random #Used to pick the resistors of each stage from their tables
+import re #Used to read the number of stages of the cascades and of the requests
+from typing import NamedTuple, Optional, Tuple
+
+from designcache import DesignCache
+from instrument import timed
+from solver import emitterResistance, emitterResistanceDual, theveninResistance, dividerResistance
+
+class _Tables(dict):
+    #Answers the cascades of any number of stages, see cascadeTable()
+    def __missing__(self, name):
+        table = self[name] = cascadeTable(name)
+        return table
+
+#Resistor options of each stage (RC for inversors, RE for followers), listed from the last stage to
+#the first one, which is the order in which the stages are solved. Names like "Cascade6", "Cascade6F"
+#and "Cascade6Dual" give a chain of that many inversor stages, see cascadeTable()
+TABLES = _Tables({
+    "OneStage": ((10500, 15500, 19500),),
+    "TwoStages": ((10500,), (12500, 15500, 19500)),
+    "ThreeStages": ((15500,), (17500, 18500, 19500), (22500, 25500, 28500)),
+    "OneStageF": ((1000, 1500, 2000), (10500, 15500, 19500)),
+    "TwoStagesF": ((1000, 1500, 2000), (10500, 13500, 15500), (17500, 18500, 19500)),
+    "ThreeStagesF": ((1000, 1500, 2000), (10500, 13500, 15500), (17500, 18500, 19500), (21500, 23500, 25500)),
+    "FourStagesDual": ((175, 200, 235), (4000, 4250, 4500), (5000, 5250, 5500), (6000, 6250, 6500), (7000, 7250, 7500)),
+})
+#Highest gain of the four stages dual supply design, as in makeAmp2, higher gains use more stages
+MAX_GAIN_DUAL = 250
+#Ranges of beta and vcc accepted by makeAmp and makeAmp2
+BETA_RANGE = (100, 200)
+VCC_RANGE = (10, 20)
+#Ranges of makeAmp (single supply) and makeAmp2 (dual supply) used by checkRequest()
+RANGES = {False: {"gain": (2, 125), "beta": BETA_RANGE, "vcc": VCC_RANGE},
+          True: {"gain": (126, MAX_GAIN_DUAL), "beta": BETA_RANGE, "vcc": VCC_RANGE}}
+#Topologies of the calculators accepted by checkTopology()
+NAMED = ("OneStage", "TwoStages", "ThreeStages", "OneStageF", "TwoStagesF", "ThreeStagesF", "FourStagesDual")
+#Largest number of inversors of a CascadeN topology accepted by checkTopology()
+MAX_STAGES = 8
+#Emitter voltage assumed in the follower stage of the dual supply design
+VOFFSET = -0.6
+#Collector voltage assumed in the inversor stages of the dual supply design, the closer to zero the better
+VC_DUAL = 1.2
+#Designs already calculated, use designs.resize() to change its size and designs.stats() to see its counters
+designs = DesignCache()
+
+class Stage(NamedTuple):
+    """
+    Values of one transistor of the amplifier
+
+        Parameters
+        ----------
+        kind: str
+            "inversor" or "follower"
+        RC: Float
+            Collector resistor, None in the follower stages
+        RE: Float
+            Emitter resistor
+        R1: Float
+            Upper resistor of the voltage divider, None in the single supply follower
+        R2: Float
+            Lower resistor of the voltage divider, None in the single supply follower
+        RB: Float
+            Base resistor of the follower stages, None in the inversor stages
+        IC: Float
+            Quiescent collector current
+        Rin: Float
+            Input resistance seen by the previous stage
+        gain: Float
+            Gain required in the stage
+
+    """
+
+    kind: str
+    RC: Optional[float]
+    RE: float
+    R1: Optional[float]
+    R2: Optional[float]
+    RB: Optional[float]
+    IC: float
+    Rin: float
+    gain: float
+
+class Design(NamedTuple):
+    """
+    Result of an amplifier design
+
+        Parameters
+        ----------
+        topology: str
+            Key of the design in TABLES
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        follower: bool
+            True if the design has a follower stage
+        dual: bool
+            True if the design uses a dual supply Vcc/-Vee
+        choices: tuple
+            Index chosen in the table of each stage, in the order of TABLES
+        stages: tuple
+            The stages of the amplifier from the input to the output
+
+    """
+
+    topology: str
+    gain: float
+    beta: float
+    vcc: float
+    follower: bool
+    dual: bool
+    choices: Tuple[int, ...]
+    stages: Tuple[Stage, ...]
+
+def useStore(path, cache=designs):
+    """
+    Keeps the designs of a cache in a SQLite file, they are looked for there before calculating them
+
+        Parameters
+        ----------
+        path: str
+            Path of the file, it is created if needed
+        cache: DesignCache
+            The cache that uses the file
+
+        Return
+        -------
+        The DesignStore
+
+    """
+
+    from designstore import DesignStore
+    cache.store = DesignStore(path)
+    return cache.store
+
+def cascadeTable(name):
+    """
+    Resistor options of a cascade, they continue the tables of the named designs: in the dual supply
+    the RC of each inversor grows 1000 ohms per stage from the output, in the single supply 5500 ohms
+
+        Parameters
+        ----------
+        name: str
+            "Cascade" followed by the number of inversor stages and by "F" (follower) or "Dual"
+
+        Return
+        -------
+        The table, from the last stage to the first one
+
+    """
+
+    match = re.fullmatch(r"Cascade([1-9][0-9]*)(F|Dual)?", name)
+    if match is None:
+        raise KeyError(name)
+    stages, kind = int(match.group(1)), match.group(2)
+    if kind == "Dual":
+        return ((175, 200, 235),)+tuple((4000+1000*k, 4250+1000*k, 4500+1000*k) for k in range(stages))
+    inversors = tuple((10500+5500*k, 12500+5500*k, 14500+5500*k) for k in range(stages))
+    return ((1000, 1500, 2000),)+inversors if kind == "F" else inversors
+
+def cascade(stages, follower=False, dual=False):
+    """
+    Name of the design with a given number of inversor stages, the named designs are used when they exist
+
+        Parameters
+        ----------
+        stages: Int
+            Number of inversor stages
+        follower: bool
+            True if a follower stage is added
+        dual: bool
+            True for the dual supply (it always has a follower stage)
+
+        Return
+        -------
+        The key of the design in TABLES
+
+    """
+
+    if dual:
+        return "FourStagesDual" if stages == 4 else "Cascade%dDual" % stages
+    if stages <= 3:
+        return ("OneStage", "TwoStages", "ThreeStages")[stages-1]+("F" if follower else "")
+    return "Cascade%d%s" % (stages, "F" if follower else "")
+
+def dualStages(gain):
+    """
+    Number of inversor stages of the dual supply design, four up to MAX_GAIN_DUAL and then the fewest
+    stages whose gain is not higher than the one of the four stages design at MAX_GAIN_DUAL
+
+        Parameters
+        ----------
+        gain: Float
+            The gain value in the amplifier
+
+        Return
+        -------
+        The number of stages
+
+    """
+
+    stages = 4
+    while gain > MAX_GAIN_DUAL**(stages/4):
+        stages += 1
+    return stages
+
+def topology(gain, follower=False, dual=False, stages=None):
+    """
+    Selects the design used for a gain, the same way makeCircuit does
+
+        Parameters
+        ----------
+        gain: Float
+            The gain value in the amplifier
+        follower: bool
+            True if a follower stage is added
+        dual: bool
+            True for the dual supply design
+        stages: Int
+            Number of inversor stages, it is chosen from the gain if it is None
+
+        Return
+        -------
+        The key of the design in TABLES
+
+    """
+
+    if stages is not None:
+        return cascade(stages, follower, dual)
+    if dual:
+        return cascade(dualStages(gain), dual=True)
+    if 2<=gain<=5:
+        name = "OneStage"
+    elif 6<=gain<=25:
+        name = "TwoStages"
+    else:
+        name = "ThreeStages"
+    return name+"F" if follower else name
+
+def pickChoices(name, rng=None):
+    """
+    Picks randomly the resistor of each stage, stages with a single option don't use the generator
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        rng: Random
+            Random generator, a new one is created if it is None
+
+        Return
+        -------
+        A tuple with the index chosen in each table
+
+    """
+
+    if rng is None:
+        rng = random.Random()
+    return tuple(rng.randint(1,len(options))-1 if len(options) > 1 else 0 for options in TABLES[name])
+
+def checkChoices(name, choices):
+    """
+    Checks that a tuple of choices has one valid index for every table of a design
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        choices: tuple
+            Index of the resistor used in each table, in the order of TABLES
+
+        Return
+        -------
+        The choices as a tuple of integers, it raises ValueError if there is not one choice per stage
+        or if an index is outside its table
+
+    """
+
+    table = TABLES[name]
+    if isinstance(choices, str):
+        raise ValueError("choices must be a tuple of indexes or \"best\", not %r" % choices)
+    choices = tuple(choices)
+    if len(choices) != len(table):
+        raise ValueError("%s needs %d choices, one per stage, not %d" % (name, len(table), len(choices)))
+    out = []
+    for stage, (options, i) in enumerate(zip(table, choices)):
+        try:
+            i = operator.index(i)
+        except TypeError:
+            raise ValueError("choice %d of %s must be an integer" % (stage, name))
+        if not 0 <= i < len(options):
+            raise ValueError("choice %d of %s must be between 0 and %d" % (stage, name, len(options)-1))
+        out.append(i)
+    return tuple(out)
+
+def checkTopology(name, follower, dual):
+    """
+    Checks a topology of a request without adding it to TABLES, only the designs of the calculators
+    and the cascades of up to MAX_STAGES inversors are accepted
+
+        Parameters
+        ----------
+        name: str
+            The topology of the request
+        follower: bool
+            True if the request has a follower stage
+        dual: bool
+            True for the dual supply design
+
+        Return
+        -------
+        Void, it raises ValueError if the topology is not accepted or if it doesn't match follower and dual
+
+    """
+
+    match = re.fullmatch(r"Cascade([0-9]+)(F|Dual)?", name) if isinstance(name, str) else None
+    if name in NAMED:
+        kind = "Dual" if name.endswith("Dual") else "F" if name.endswith("F") else ""
+    elif match is not None and 1 <= int(match.group(1)) <= MAX_STAGES and match.group(1)[0] != "0":
+        kind = match.group(2) or ""
+    else:
+        raise ValueError("unknown topology %r, use one of %s or Cascade1 to Cascade%d (with F or Dual)"
+                         % (name, ", ".join(NAMED), MAX_STAGES))
+    if kind != ("Dual" if dual else "F" if follower else ""):
+        raise ValueError("topology %s doesn't match follower=%s and dual=%s" % (name, str(follower).lower(), str(dual).lower()))
+
+def checkRequest(request):
+    """
+    Checks a request of the service or a row of the pipeline with the rules of makeAmp and makeAmp2
+
+        Parameters
+        ----------
+        request: dict
+            The JSON object of the request
+
+        Return
+        -------
+        A tuple (topology or None, gain, beta, vcc, follower, dual, choices, seed, series), it raises
+        ValueError with the reason if the request is not valid
+
+    """
+
+    if not isinstance(request, dict):
+        raise ValueError("the request must be a JSON object")
+    dual = bool(request.get("dual", False))
+    follower = dual or bool(request.get("follower", False))
+    values = []
+    for field, (low, high) in RANGES[dual].items():
+        value = request.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError("%s must be a number" % field)
+        if not low <= value <= high:
+            raise ValueError("%s must be between %s and %s" % (field, low, high))
+        values.append(value)
+    name = request.get("topology")
+    if name is not None:
+        checkTopology(name, follower, dual)
+    choices = request.get("choices")
+    if choices is not None and choices != "best":
+        if not isinstance(choices, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in choices):
+            raise ValueError("choices must be a list of integers or \"best\"")
+        choices = checkChoices(name if name is not None else topology(values[0], follower, dual), choices)
+    seed = request.get("seed")
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+        raise ValueError("seed must be an integer")
+    series = request.get("series")
+    if series is not None:
+        from eseries import SERIES
+        if series not in SERIES:
+            raise ValueError("series must be one of %s" % ", ".join(SERIES))
+    return (name,)+tuple(values)+(follower, dual, choices, seed, series)
+
+@timed("stage.follower")
+def followerStage(beta, vcc, RE):
+    """
+    Calculates the follower stage of the single supply designs
+
+        Parameters
+        ----------
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        RE: Float
+            The emitter resistor of the stage
+
+        Return
+        -------
+        The Stage
+
+    """
+
+    vce=(vcc)/2
+    RB=round((0.7+vce)/((vce/RE)/beta),2)
+    Rin = (1/RB+1/(((beta*0.025)/(vce/RE))+(beta+1)*RE))**-1
+    return Stage("follower", None, RE, None, None, RB, vce/RE, Rin, 1.0)
+
+@timed("stage.inversor")
+def inversorStage(gain, beta, vcc, RC, RL=None):
+    """
+    Calculates an inversor stage of the single supply designs
+
+        Parameters
+        ----------
+        gain: Float
+            The gain required in the stage
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        RC: Float
+            The collector resistor of the stage
+        RL: Float
+            The input resistance of the next stage, None for the last stage
+
+        Return
+        -------
+        The Stage
+
+    """
+
+    vce=(vcc)/2
+    RE = round(emitterResistance(gain,beta,vce,RC,RL),2)
+    IC=vce/(RE+RC)
+    R2=round((beta)*RE/10,2)
+    VB=0.7+(IC*RE)
+    R1=round((vcc*R2/VB)-R2,2)
+    Rin = (1/R1+1/R2+1/(((beta*0.025)/(vce/(RE+RC)))+(beta+1)*RE))**-1
+    return Stage("inversor", RC, RE, R1, R2, None, IC, Rin, gain)
+
+@timed("stage.dualFollower")
+def dualFollowerStage(beta, vcc, RE, Voffset=VOFFSET):
+    """
+    Calculates the follower stage of the dual supply design
+
+        Parameters
+        ----------
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value (and -Vee) in the amplifier
+        RE: Float
+            The emitter resistor of the stage
+        Voffset: Float
+            The emitter voltage assumed in the stage
+
+        Return
+        -------
+        The Stage
+
+    """
+
+    vee = -vcc
+    VE = Voffset
+    IE = (VE-vee)/RE
+    Rpi = (0.025*beta)/IE
+    Req = Rpi+((beta+1)*RE)
+    Rin = round((Req)/2,2)
+    Rth = round(theveninResistance(Req,Rin),2)
+    VB = 0.7 + VE
+    IB = IE/beta
+    VTH = ((IB*Rth)+VB)+vcc
+    Veq = VTH/((vcc-vee)-VTH)
+    R1 = round(dividerResistance(Veq,Rth),2)
+    R2 = round(Veq*R1,2)
+    return Stage("follower", None, RE, R1, R2, (1/R1+1/R2)**-1, IE, Rin, 1.0)
+
+@timed("stage.dualInversor")
+def dualInversorStage(gain, beta, vcc, RC, RL, VC=VC_DUAL):
+    """
+    Calculates an inversor stage of the dual supply design
+
+        Parameters
+        ----------
+        gain: Float
+            The gain required in the stage
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value (and -Vee) in the amplifier
+        RC: Float
+            The collector resistor of the stage
+        RL: Float
+            The input resistance of the next stage
+        VC: Float
+            The collector voltage assumed in the stage
+
+        Return
+        -------
+        The Stage
+
+    """
+
+    vee = -vcc
+    VRC = vcc-VC
+    IC = VRC/RC
+    Rpi = (0.025*beta)/IC
+    RE = round(emitterResistanceDual(gain,beta,Rpi,RC,RL),2)
+    Req = Rpi+((beta+1)*RE)
+    Rin = round(Req/2,2)
+    Rth = round(theveninResistance(Req,Rin),2)
+    VRE = RE*IC
+    VE = VRE+vee
+    VB = 0.7 + VE
+    IB = IC/beta
+    VTH = ((IB*Rth)+VB)+vcc
+    Veq = VTH/((vcc-vee)-VTH)
+    R1 = round(dividerResistance(Veq,Rth),2)
+    R2 = round(Veq*R1,2)
+    return Stage("inversor", RC, RE, R1, R2, None, IC, Rin, gain)
+
+def designTopology(name, gain, beta, vcc, choices=None, rng=None, cache=designs, series=None, split=None):
+    """
+    Calculates every stage of a given design, solving them from the last one to the first one.
+    The random choices are made before looking in the cache, so seeded results don't depend on it
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        choices: tuple
+            Index of the resistor used in each table, they are picked randomly if it is None and
+            "best" takes the combination with the best score of candidates.bestChoices. It raises
+            ValueError if they don't match the tables (see checkChoices)
+        rng: Random
+            Random generator used when choices is None
+        cache: DesignCache
+            Cache of designs (or a DesignStore), None to always calculate
+        series: str
+            E-series of the resistors ("E12", "E24", "E48" or "E96"), they are replaced by the
+            standard values of eseries.search, None to keep the calculated values
+        split: str
+            "swing" or "current" to share the gain between the inversors as allocation.allocate
+            does, None gives every inversor the same gain
+
+        Return
+        -------
+        The Design
+
+    """
+
+    if choices is None:
+        choices = pickChoices(name, rng)
+    elif isinstance(choices, str) and choices == "best":
+        from candidates import bestChoices
+        choices = bestChoices(name, gain, beta, vcc)
+    choices = checkChoices(name, choices)
+    if cache is None:
+        result = _designTopology(name, gain, beta, vcc, choices)
+    else:
+        result = cache.get((name, gain, beta, vcc, choices), lambda: _designTopology(name, gain, beta, vcc, choices))
+    if split is not None:
+        from allocation import allocate
+        result = allocate(result, split).design
+    if series is not None:
+        from eseries import search
+        result = search(result, series).design
+    return result
+
+@timed("design", design=True)
+def _designTopology(name, gain, beta, vcc, choices):
+    table = TABLES[name]
+    values = [options[i] for options, i in zip(table, choices)]
+    dual = name.endswith("Dual")
+    follower = dual or name.endswith("F")
+    stages = designCascade(gain, beta, vcc, values[::-1], follower, dual)
+    return Design(name, gain, beta, vcc, follower, dual, choices, stages)
+
+def designCascade(gain, beta, vcc, resistors, follower=False, dual=False, gains=None):
+    """
+    Calculates a chain of any number of stages, solving them from the last one to the first one, each
+    inversor is loaded by the input resistance of the next stage and gets the same share of the gain
+    unless gains is given
+
+        Parameters
+        ----------
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        resistors: list
+            RC of each inversor from the input to the output, followed by the RE of the follower stage
+        follower: bool
+            True if the last resistor is the RE of a follower stage
+        dual: bool
+            True for the dual supply, it needs a follower stage
+        gains: list
+            Gain of each inversor from the input to the output, their product should be gain. None
+            gives every inversor gain**(1/inversors)
+
+        Return
+        -------
+        A tuple with the stages from the input to the output
+
+    """
+
+    if gains is None:
+        gains = [gain**(1/(len(resistors)-follower))]*(len(resistors)-follower)
+    gains = list(gains)
+    stages = []
+    RL = None
+    for i, value in enumerate(reversed(resistors)):
+        if follower and i == 0:
+            stage = dualFollowerStage(beta, vcc, value) if dual else followerStage(beta, vcc, value)
+        elif dual:
+            stage = dualInversorStage(gains.pop(), beta, vcc, value, RL)
+        else:
+            stage = inversorStage(gains.pop(), beta, vcc, value, RL)
+        stages.append(stage)
+        RL = stage.Rin
+    return tuple(reversed(stages))
+
+def design(gain, beta, vcc, follower=False, dual=False, choices=None, rng=None, cache=designs, stages=None, series=None, split=None):
+    """
+    Designs the amplifier for the given values, the number of stages depends on the gain as in makeCircuit
+
+        Parameters
+        ----------
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        follower: bool
+            True if a follower stage is added
+        dual: bool
+            True for the dual supply design (it always has a follower stage), with four stages up to
+            MAX_GAIN_DUAL and more stages above it
+        choices: tuple
+            Index of the resistor used in each table, they are picked randomly if it is None and
+            "best" takes the combination with the best score of candidates.bestChoices
+        rng: Random
+            Random generator used when choices is None
+        cache: DesignCache
+            Cache of designs (or a DesignStore), None to always calculate
+        stages: Int
+            Number of inversor stages, it is chosen from the gain if it is None
+        series: str
+            E-series of the resistors, None to keep the calculated values (see designTopology)
+        split: str
+            "swing" or "current" to optimize the gain of each inversor, None for the same gain (see designTopology)
+
+        Return
+        -------
+        The Design
+
+    """
+
+    return designTopology(topology(gain, follower, dual, stages), gain, beta, vcc, choices, rng, cache, series, split)
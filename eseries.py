@@ -0,0 +1,259 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Standard E-series resistor values for the designed amplifiers
+
+The calculators give resistors like 83421.37 ohm that can't be bought. This module keeps the
+E12, E24, E48 and E96 values of every decade from 1 ohm to 10 Mohm in sorted tables, together with
+the geometric midpoints between neighbour values, so the nearest standard value of a resistor is a
+single bisection of the midpoints (np.searchsorted for whole arrays).
+
+Rounding every resistor on its own changes the gain of a cascade, because each stage is loaded by
+the next one. search() tries the standard values around every resistor, stage by stage from the
+output to the input like the calculators, and keeps only the best partial chains at each stage, so
+the cost grows with the number of stages instead of with the number of combinations.
+
+..note::
+    This module depends on `bisect`, `numpy` and on the `analysis` and `engine` modules
+    <https://numpy.org/doc/stable/>
+"""
+
+import bisect #Used to find the nearest value of one resistor
+import functools
+import itertools
+import math
+from typing import NamedTuple
+
+import numpy as np #Used to find and evaluate many values at once
+
+from analysis import VCE_MIN, designStages, evaluateStage, evaluateStages
+from engine import Design, Stage
+
+#Values of one decade of each series, IEC 60063
+SERIES = {
+    "E12": (10, 12, 15, 18, 22, 27, 33, 39, 47, 56, 68, 82),
+    "E24": (10, 11, 12, 13, 15, 16, 18, 20, 22, 24, 27, 30, 33, 36, 39, 43, 47, 51, 56, 62, 68, 75, 82, 91),
+    "E48": (100, 105, 110, 115, 121, 127, 133, 140, 147, 154, 162, 169, 178, 187, 196, 205, 215, 226, 237, 249,
+            261, 274, 287, 301, 316, 332, 348, 365, 383, 402, 422, 442, 464, 487, 511, 536, 562, 590, 619, 649,
+            681, 715, 750, 787, 825, 866, 909, 953),
+    "E96": (100, 102, 105, 107, 110, 113, 115, 118, 121, 124, 127, 130, 133, 137, 140, 143, 147, 150, 154, 158,
+            162, 165, 169, 174, 178, 182, 187, 191, 196, 200, 205, 210, 215, 221, 226, 232, 237, 243, 249, 255,
+            261, 267, 274, 280, 287, 294, 301, 309, 316, 324, 332, 340, 348, 357, 365, 374, 383, 392, 402, 412,
+            422, 432, 442, 453, 464, 475, 487, 499, 511, 523, 536, 549, 562, 576, 590, 604, 619, 634, 649, 665,
+            681, 698, 715, 732, 750, 768, 787, 806, 825, 845, 866, 887, 909, 931, 953, 976),
+}
+#Series used when none is given
+DEFAULT = "E24"
+#Decades of the tables, from 1 ohm to 10 Mohm (the last decade only has its first value)
+DECADES = 7
+#Standard values tried on each side of the nearest one in search()
+SPAN = 1
+#Partial chains kept at each stage in search()
+WIDTH = 16
+#Largest change of the collector current of a stage accepted in search(), relative to the design
+BIAS = 0.1
+
+class Snapped(NamedTuple):
+    """
+    Design with standard resistors
+
+        Parameters
+        ----------
+        design: Design
+            The design with the standard values, IC and Rin of its stages are the ones they give
+        gain: Float
+            Gain given by the standard values
+        error: Float
+            Gain error relative to the gain of the design
+        values: dict
+            The result of analysis.evaluateStages for the standard values, as floats
+
+    """
+
+    design: Design
+    gain: float
+    error: float
+    values: dict
+
+@functools.lru_cache(maxsize=None)
+def table(series=DEFAULT):
+    """
+    Sorted values of a series in every decade
+
+        Parameters
+        ----------
+        series: str
+            Key of the series in SERIES
+
+        Return
+        -------
+        A tuple of (values, midpoints), midpoints[i] is the geometric mean of values[i] and values[i+1]
+
+    """
+
+    base = SERIES[series]
+    scale = 10**(len(str(base[0]))-1)
+    values = [value*10**decade/scale for decade in range(DECADES) for value in base]+[10.0**DECADES]
+    midpoints = [math.sqrt(low*high) for low, high in zip(values, values[1:])]
+    return tuple(values), tuple(midpoints)
+
+@functools.lru_cache(maxsize=None)
+def _arrays(series):
+    values, midpoints = table(series)
+    return np.array(values), np.array(midpoints)
+
+def nearest(value, series=DEFAULT):
+    """
+    Nearest standard value of a resistor, by ratio (the same error above and below it)
+
+        Parameters
+        ----------
+        value: Float or ndarray
+            Resistor, an array gives an array
+        series: str
+            Key of the series in SERIES
+
+        Return
+        -------
+        The standard value
+
+    """
+
+    if isinstance(value, np.ndarray):
+        values, midpoints = _arrays(series)
+        return values[np.searchsorted(midpoints, value, side="right")]
+    values, midpoints = table(series)
+    return values[bisect.bisect_right(midpoints, value)]
+
+def neighbours(value, series=DEFAULT, span=SPAN):
+    """
+    Standard values around a resistor
+
+        Parameters
+        ----------
+        value: Float
+            Resistor
+        series: str
+            Key of the series in SERIES
+        span: Int
+            Values taken on each side of the nearest one
+
+        Return
+        -------
+        A tuple with the nearest value and up to span values below and above it
+
+    """
+
+    values, midpoints = table(series)
+    i = bisect.bisect_right(midpoints, value)
+    return values[max(i-span, 0):i+span+1]
+
+def _snapped(design, resistors):
+    #Design with the given resistors, IC and Rin of each stage are evaluated again
+    beta, vcc = np.float64(design.beta), np.float64(design.vcc)
+    stages = [(suffix, {field: np.float64(value) for field, value in values.items()}) for suffix, values in resistors]
+    out = {field: float(value) for field, value in evaluateStages(stages, beta, vcc, design.dual).items()}
+    new = []
+    load = None
+    for stage, (suffix, values), (_, arrays) in reversed(list(zip(design.stages, resistors, stages))):
+        load = evaluateStage(arrays, beta, vcc, design.dual, load)["Rin"]
+        RB = values.get("RB")
+        if stage.RC is None and "R1" in values:
+            #The dual supply follower keeps the Thevenin resistance of its divider as RB
+            RB = 1/(1/values["R1"]+1/values["R2"])
+        new.append(stage._replace(RC=values.get("RC"), RE=values["RE"], R1=values.get("R1"), R2=values.get("R2"),
+                                  RB=RB, IC=out["IC"+suffix], Rin=float(load)))
+    gain = out["gain"]
+    return Snapped(design._replace(stages=tuple(new[::-1])), gain, gain/design.gain-1, out)
+
+def snap(design, series=DEFAULT):
+    """
+    Replaces every resistor of a design by its nearest standard value
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        series: str
+            Key of the series in SERIES
+
+        Return
+        -------
+        The Snapped design
+
+    """
+
+    resistors = [(suffix, {field: nearest(value, series) for field, value in values.items()})
+                 for suffix, values in designStages(design)]
+    return _snapped(design, resistors)
+
+@functools.lru_cache(maxsize=4096)
+def search(design, series=DEFAULT, span=SPAN, width=WIDTH, bias=BIAS):
+    """
+    Finds the standard values around the resistors of a design with the smallest gain error. The
+    stages are chosen from the output to the input, at each one every combination of the values
+    around its resistors is tried with each partial chain kept: the combinations that move IC
+    more than bias or saturate the transistor are dropped (the bias doesn't depend on the load)
+    and only the width partial chains closest to the gain of the same stages of the design are
+    kept for the next stage
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        series: str
+            Key of the series in SERIES
+        span: Int
+            Standard values tried on each side of the nearest one
+        width: Int
+            Partial chains kept at each stage
+        bias: Float
+            Largest change of the collector current of a stage, relative to the design
+
+        Return
+        -------
+        The Snapped design, the one of snap() if no combination keeps the bias or if it is better and
+        keeps the bias too, so it is never less accurate than snap() when the nearest values keep the bias
+
+    """
+
+    beta, vcc = np.float64(design.beta), np.float64(design.vcc)
+    stages = designStages(design)[::-1]
+    #Gain and bias of the design at each stage from the output. The calculators round VBE and the
+    #loads, so the gain of the design is reached by spreading the difference over the stages
+    nominals = []
+    load = None
+    for suffix, values in stages:
+        nominals.append(evaluateStage({field: np.float64(value) for field, value in values.items()}, beta, vcc, design.dual, load))
+        load = nominals[-1]["Rin"]
+    correction = (design.gain/np.prod([nominal["gain"] for nominal in nominals]))**(1/len(stages))
+    #Each chain has the gain and the input resistance of its stages and their values, from the output
+    gains = np.ones(1)
+    loads = None
+    chains = [[]]
+    target = 1.0
+    for (suffix, values), nominal in zip(stages, nominals):
+        target = target*nominal["gain"]*correction
+        fields = list(values)
+        options = np.array(list(itertools.product(*[neighbours(values[field], series, span) for field in fields])))
+        bias0 = evaluateStage({field: options[:, k] for k, field in enumerate(fields)}, beta, vcc, design.dual)
+        keep = (np.abs(bias0["IC"]/nominal["IC"]-1) <= bias) & (bias0["VCE"] > VCE_MIN)
+        if not keep.any():
+            return snap(design, series)
+        options = options[keep]
+        #Every kept chain with every option of this stage
+        n, m = len(chains), len(options)
+        expanded = {field: np.tile(options[:, k], n) for k, field in enumerate(fields)}
+        result = evaluateStage(expanded, beta, vcc, design.dual, None if loads is None else np.repeat(loads, m))
+        total = np.repeat(gains, m)*result["gain"]
+        best = np.argsort(np.abs(np.log(total/target)), kind="stable")[:width]
+        chains = [chains[i//m]+[(suffix, dict(zip(fields, options[i % m].tolist())))] for i in best]
+        gains, loads = total[best], result["Rin"][best]
+    found = _snapped(design, chains[0][::-1])
+    #The pruning may drop the nearest values, they are kept if they are better and keep the bias
+    nearestValues = snap(design, series)
+    if abs(nearestValues.error) < abs(found.error) and all(
+            abs(nearestValues.values["IC"+suffix]/nominal["IC"]-1) <= bias and nearestValues.values["VCE"+suffix] > VCE_MIN
+            for (suffix, _), nominal in zip(stages, nominals)):
+        return nearestValues
+    return found
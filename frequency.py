@@ -0,0 +1,157 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Frequency response of the designed amplifiers
+
+The small signal circuit of a design is built with the hybrid pi model of every transistor (rpi,
+gm, Cpi and Cmu), the bias resistors of each stage, the coupling capacitors between the stages and,
+optionally, an emitter bypass capacitor. Supplies are AC grounds. The nodal equations of the whole
+amplifier are solved at every frequency in one NumPy call, so the response of a design takes a few
+milliseconds and can be calculated again every time the design changes.
+
+..note::
+    This module depends on `numpy`
+    <https://numpy.org/doc/stable/>
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np #Used to solve the circuit at every frequency at once
+
+#Thermal voltage used by the calculators
+VT = 0.025
+#Default coupling capacitor between the stages, at the input and at the output
+COUPLING = 10e-6
+#Default base to collector capacitance of the transistors
+CMU = 2e-12
+#Default transition frequency of the transistors, Cpi = gm/(2*pi*FT)-Cmu
+FT = 300e6
+#Default frequencies of the response
+FREQUENCIES = np.logspace(-2, 9, 2000)
+
+class Response(NamedTuple):
+    """
+    Frequency response of an amplifier
+
+        Parameters
+        ----------
+        frequency: ndarray
+            Frequencies in Hz
+        gain: ndarray
+            Complex gain Vout/Vin at each frequency
+        magnitude: ndarray
+            Magnitude of the gain in dB
+        phase: ndarray
+            Phase of the gain in degrees, unwrapped
+        midband: Float
+            Highest magnitude of the gain (not in dB)
+        low: Float
+            Lower -3 dB frequency, None if the gain doesn't fall inside the frequencies
+        high: Float
+            Upper -3 dB frequency, None if the gain doesn't fall inside the frequencies
+
+    """
+
+    frequency: np.ndarray
+    gain: np.ndarray
+    magnitude: np.ndarray
+    phase: np.ndarray
+    midband: float
+    low: Optional[float]
+    high: Optional[float]
+
+def _crossing(f, m, level, i, j):
+    #Interpolates in log frequency where the magnitude crosses the level between the points i and j
+    return float(10**np.interp(level, [m[i], m[j]], [np.log10(f[i]), np.log10(f[j])]))
+
+def response(design, frequencies=FREQUENCIES, coupling=COUPLING, bypass=None, Rs=0, RL=None, Cmu=CMU, fT=FT):
+    """
+    Calculates the frequency response of a design
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        frequencies: ndarray
+            Frequencies in Hz
+        coupling: Float
+            Coupling capacitor at the input, between the stages and at the output
+        bypass: Float
+            Capacitor in parallel with each RE of the inversor stages, None for the unbypassed
+            emitters that the calculators assume
+        Rs: Float
+            Resistance of the source
+        RL: Float
+            Load of the amplifier, connected through a coupling capacitor, None for no load
+        Cmu: Float
+            Base to collector capacitance of the transistors
+        fT: Float
+            Transition frequency of the transistors
+
+        Return
+        -------
+        The Response
+
+    """
+
+    f = np.asarray(frequencies, dtype=np.float64)
+    s = 2j*np.pi*f
+    #Nodes of every stage: base, collector (inversors only, the follower collector is an AC ground), emitter
+    nodes = []
+    count = 0
+    for stage in design.stages:
+        b, c = count, count+1 if stage.RC is not None else None
+        e = count+2 if c is not None else count+1
+        nodes.append((b, c, e))
+        count = e+1
+    G = np.zeros((count, count))
+    C = np.zeros((count, count))
+    Y = np.zeros((len(f), count, count), dtype=np.complex128)
+    def stamp(M, i, j, y):
+        M[i, i] += y
+        if j is not None:
+            M[j, j] += y
+            M[i, j] -= y
+            M[j, i] -= y
+    for k, (stage, (b, c, e)) in enumerate(zip(design.stages, nodes)):
+        gm = stage.IC/VT
+        rpi = design.beta/gm
+        Cpi = max(gm/(2*np.pi*fT)-Cmu, 0)
+        Rth = stage.RB if stage.R1 is None else 1/(1/stage.R1+1/stage.R2)
+        stamp(G, b, None, 1/Rth)
+        stamp(G, b, e, 1/rpi)
+        stamp(C, b, e, Cpi)
+        stamp(C, b, c, Cmu)
+        stamp(G, e, None, 1/stage.RE)
+        if c is not None:
+            stamp(G, c, None, 1/stage.RC)
+            if bypass is not None:
+                stamp(C, e, None, bypass)
+            #Collector current gm*vbe, from the collector to the emitter
+            G[c, b] += gm
+            G[c, e] -= gm
+        G[e, b] -= gm
+        G[e, e] += gm
+        if k+1 < len(nodes):
+            stamp(C, c if c is not None else e, nodes[k+1][0], coupling)
+    Y += G+s[:, None, None]*C
+    #Source in series with Rs and the input capacitor, and the load in series with the output capacitor
+    Yin = s*coupling/(1+s*coupling*Rs)
+    Y[:, 0, 0] += Yin
+    out = nodes[-1][1] if nodes[-1][1] is not None else nodes[-1][2]
+    if RL is not None:
+        Yout = s*coupling/(1+s*coupling*RL)
+        Y[:, out, out] += Yout
+    rhs = np.zeros((len(f), count, 1), dtype=np.complex128)
+    rhs[:, 0, 0] = Yin
+    v = np.linalg.solve(Y, rhs)[:, out, 0]
+    if RL is not None:
+        v = v*RL*Yout
+    m = np.abs(v)
+    peak = int(np.argmax(m))
+    level = m[peak]/np.sqrt(2)
+    below = np.flatnonzero(m[:peak] < level)
+    above = np.flatnonzero(m[peak:] < level)
+    low = _crossing(f, m, level, below[-1], below[-1]+1) if below.size else None
+    high = _crossing(f, m, level, peak+above[0]-1, peak+above[0]) if above.size else None
+    return Response(f, v, 20*np.log10(m), np.degrees(np.unwrap(np.angle(v))), float(m[peak]), low, high)
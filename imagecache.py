@@ -0,0 +1,145 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Cache of the decoded images used by the windows
+
+Each image is decoded once per process and kept in memory while it fits in the size limit, the
+least recently used images are dropped first. The cache stores PIL images and not ImageTk ones,
+because an ImageTk belongs to the Tk window where it was created.
+
+..note::
+    This module depends on `PIL` (imported on first use), `threading`, `collections` and on the `instrument` module
+    <https://pillow.readthedocs.io/en/stable/>
+"""
+
+import os #Used to normalize the paths used as keys
+import threading #Used to share the cache between the windows and the preload thread
+from collections import OrderedDict
+
+from instrument import count, timed
+
+#Default memory limit of the cache in bytes
+MAX_BYTES = 32*1024*1024
+
+class ImageCache:
+    """
+    Least recently used cache of decoded images, bounded by the memory they use
+
+        Parameters
+        ----------
+        maxBytes: Int
+            Memory limit of the cache
+        hits: Int
+            Number of images found in the cache
+        misses: Int
+            Number of images decoded
+        evictions: Int
+            Number of images dropped to respect the limit
+
+    """
+
+    def __init__(self, maxBytes=MAX_BYTES):
+        self.maxBytes = maxBytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Returns the decoded image of a path, decoding it if it is not in the cache
+
+            Parameters
+            ----------
+            path: str
+                Path of the image
+
+            Return
+            -------
+            The PIL Image
+
+        """
+
+        key = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                count("image.hit")
+                return image
+        image = _decode(path)
+        with self._lock:
+            self.misses += 1
+            if key not in self._images:
+                self._images[key] = image
+                self.size += _bytes(image)
+                while self.size > self.maxBytes and len(self._images) > 1:
+                    _, old = self._images.popitem(last=False)
+                    self.size -= _bytes(old)
+                    self.evictions += 1
+        return image
+
+    def load(self, paths):
+        """
+        Decodes the images that are not in the cache yet, missing files are skipped
+
+            Parameters
+            ----------
+            paths: iterable
+                Paths of the images
+
+            Return
+            -------
+            Void
+
+        """
+
+        for path in paths:
+            try:
+                self.get(path)
+            except OSError:
+                pass
+
+    def preload(self, paths):
+        """
+        Same as load, in a background thread
+
+            Parameters
+            ----------
+            paths: iterable
+                Paths of the images
+
+            Return
+            -------
+            The Thread
+
+        """
+
+        thread = threading.Thread(target=self.load, args=(list(paths),), daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        """
+        Drops every image of the cache
+        """
+
+        with self._lock:
+            self._images.clear()
+            self.size = 0
+
+@timed("image.decode")
+def _decode(path):
+    from PIL import Image
+    image = Image.open(path)
+    image.load()
+    return image
+
+def _bytes(image):
+    return image.width*image.height*len(image.getbands())
+
+#Cache shared by the whole program
+images = ImageCache()
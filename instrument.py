@@ -0,0 +1,197 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Timers and counters of the hot paths: stage solves, image loads and screen builds
+
+The instrumentation is off by default, then a timed function only checks one flag before running.
+When it is on, every timed call adds its time to a cumulative histogram of its name, and the calls
+made inside a design are also kept as a breakdown of that design. report() returns everything as a
+dict and dump() writes it as JSON.
+
+..note::
+    This module depends on `time`, `threading`, `json` and `collections`
+    <https://docs.python.org/3/library/time.html>
+"""
+
+import functools
+import json #Used to dump the report
+import sys #Used as the default output of dump()
+import threading #Used to keep the breakdown of each thread apart
+import time #Used to time the calls
+from collections import deque
+
+#Number of design breakdowns kept
+MAX_DESIGNS = 100
+
+enabled = False
+_lock = threading.Lock()
+_timers = {}
+_counters = {}
+_designs = deque(maxlen=MAX_DESIGNS)
+_local = threading.local()
+
+def enable():
+    """
+    Turns the instrumentation on
+    """
+
+    global enabled
+    enabled = True
+
+def disable():
+    """
+    Turns the instrumentation off, the values collected are kept
+    """
+
+    global enabled
+    enabled = False
+
+def reset():
+    """
+    Drops every value collected
+    """
+
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+        _designs.clear()
+
+def count(name, n=1):
+    """
+    Adds n to a counter when the instrumentation is on
+
+        Parameters
+        ----------
+        name: str
+            Name of the counter
+        n: Int
+            Value added
+
+        Return
+        -------
+        Void
+
+    """
+
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0)+n
+
+def record(name, elapsed):
+    """
+    Adds a time to the histogram of a name and to the breakdown of the current design
+
+        Parameters
+        ----------
+        name: str
+            Name of the timer
+        elapsed: Int
+            Time in nanoseconds
+
+        Return
+        -------
+        Void
+
+    """
+
+    with _lock:
+        timer = _timers.get(name)
+        if timer is None:
+            timer = _timers[name] = {"count": 0, "total": 0, "min": elapsed, "max": elapsed, "histogram": {}}
+        timer["count"] += 1
+        timer["total"] += elapsed
+        timer["min"] = min(timer["min"], elapsed)
+        timer["max"] = max(timer["max"], elapsed)
+        #Buckets are powers of two of microseconds, the key is the upper limit of the bucket
+        bucket = 1 << (elapsed//1000).bit_length()
+        timer["histogram"][bucket] = timer["histogram"].get(bucket, 0)+1
+    breakdown = getattr(_local, "design", None)
+    if breakdown is not None:
+        calls = breakdown["calls"].setdefault(name, [0, 0])
+        calls[0] += 1
+        calls[1] += elapsed
+
+def timed(name, design=False):
+    """
+    Decorator that times every call of a function when the instrumentation is on
+
+        Parameters
+        ----------
+        name: str
+            Name of the timer
+        design: bool
+            True if each call is a design, the timed calls made inside it are kept as its breakdown
+
+        Return
+        -------
+        The decorator
+
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            outer = getattr(_local, "design", None)
+            if design and outer is None:
+                _local.design = {"name": name, "args": [repr(arg) for arg in args[:4]], "calls": {}}
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns()-start
+                record(name, elapsed)
+                if design and outer is None:
+                    breakdown = _local.design
+                    _local.design = None
+                    breakdown["total"] = elapsed
+                    with _lock:
+                        _designs.append(breakdown)
+        return wrapper
+    return decorator
+
+def report():
+    """
+    Values collected, times are in microseconds
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        A dict with "timers" (count, total, mean, min, max and histogram of each name), "counters"
+        and "designs" (the breakdown of the last designs: name, args, total and calls by name)
+
+    """
+
+    with _lock:
+        timers = {}
+        for name, timer in _timers.items():
+            timers[name] = {"count": timer["count"], "total": timer["total"]/1000, "mean": timer["total"]/timer["count"]/1000,
+                            "min": timer["min"]/1000, "max": timer["max"]/1000,
+                            "histogram": {"<%dus" % bucket: n for bucket, n in sorted(timer["histogram"].items())}}
+        designs = [{"name": breakdown["name"], "args": breakdown["args"], "total": breakdown["total"]/1000,
+                    "calls": {name: {"count": n, "total": total/1000} for name, (n, total) in breakdown["calls"].items()}}
+                   for breakdown in _designs]
+        return {"timers": timers, "counters": dict(_counters), "designs": designs}
+
+def dump(file=None):
+    """
+    Writes report() as JSON
+
+        Parameters
+        ----------
+        file: file
+            Output, sys.stderr if it is None
+
+        Return
+        -------
+        Void
+
+    """
+
+    file = sys.stderr if file is None else file
+    json.dump(report(), file, indent=2)
+    file.write("\n")
@@ -0,0 +1,190 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Stage equations solved once with sympy and compiled as NumPy kernels
+
+The equations that the calculators solved with sympy on every design (the gain of the inversor
+stages, the Thevenin resistance and the voltage divider of the dual supply stages) are written here
+once, in the same form. build() solves each one for its unknown, prints the root as NumPy code and
+saves the code in a file named with a hash of EQUATIONS, GENERATOR and the version of sympy installed,
+load() compiles that file without importing sympy. When an equation, the generator or sympy changes the
+hash changes too, so the kernels are built again on the next load() and the old file is removed.
+
+The kernel files are Python code executed by load(), so whoever can write in DIRECTORY (or set
+BJTPY_KERNELS) can run code in every process that loads them. DIRECTORY must be writable by the user
+running the tools, so the kernels are built only once, and by nobody else: never point BJTPY_KERNELS to
+a shared or world writable directory. If it can't be written the kernels are built again on every run.
+
+..note::
+    This module depends on `numpy`, `hashlib` and on `sympy` (installed, it is only imported to build the kernels)
+    <https://docs.sympy.org/latest/modules/utilities/lambdify.html>
+"""
+
+import functools
+import glob #Used to find the kernels of older equations
+import hashlib #Used to name the kernels after their equations
+import importlib.metadata #Used to read the version of sympy without importing it
+import json #Used to hash the equations
+import os #Used to build the paths of the files
+import tempfile #Used to write the kernels atomically
+
+import numpy #Used by the code of the kernels
+
+#Equations solved by the kernels: name of the kernel, unknown, parameters and equation (= 0), written
+#as in the calculators. The inversor without load uses RC instead of the parallel of RC and RL
+EQUATIONS = {
+    "emitterResistance": ("RE", ("gain", "beta", "vce", "RC", "RL"),
+                          "((beta*(1/RC+1/RL)**-1)/((beta+1)*RE+((beta*0.025)/(vce/(RE+RC)))))-gain"),
+    "emitterResistanceUnloaded": ("RE", ("gain", "beta", "vce", "RC"),
+                                  "((beta*RC)/((beta+1)*RE+((beta*0.025)/(vce/(RE+RC)))))-gain"),
+    "emitterResistanceDual": ("RE", ("gain", "beta", "Rpi", "RC", "RL"),
+                              "((beta*((1/RC+1/RL)**-1))/(Rpi+((beta+1)*RE)))-gain"),
+    "theveninResistance": ("Rth", ("Req", "Rin"), "((1/Rth+1/Req)**-1)-Rin"),
+    "dividerResistance": ("R1", ("Veq", "Rth"), "((Veq/(1+Veq))*R1)-Rth"),
+}
+#Version of the code that writes the kernels, change it when kernelSource() prints them differently
+GENERATOR = 1
+#Directory of the kernels, set BJTPY_KERNELS to use another one. Its files are executed, it must be writable
+#by the user and by nobody else
+DIRECTORY = os.environ.get("BJTPY_KERNELS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__"))
+
+def sympyVersion():
+    """
+    Version of sympy read from its package metadata, sympy is not imported
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        The version, it raises ImportError if sympy is not installed
+
+    """
+
+    try:
+        return importlib.metadata.version("sympy")
+    except importlib.metadata.PackageNotFoundError:
+        raise ImportError("sympy is needed to build the kernels of the equations")
+
+def equationsHash(equations=EQUATIONS, version=None):
+    """
+    Hash of the source of the equations, of GENERATOR and of the version of sympy, it names the file of
+    their kernels
+
+        Parameters
+        ----------
+        equations: dict
+            The equations, as in EQUATIONS
+        version: str
+            Version of sympy, the installed one if it is None
+
+        Return
+        -------
+        The first 16 hexadecimal digits of the SHA-256 of the equations, the generator and the version
+
+    """
+
+    if version is None:
+        version = sympyVersion()
+    source = json.dumps({"equations": equations, "generator": GENERATOR, "sympy": version}, sort_keys=True)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+def kernelSource(equations=EQUATIONS):
+    """
+    Solves every equation for its unknown with sympy and writes the roots as Python functions over NumPy
+
+        Parameters
+        ----------
+        equations: dict
+            The equations, as in EQUATIONS
+
+        Return
+        -------
+        The source code of a module with one function per equation, it raises ValueError if an equation
+        has no root
+
+    """
+
+    import sympy
+    from sympy.printing.numpy import NumPyPrinter
+
+    lines = ['"""Kernels of the equations %s, built by kernels.py"""' % equationsHash(equations), "", "import numpy", ""]
+    for name, (unknown, parameters, equation) in equations.items():
+        names = {symbol: sympy.Symbol(symbol) for symbol in (unknown,)+tuple(parameters)}
+        roots = sympy.solve(sympy.sympify(equation, locals=names), names[unknown])
+        if not roots:
+            raise ValueError("The equation of %s has no solution for %s" % (name, unknown))
+        #The first root, same choice as the calculators
+        lines += ["def %s(%s):" % (name, ", ".join(parameters)),
+                  "    return %s" % NumPyPrinter().doprint(roots[0]), ""]
+    return "\n".join(lines)
+
+def build(equations=EQUATIONS, directory=DIRECTORY):
+    """
+    Builds the kernels of the equations and saves them, the kernels of other equations are removed
+
+        Parameters
+        ----------
+        equations: dict
+            The equations, as in EQUATIONS
+        directory: str
+            Directory of the kernels, it is created if needed
+
+        Return
+        -------
+        The path of the file of the kernels
+
+    """
+
+    path = os.path.join(directory, "kernels-%s.py" % equationsHash(equations))
+    _save(kernelSource(equations), path)
+    return path
+
+def _save(source, path):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    #Written to a temporary file first, other processes may be loading the kernels at the same time
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+        file.write(source)
+    os.replace(temporary, path)
+    for old in glob.glob(os.path.join(directory, "kernels-*.py")):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+@functools.lru_cache(maxsize=None)
+def load(directory=DIRECTORY):
+    """
+    Kernels of EQUATIONS, compiled from their file, they are built first if the file is missing
+
+        Parameters
+        ----------
+        directory: str
+            Directory of the kernels
+
+        Return
+        -------
+        A dict with a function per equation, keyed by its name. Every function takes the parameters of
+        its equation (floats or NumPy arrays) and returns the unknown
+
+    """
+
+    path = os.path.join(directory, "kernels-%s.py" % equationsHash())
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+    else:
+        source = kernelSource()
+        try:
+            _save(source, path)
+        except OSError:
+            #A directory that can't be written only costs building them again in the next run
+            pass
+    code = compile(source, path, "exec")
+    namespace = {"numpy": numpy}
+    exec(code, namespace)
+    return {name: namespace[name] for name in EQUATIONS}
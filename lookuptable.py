@@ -0,0 +1,243 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Precomputed design tables, memory-mapped and interpolated
+
+The designs of the calculators (calculateOneStage ... calculateThreeStagesF and makeCircuitDual) are
+calculated once with the `batch` module over a dense grid of gain, beta and vcc, for every
+combination of the resistor tables, and saved as one .npy file per design with its grid in a .json
+file. The grid is uniform in log(gain), beta and vcc, so the cell of a query is found with a few
+operations instead of a search. lookup() maps the file without reading it, takes only the eight
+corners of the cell of each query and interpolates them. With refine=True the values are calculated
+again at the query with the exact equations.
+
+..note::
+    This module depends on `numpy`, `json`, `argparse` and on the `batch` module
+    <https://numpy.org/doc/stable/reference/generated/numpy.lib.format.open_memmap.html>
+"""
+
+import argparse #Used to read the options of the command
+import functools
+import json #Used to save the grid of each table
+import os #Used to build the paths of the files
+import sys #Used to write the progress
+
+import numpy as np #Used to save, map and interpolate the tables
+
+from batch import designTopologyBatch, recordType
+from candidates import allChoices
+from engine import TABLES
+
+#Directory of the tables, next to this module unless BJTPY_TABLES is set
+DIRECTORY = os.environ.get("BJTPY_TABLES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Tables"))
+#Designs saved and the range of gain of each one, the ones of makeAmp and makeAmp2 with the gaps between them
+GAINS = {"OneStage": (2, 6), "TwoStages": (5, 26), "ThreeStages": (25, 125),
+         "OneStageF": (2, 6), "TwoStagesF": (5, 26), "ThreeStagesF": (25, 125), "FourStagesDual": (126, 250)}
+#Range of beta and vcc of the tables
+BETA = (100, 200)
+VCC = (10, 20)
+#Default points of each axis
+GAIN_POINTS = 48
+BETA_POINTS = 11
+VCC_POINTS = 11
+
+#Offsets of the eight corners of a cell along the gain, beta and vcc axes
+_CORNERS = np.array([[(corner >> 2) & 1, (corner >> 1) & 1, corner & 1] for corner in range(8)])
+
+def _fields(name):
+    return [field for field in recordType(name).names if field not in ("index", "gain", "beta", "vcc", "choices")]
+
+def build(name, directory=DIRECTORY, gainPoints=GAIN_POINTS, betaPoints=BETA_POINTS, vccPoints=VCC_POINTS, progress=None):
+    """
+    Calculates and saves the table of a design, one combination of the resistor tables at a time
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in GAINS
+        directory: str
+            Directory of the tables, it is created if needed
+        gainPoints: Int
+            Points of the gain axis, evenly spaced in log(gain)
+        betaPoints: Int
+            Points of the beta axis
+        vccPoints: Int
+            Points of the vcc axis
+        progress: function
+            Called with (combinations done, combinations) after each combination
+
+        Return
+        -------
+        The path of the .npy file
+
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    low, high = GAINS[name]
+    axes = [np.exp(np.linspace(np.log(low), np.log(high), gainPoints)), np.linspace(*BETA, betaPoints), np.linspace(*VCC, vccPoints)]
+    gain, beta, vcc = (axis.ravel() for axis in np.meshgrid(*axes, indexing="ij"))
+    fields = _fields(name)
+    choices = allChoices(name)
+    path = os.path.join(directory, name+".npy")
+    table = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64,
+                                      shape=(len(choices), gainPoints, betaPoints, vccPoints, len(fields)))
+    for k, choice in enumerate(choices):
+        records = designTopologyBatch(name, gain, beta, vcc, tuple(choice))
+        table[k] = np.stack([records[field] for field in fields], axis=-1).reshape(table.shape[1:])
+        if progress is not None:
+            progress(k+1, len(choices))
+    table.flush()
+    del table
+    meta = {"name": name, "fields": fields, "sizes": [len(options) for options in TABLES[name]],
+            "gain": [low, high, gainPoints], "beta": list(BETA)+[betaPoints], "vcc": list(VCC)+[vccPoints]}
+    with open(os.path.join(directory, name+".json"), "w") as file:
+        json.dump(meta, file, indent=2)
+    return path
+
+class LookupTable:
+    """
+    Table of a design mapped from its file, only the pages of the records used are read
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        fields: list
+            Names of the values of each record, the ones of batch.stageFields
+        values: memmap
+            The table (combinations, gain, beta, vcc, fields)
+
+    """
+
+    def __init__(self, name, directory=DIRECTORY):
+        with open(os.path.join(directory, name+".json")) as file:
+            meta = json.load(file)
+        self.name = name
+        self.fields = meta["fields"]
+        self.sizes = tuple(meta["sizes"])
+        #Each axis as (first value, step, points), the gain axis is in log(gain)
+        low, high, points = meta["gain"]
+        self.axes = [(np.log(low), (np.log(high)-np.log(low))/(points-1), points)]
+        for key in ("beta", "vcc"):
+            low, high, points = meta[key]
+            self.axes.append((low, (high-low)/(points-1), points))
+        self.limits = [tuple(meta[key][:2]) for key in ("gain", "beta", "vcc")]
+        self.values = np.load(os.path.join(directory, name+".npy"), mmap_mode="r")
+        self.dtype = recordType(name)
+
+    def lookup(self, gain, beta, vcc, choices, refine=False):
+        """
+        Values of the design for any query inside the table
+
+            Parameters
+            ----------
+            gain: ndarray
+                The gain values
+            beta: ndarray
+                The beta values
+            vcc: ndarray
+                The vcc values
+            choices: ndarray
+                Index of the resistor used in each table, a tuple for every query or an array (size, stages)
+            refine: bool
+                True to calculate the values again at each query with the exact equations
+
+            Return
+            -------
+            A structured array with the dtype of batch.recordType, one record per query. It raises
+            ValueError if a query is outside the table or if a choice is outside its resistor table
+
+        """
+
+        gain, beta, vcc = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64).ravel() for x in (gain, beta, vcc)))
+        for values, (low, high), field in zip((gain, beta, vcc), self.limits, ("gain", "beta", "vcc")):
+            if values.size and not ((values >= low) & (values <= high)).all():
+                raise ValueError("%s outside the table (%s to %s)" % (field, low, high))
+        size = gain.size
+        choices = np.asarray(choices)
+        if choices.ndim == 0 or choices.shape[-1] != len(self.sizes) or choices.ndim > 2:
+            raise ValueError("%s needs %d choices for each query, one per stage" % (self.name, len(self.sizes)))
+        if choices.size and (not np.issubdtype(choices.dtype, np.integer) or (choices < 0).any() or (choices >= self.sizes).any()):
+            raise ValueError("the choices of %s must be integers between 0 and %s" % (self.name, [size-1 for size in self.sizes]))
+        choices = np.broadcast_to(choices.astype(np.int64), (size, len(self.sizes)))
+        if refine:
+            return designTopologyBatch(self.name, gain, beta, vcc, choices)
+        combination = np.ravel_multi_index(tuple(choices.T), self.sizes)
+        #Cell and position inside it along each axis
+        cells, weights = [], []
+        for x, (first, step, points) in zip((np.log(gain), beta, vcc), self.axes):
+            position = (x-first)/step
+            cell = np.minimum(np.maximum(position.astype(np.int64), 0), points-2)
+            cells.append(cell)
+            weights.append(position-cell)
+        #The eight corners of every cell are read at once, then weighted by their distance to the query
+        corners = self.values[combination, cells[0]+_CORNERS[:, :1], cells[1]+_CORNERS[:, 1:2], cells[2]+_CORNERS[:, 2:]]
+        weight = np.prod(np.where(_CORNERS[:, :, None] == 1, np.stack(weights), 1-np.stack(weights)), axis=1)
+        result = np.einsum("cs,csf->sf", weight, corners)
+        out = np.empty(size, dtype=self.dtype)
+        out["index"] = np.arange(size)
+        out["gain"], out["beta"], out["vcc"], out["choices"] = gain, beta, vcc, choices
+        for k, field in enumerate(self.fields):
+            out[field] = result[:, k]
+        return out
+
+@functools.lru_cache(maxsize=None)
+def table(name, directory=DIRECTORY):
+    """
+    The LookupTable of a design, mapped once
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in GAINS
+        directory: str
+            Directory of the tables
+
+        Return
+        -------
+        The LookupTable
+
+    """
+
+    return LookupTable(name, directory)
+
+def lookup(name, gain, beta, vcc, choices, refine=False, directory=DIRECTORY):
+    """
+    Same as LookupTable.lookup, with the table of a design in a directory
+    """
+
+    return table(name, directory).lookup(gain, beta, vcc, choices, refine)
+
+def main(argv=None):
+    """
+    Command line that builds the tables
+
+        Parameters
+        ----------
+        argv: list
+            The arguments, sys.argv[1:] if it is None
+
+        Return
+        -------
+        Void
+
+    """
+
+    parser = argparse.ArgumentParser(prog="BJTpy tables", description="Precomputes the designs on a grid of gain, beta and vcc")
+    parser.add_argument("--output", default=DIRECTORY, help="directory of the tables")
+    parser.add_argument("--only", nargs="+", choices=list(GAINS), default=list(GAINS), help="designs to build")
+    parser.add_argument("--gain-points", type=int, default=GAIN_POINTS, help="points of the gain axis")
+    parser.add_argument("--beta-points", type=int, default=BETA_POINTS, help="points of the beta axis")
+    parser.add_argument("--vcc-points", type=int, default=VCC_POINTS, help="points of the vcc axis")
+    args = parser.parse_args(argv)
+    for name in args.only:
+
+        def report(done, total):
+            sys.stderr.write("\r%s %d/%d" % (name, done, total))
+            sys.stderr.flush()
+
+        build(name, args.output, args.gain_points, args.beta_points, args.vcc_points, report)
+        sys.stderr.write("\n")
+
+if __name__ == "__main__":
+    main()
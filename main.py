@@ -7,32 +7,90 @@ This class computes a software for circuit analysis of BJT Amplifiers
              Sebastian Rojas *University of Francisco de Paula Santander*
 
 ..note::
-    This class makes inherits from `tkinter`, from `PIL`, from `os`, from `random` and from `sympy`
+    This class makes inherits from `tkinter`, from `PIL` and from `os`
+    The resistors of every design are calculated by the `engine` module
     Check the corresponding documentation below
     <https://docs.python.org/3/library/tk.html>
     <https://pillow.readthedocs.io/en/stable/>
     <https://docs.python.org/3/library/os.html>
-    <https://docs.python.org/3/library/random.html>
-    <https://docs.sympy.org/latest/index.html>
 """
 
 from tkinter import * #The main controller for this Software
-from PIL import ImageTk, Image #Used to implement images in Tkinter
+from tkinter import ttk #Progress bar of the designs
 import os #Used to open the corresponding PDF's files in the software
-import random #Used to generate a few random numbers in functions
-from sympy import symbols, solve #Used to solve equations in many functions
+import sys #Used to read the command line
+import threading #Used to load the design engine in the background
+from imagecache import images #Decodes each image only once
+import instrument #Times the screens, the images and the stage solves when BJTPY_PROFILE is set
+from instrument import timed
+#PIL (images), engine (design math) and sweep are imported when they are first needed, so the menu
+#is drawn as soon as possible
+
+#The only Tk of the program, every screen is a Frame inside it, see showScreen()
+window = None
+#Frames of the screens already built, by name
+screens = {}
+#ImageTk already created for the window, by path
+photos = {}
+#Thread that loads the design engine and the images in the background, see prewarm()
+warmer = None
+#Design being calculated away from the Tk thread, see compute()
+pending = None
+#Milliseconds between the checks of the design being calculated
+POLL = 20
+#Images of the windows after the menu, they are decoded in the background by prewarm()
+IMAGES = ["Images/MenuSeleccion.jpg", "Images/MenuIngreso.jpg", "Images/MenuAmplificador.jpg",
+          "Images/Casos/UnaEtapa.jpg", "Images/Casos/DosEtapas.jpg", "Images/Casos/TresEtapas.jpg",
+          "Images/Casos/UnaEtapaSeguidor.JPG", "Images/Casos/DosEtapasSeguidor.jpg",
+          "Images/Casos/TresEtapasSeguidor.jpg", "Images/Casos/CuatroEtapas.JPG"]
+#SQLite file where the designs are kept between sessions, set BJTPY_STORE to use it
+STORE = os.environ.get("BJTPY_STORE")
+#Set BJTPY_PROFILE to 1 to write the timers and counters to the terminal when the window is closed, or to
+#the path of a file to write them there
+PROFILE = os.environ.get("BJTPY_PROFILE")
 
 #This is where all the functions starts, beggining with root() which is the main one
 def root ():
     """
-    Starts the program, it is defined as the main function
+    Starts the program, it is defined as the main function. It creates the only window of the software,
+    every screen is a frame inside it
 
         Parameters
         ----------
-        menu: Tk
+        window: Tk
+            The main controller
+
+        Return
+        -------
+        Void
+        
+    """
+
+    if PROFILE:
+        instrument.enable()
+    prewarm()
+    global window
+    window = Tk()
+    window.resizable(False,False)
+    window.iconbitmap("Images/BJTpy_ICO.ico")
+    appMenu()
+    #The loop where everything starts to work, it is the only one in the software and it keeps the window in the screen
+    window.mainloop()
+    if PROFILE == "1":
+        instrument.dump()
+    elif PROFILE:
+        with open(PROFILE, "w") as file:
+            instrument.dump(file)
+
+@timed("screen.appMenu")
+def appMenu():
+    """
+    Shows the main menu
+
+        Parameters
+        ----------
+        menu: Frame
             The main screen controller
-        menuImage: ImageTk
-            The background image
 
         Return
         -------
@@ -41,49 +99,219 @@ def root ():
     """
 
     global menu
-    menu = Tk()
-    menu.geometry("720x480")
-    menu.title("BJTpy - Menú")
-    menu.resizable(False,False)
-    menu.iconbitmap("Images/BJTpy_ICO.ico")
-    #Background Menu Image
-    menuImage = ImageTk.PhotoImage(Image.open("Images/Menu.jpg"))
-    Label(image = menuImage).place(x=0,y=0)
-    #Some useful buttons such as Help
-    Button(text = "Ingresar", height = "2", width = "30", cursor = "hand2", command = appCondition).place(x = 468, y = 250)
-    Button(text = "Ayuda", height = "2", width = "30", cursor = "hand2", command = apphelp).place(x = 468, y = 300)
-    #The loop where everything starts to work in this function, it is needed so the window stays in the screen, otherwise it would dissapear
-    menu.mainloop()
+    menu, new = showScreen("menu", "720x480", "BJTpy - Menú")
+    if new:
+        #Background Menu Image
+        Label(menu, image = loadImage("Images/Menu.jpg")).place(x=0,y=0)
+        #Some useful buttons such as Help
+        Button(menu, text = "Ingresar", height = "2", width = "30", cursor = "hand2", command = appCondition).place(x = 468, y = 250)
+        Button(menu, text = "Ayuda", height = "2", width = "30", cursor = "hand2", command = apphelp).place(x = 468, y = 300)
+
+def showScreen(name, geometry, title):
+    """
+    Shows a screen in the window and hides the other ones, the frame of each screen is created only once
+
+        Parameters
+        ----------
+        name: str
+            Name of the screen
+        geometry: str
+            Size of the window for this screen
+        title: str
+            Title of the window for this screen
+
+        Return
+        -------
+        The Frame of the screen and True if it was just created, so its widgets have to be built
+        
+    """
+
+    frame = screens.get(name)
+    new = frame is None
+    if new:
+        frame = screens[name] = Frame(window)
+    for other in screens.values():
+        if other is not frame:
+            other.place_forget()
+    frame.place(x=0, y=0, relwidth=1, relheight=1)
+    window.geometry(geometry)
+    window.title(title)
+    return frame, new
+
+@timed("image.load")
+def loadImage(path):
+    """
+    Opens an image to be used in Tkinter, each image is decoded and converted only once
+
+        Parameters
+        ----------
+        path: str
+            Path of the image
+
+        Return
+        -------
+        The ImageTk
+        
+    """
 
+    photo = photos.get(path)
+    if photo is None:
+        from PIL import ImageTk
+        photo = photos[path] = ImageTk.PhotoImage(images.get(path), master = window)
+    return photo
+
+def prewarm():
+    """
+    Imports the design engine, opens the design store and decodes the images in a background thread while
+    the user is in the menus, only the first call does it
+
+        Parameters
+        ----------
+        warmer: Thread
+            The background thread
+
+        Return
+        -------
+        Void
+        
+    """
+
+    global warmer
+    if warmer is None:
+        warmer = threading.Thread(target = warm, daemon = True)
+        warmer.start()
+
+def warm():
+    """
+    Work done by the background thread of prewarm()
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        Void
+        
+    """
+
+    import engine
+    if STORE:
+        engine.useStore(STORE)
+    images.load(IMAGES)
+
+def sweep ():
+    """
+    Starts a design sweep without windows, it designs a grid of gain, beta, vcc and follower/dual options
+    using every core. It is called with python3 main.py sweep [options], use --help to see the options
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        Void
+        
+    """
+
+    from sweep import main as sweepCommand
+    sweepCommand(sys.argv[2:])
+
+def benchmark ():
+    """
+    Times the stage calculators over a seeded grid of inputs. It is called with python3 main.py benchmark
+    [options], use --help to see the options
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        Void
+        
+    """
+
+    from benchmark import main as benchmarkCommand
+    sys.exit(benchmarkCommand(sys.argv[2:]))
+
+def serve ():
+    """
+    Starts the local HTTP/JSON design service without windows. It is called with python3 main.py serve
+    [options], use --help to see the options
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        Void
+        
+    """
+
+    from service import main as serviceCommand
+    serviceCommand(sys.argv[2:])
+
+def pipeline ():
+    """
+    Designs the requests of a CSV or JSONL file (or of stdin) line by line without windows. It is called
+    with python3 main.py pipeline [input] [options], use --help to see the options
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        Void
+        
+    """
+
+    from pipeline import main as pipelineCommand
+    sys.exit(pipelineCommand(sys.argv[2:]))
+
+def tables ():
+    """
+    Precomputes the tables of lookuptable on a grid of gain, beta and vcc without windows. It is called
+    with python3 main.py tables [options], use --help to see the options
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        Void
+        
+    """
+
+    from lookuptable import main as tablesCommand
+    tablesCommand(sys.argv[2:])
+
+@timed("screen.appCondition")
 def appCondition():
-    menu.destroy()
     global selectmenu
-    selectmenu = Tk()
-    selectmenu.geometry("360x200")
-    selectmenu.title("Selección de Diseño")
-    selectmenu.resizable(False,False)
-    selectmenu.iconbitmap("Images/BJTpy_ICO.ico")
-    #Background Menu Image
-    menuImage = ImageTk.PhotoImage(Image.open("Images/MenuSeleccion.jpg"))
-    Label(image = menuImage).place(x=0,y=0)
-    #Some useful buttons
-    Label(selectmenu, text = "Por favor seleccione el tipo de diseño a realizar:").place(x=55,y=30)
-    Button(text = "Diseño básico (1-3 Etapas)", height = "2", width = "30", cursor = "hand2", command = appAccess).place(x = 70, y = 60)
-    Button(text = "Diseño avanzado (4 Etapas)", height = "2", width = "30", cursor = "hand2", command = appAccess2).place(x = 70, y = 110)
-    Button(selectmenu, text = "←", height = "1", width = "2", cursor = "hand2", command = Reset2).place(x=15,y=25)
-    #The loop where everything starts to work in this function, it is needed so the window stays in the screen, otherwise it would dissapear
-    selectmenu.mainloop()
-
+    selectmenu, new = showScreen("select", "360x200", "Selección de Diseño")
+    if new:
+        #Background Menu Image
+        Label(selectmenu, image = loadImage("Images/MenuSeleccion.jpg")).place(x=0,y=0)
+        #Some useful buttons
+        Label(selectmenu, text = "Por favor seleccione el tipo de diseño a realizar:").place(x=55,y=30)
+        Button(selectmenu, text = "Diseño básico (1-3 Etapas)", height = "2", width = "30", cursor = "hand2", command = appAccess).place(x = 70, y = 60)
+        Button(selectmenu, text = "Diseño avanzado (4 Etapas)", height = "2", width = "30", cursor = "hand2", command = appAccess2).place(x = 70, y = 110)
+        Button(selectmenu, text = "←", height = "1", width = "2", cursor = "hand2", command = Reset2).place(x=15,y=25)
+
+@timed("screen.appAccess")
 def appAccess ():
     """
     Starts the second window, it allows to modificate transistors characteristics
 
         Parameters
         ----------
-        menuAccess: Tk
+        menuAccess: Frame
             The second screen controller
-        menuAccessImage: ImageTk
-            The second background image
         gain: DoubleVar
             Value of transistor gain
         gainEntry: Entry
@@ -105,82 +333,73 @@ def appAccess ():
         
     """
     
-    selectmenu.destroy()
-    global menuAccess
-    menuAccess = Tk()
-    menuAccess.geometry("320x440")
-    menuAccess.title("BJTpy - Ingreso de Datos")
-    menuAccess.resizable(False,False)
-    menuAccess.iconbitmap("Images/BJTpy_ICO.ico")
-    #Background Menu Image
-    menuAccessImage = ImageTk.PhotoImage(Image.open("Images/MenuIngreso.jpg"))
-    Label(menuAccess, image = menuAccessImage).place(x=0,y=0)
-    #Main content of the page 
-    Label(menuAccess, text = "En este espacio se van a introducir algunos datos para\nel respectivo diseño de un amplificador BJT en su con-\nfiguración inversora.",justify = "left").place(x=15,y=40)
-    #Circuit main variables
-    Label(menuAccess, text = "Ganancia (Av): [2-125]*").place(x=20,y=100)
-    global gain
-    global gainEntry
-    gain = DoubleVar()
-    gainEntry = Entry(menuAccess, textvariable = gain, width = "30")
-    gainEntry.place(x=20,y=120)
-    Label(menuAccess, text = "Beta (β): [100-200]*").place(x=20,y=160)
-    global beta
-    global betaEntry
-    beta = DoubleVar()
-    betaEntry = Entry(menuAccess, textvariable = beta, width = "30")
-    betaEntry.place(x=20,y=180)
-    Label(menuAccess, text = "Vcc: [10-20]*").place(x=20,y=220)
-    global vcc
-    global vccEntry
-    vcc = DoubleVar()
-    vccEntry = Entry(menuAccess, textvariable = vcc, width = "30")
-    vccEntry.place(x=20,y=240)
-    global follower
-    follower = IntVar()
-    Checkbutton(menuAccess, text = "Deseo añadir una etapa seguidora", variable = follower, cursor = "hand2", onvalue = 1, offvalue = 0).place(x=20,y=280)
-    Button(menuAccess, text = "Crear Amplificador", height = "2", width = "30", cursor = "hand2", command = makeAmp).place(x=50,y=340)
-    Button(menuAccess, text = "?", height = "1", width = "2", cursor = "hand2", command = apphelp).place(x=280,y=380)
-    #The loop where everything starts to work in this function, it is needed so the window stays in the screen, otherwise it would dissapear
-    menuAccess.mainloop()
+    global menuAccess, gain, gainEntry, beta, betaEntry, vcc, vccEntry, follower
+    menuAccess, new = showScreen("access", "320x440", "BJTpy - Ingreso de Datos")
+    if new:
+        #Background Menu Image
+        Label(menuAccess, image = loadImage("Images/MenuIngreso.jpg")).place(x=0,y=0)
+        #Main content of the page 
+        Label(menuAccess, text = "En este espacio se van a introducir algunos datos para\nel respectivo diseño de un amplificador BJT en su con-\nfiguración inversora.",justify = "left").place(x=15,y=40)
+        #Circuit main variables
+        Label(menuAccess, text = "Ganancia (Av): [2-125]*").place(x=20,y=100)
+        Label(menuAccess, text = "Beta (β): [100-200]*").place(x=20,y=160)
+        Label(menuAccess, text = "Vcc: [10-20]*").place(x=20,y=220)
+        menuAccess.fields = accessFields(menuAccess)
+        menuAccess.follower = IntVar(menuAccess)
+        Checkbutton(menuAccess, text = "Deseo añadir una etapa seguidora", variable = menuAccess.follower, cursor = "hand2", onvalue = 1, offvalue = 0).place(x=20,y=280)
+        Button(menuAccess, text = "Crear Amplificador", height = "2", width = "30", cursor = "hand2", command = makeAmp).place(x=50,y=340)
+        Button(menuAccess, text = "?", height = "1", width = "2", cursor = "hand2", command = apphelp).place(x=280,y=380)
+    gain, gainEntry, beta, betaEntry, vcc, vccEntry = menuAccess.fields
+    follower = menuAccess.follower
+    #Every visit starts with empty values, as a new screen
+    for variable in (gain, beta, vcc):
+        variable.set(0.0)
+    follower.set(0)
+
+def accessFields(frame):
+    """
+    Creates the entries of gain, beta and vcc of the data screens
+
+        Parameters
+        ----------
+        frame: Frame
+            The screen where the entries are placed
+
+        Return
+        -------
+        A tuple (gain, gainEntry, beta, betaEntry, vcc, vccEntry)
+        
+    """
+
+    fields = ()
+    for y in (120, 180, 240):
+        variable = DoubleVar(frame)
+        entry = Entry(frame, textvariable = variable, width = "30")
+        entry.place(x=20,y=y)
+        fields += (variable, entry)
+    return fields
 
+@timed("screen.appAccess2")
 def appAccess2 (): #Menú de diseño fuente dual
-    selectmenu.destroy()
-    global menuAccess
-    menuAccess = Tk()
-    menuAccess.geometry("320x440")
-    menuAccess.title("BJTpy - Ingreso de Datos")
-    menuAccess.resizable(False,False)
-    menuAccess.iconbitmap("Images/BJTpy_ICO.ico")
-    #Background Menu Image
-    menuAccessImage = ImageTk.PhotoImage(Image.open("Images/MenuIngreso.jpg"))
-    Label(menuAccess, image = menuAccessImage).place(x=0,y=0)
-    #Main content of the page 
-    Label(menuAccess, text = "En este espacio se van a introducir algunos datos para\nel respectivo diseño de un amplificador BJT en su con-\nfiguración inversora.",justify = "left").place(x=15,y=40)
-    #Circuit main variables
-    Label(menuAccess, text = "Ganancia (Av): [126-250]*").place(x=20,y=100)
-    global gain
-    global gainEntry
-    gain = DoubleVar()
-    gainEntry = Entry(menuAccess, textvariable = gain, width = "30")
-    gainEntry.place(x=20,y=120)
-    Label(menuAccess, text = "Beta (β): [100-200]*").place(x=20,y=160)
-    global beta
-    global betaEntry
-    beta = DoubleVar()
-    betaEntry = Entry(menuAccess, textvariable = beta, width = "30")
-    betaEntry.place(x=20,y=180)
-    Label(menuAccess, text = "Vcc / -Vee: [10-20]*").place(x=20,y=220)
-    global vcc
-    global vccEntry
-    vcc = DoubleVar()
-    vccEntry = Entry(menuAccess, textvariable = vcc, width = "30")
-    vccEntry.place(x=20,y=240)
-    Label(menuAccess, text = "Se le añadirá automáticamente una etapa seguidora\npara una mayor estabilidad en el diseño de fuente\ndual.",justify = "left").place(x=15,y=280)
-    Button(menuAccess, text = "Crear Amplificador", height = "2", width = "30", cursor = "hand2", command = makeAmp2).place(x=50,y=340)
-    Button(menuAccess, text = "?", height = "1", width = "2", cursor = "hand2", command = apphelp).place(x=280,y=380)
-    #The loop where everything starts to work in this function, it is needed so the window stays in the screen, otherwise it would dissapear
-    menuAccess.mainloop()
+    global menuAccess, gain, gainEntry, beta, betaEntry, vcc, vccEntry
+    menuAccess, new = showScreen("access2", "320x440", "BJTpy - Ingreso de Datos")
+    if new:
+        #Background Menu Image
+        Label(menuAccess, image = loadImage("Images/MenuIngreso.jpg")).place(x=0,y=0)
+        #Main content of the page 
+        Label(menuAccess, text = "En este espacio se van a introducir algunos datos para\nel respectivo diseño de un amplificador BJT en su con-\nfiguración inversora.",justify = "left").place(x=15,y=40)
+        #Circuit main variables
+        Label(menuAccess, text = "Ganancia (Av): [126-250]*").place(x=20,y=100)
+        Label(menuAccess, text = "Beta (β): [100-200]*").place(x=20,y=160)
+        Label(menuAccess, text = "Vcc / -Vee: [10-20]*").place(x=20,y=220)
+        menuAccess.fields = accessFields(menuAccess)
+        Label(menuAccess, text = "Se le añadirá automáticamente una etapa seguidora\npara una mayor estabilidad en el diseño de fuente\ndual.",justify = "left").place(x=15,y=280)
+        Button(menuAccess, text = "Crear Amplificador", height = "2", width = "30", cursor = "hand2", command = makeAmp2).place(x=50,y=340)
+        Button(menuAccess, text = "?", height = "1", width = "2", cursor = "hand2", command = apphelp).place(x=280,y=380)
+    gain, gainEntry, beta, betaEntry, vcc, vccEntry = menuAccess.fields
+    #Every visit starts with empty values, as a new screen
+    for variable in (gain, beta, vcc):
+        variable.set(0.0)
 
 def makeAmp ():
     """
@@ -240,7 +459,7 @@ def errorWindow():
 
         Parameters
         ----------
-        errorWin: Tk
+        errorWin: Toplevel
             The screen that shows an error window
             
         Return
@@ -249,7 +468,7 @@ def errorWindow():
         
     """
     
-    errorWin = Tk()
+    errorWin = Toplevel(window)
     errorWin.geometry("350x80")
     errorWin.title("BJTpy - Error")
     errorWin.resizable(False,False)
@@ -271,16 +490,15 @@ def apphelp ():
     """
     os.startfile("Help\Manual.pdf")
 
+@timed("screen.makeCircuit")
 def makeCircuit():
     """
     The graffic controller to build every possible amplifier in the software
 
         Parameters
         ----------
-        menuCircuit: Tk
+        menuCircuit: Frame
             The Third screen controller
-        menuAmplifier: ImageTk
-            Background image in this window
         followerCheck: IntVar
             Carries the information to check if a follower is needed in the final stage
 
@@ -290,132 +508,383 @@ def makeCircuit():
         
     """
     
-    menuAccess.destroy()
     global menuCircuit
-    menuCircuit = Tk()
-    menuCircuit.geometry("920x518")
-    menuCircuit.title("BJTpy - Circuito Amplificador")
-    menuCircuit.resizable(False,False)
-    menuCircuit.iconbitmap("Images/BJTpy_ICO.ico")
-    #Background Image
-    menuAmplifier = ImageTk.PhotoImage(Image.open("Images/MenuAmplificador.jpg"))
-    Label(menuCircuit, image = menuAmplifier).place(x=0,y=0)
     #Process to build the schematic and organize all the variables
     followerCheck = follower.get()
     if followerCheck == 1:
         if 2<=gainValue<=5:
-            imageCircuit = ImageTk.PhotoImage(Image.open("Images/Casos/UnaEtapaSeguidor.jpg"))
-            Label(menuCircuit, image = imageCircuit).place(x=175,y=100)
-            Label(menuCircuit, text = "Amplificador de una etapa con seguidor", justify = "center", font=("Times New Roman", 20)).place(x=250,y=45)
-            calculateOneStageF()
-            #Labels for the Follower Stage
-            Label(menuCircuit, text = str(RB_S)+" Ω", bg = "white").place(x=580,y=210)
-            Label(menuCircuit, text = str(RE_S)+" Ω", bg = "white").place(x=680,y=360)
-            Label(menuCircuit, text = str(vccValue)+" V", bg = "white").place(x=570,y=150)
-            #Labels for Stage 1
-            Label(menuCircuit, text = str(RC)+" Ω", bg = "white").place(x=470,y=210)
-            Label(menuCircuit, text = str(RE)+" Ω", bg = "white").place(x=470,y=360)
-            Label(menuCircuit, text = str(R1)+" Ω", bg = "white").place(x=350,y=210)
-            Label(menuCircuit, text = str(R2)+" Ω", bg = "white").place(x=350,y=360)
+            menuCircuit = showCircuit("Images/Casos/UnaEtapaSeguidor.JPG", 175, 100, "Amplificador de una etapa con seguidor", 250)
+            def show(result):
+                calculateOneStageF(result)
+                #Labels for the Follower Stage
+                value(menuCircuit, str(RB_S)+" Ω", 580, 210)
+                value(menuCircuit, str(RE_S)+" Ω", 680, 360)
+                value(menuCircuit, str(vccValue)+" V", 570, 150)
+                #Labels for Stage 1
+                value(menuCircuit, str(RC)+" Ω", 470, 210)
+                value(menuCircuit, str(RE)+" Ω", 470, 360)
+                value(menuCircuit, str(R1)+" Ω", 350, 210)
+                value(menuCircuit, str(R2)+" Ω", 350, 360)
+            compute(menuCircuit, "OneStageF", show, appAccess)
         elif 6<=gainValue<=25:
-            imageCircuit = ImageTk.PhotoImage(Image.open("Images/Casos/DosEtapasSeguidor.jpg"))
-            Label(menuCircuit, image = imageCircuit).place(x=60,y=100)
-            Label(menuCircuit, text = "Amplificador de dos etapas con seguidor", justify = "center", font=("Times New Roman", 20)).place(x=250,y=45)
-            calculateTwoStagesF()
-            #Labels for the Follower Stage
-            Label(menuCircuit, text = str(RB_S)+" Ω", bg = "white").place(x=690,y=205)
-            Label(menuCircuit, text = str(RE_S)+" Ω", bg = "white").place(x=790,y=355)
-            Label(menuCircuit, text = str(vccValue)+" V", bg = "white").place(x=465,y=145)
-            #Labels for Stage 2
-            Label(menuCircuit, text = str(RC_2)+" Ω", bg = "white").place(x=595,y=205)
-            Label(menuCircuit, text = str(RE_2)+" Ω", bg = "white").place(x=595,y=355)
-            Label(menuCircuit, text = str(R1_2)+" Ω", bg = "white").place(x=475,y=205)
-            Label(menuCircuit, text = str(R2_2)+" Ω", bg = "white").place(x=475,y=355)
-            #Labels for Stage 1
-            Label(menuCircuit, text = str(RC_1)+" Ω", bg = "white").place(x=360,y=205)
-            Label(menuCircuit, text = str(RE_1)+" Ω", bg = "white").place(x=360,y=355)
-            Label(menuCircuit, text = str(R1_1)+" Ω", bg = "white").place(x=245,y=205)
-            Label(menuCircuit, text = str(R2_1)+" Ω", bg = "white").place(x=245,y=355)
+            menuCircuit = showCircuit("Images/Casos/DosEtapasSeguidor.jpg", 60, 100, "Amplificador de dos etapas con seguidor", 250)
+            def show(result):
+                calculateTwoStagesF(result)
+                #Labels for the Follower Stage
+                value(menuCircuit, str(RB_S)+" Ω", 690, 205)
+                value(menuCircuit, str(RE_S)+" Ω", 790, 355)
+                value(menuCircuit, str(vccValue)+" V", 465, 145)
+                #Labels for Stage 2
+                value(menuCircuit, str(RC_2)+" Ω", 595, 205)
+                value(menuCircuit, str(RE_2)+" Ω", 595, 355)
+                value(menuCircuit, str(R1_2)+" Ω", 475, 205)
+                value(menuCircuit, str(R2_2)+" Ω", 475, 355)
+                #Labels for Stage 1
+                value(menuCircuit, str(RC_1)+" Ω", 360, 205)
+                value(menuCircuit, str(RE_1)+" Ω", 360, 355)
+                value(menuCircuit, str(R1_1)+" Ω", 245, 205)
+                value(menuCircuit, str(R2_1)+" Ω", 245, 355)
+            compute(menuCircuit, "TwoStagesF", show, appAccess)
         else:
-            imageCircuit = ImageTk.PhotoImage(Image.open("Images/Casos/TresEtapasSeguidor.jpg"))
-            Label(menuCircuit, image = imageCircuit).place(x=17,y=120) 
-            Label(menuCircuit, text = "Amplificador de tres etapas con seguidor", justify = "center", font=("Times New Roman", 20)).place(x=250,y=45)
-            calculateThreeStagesF()
-            #Labels for the Follower Stage
-            Label(menuCircuit, text = str(RB_S)+" Ω", bg = "white").place(x=775,y=210)
-            Label(menuCircuit, text = str(RE_S)+" Ω", bg = "white").place(x=850,y=335)
-            Label(menuCircuit, text = str(vccValue)+" V", bg = "white").place(x=510,y=155)
-            #Labels for Stage 3
-            Label(menuCircuit, text = str(RC_3)+" Ω", bg = "white").place(x=685,y=210)
-            Label(menuCircuit, text = str(RE_3)+" Ω", bg = "white").place(x=685,y=335)
-            Label(menuCircuit, text = str(R1_3)+" Ω", bg = "white").place(x=580,y=210)
-            Label(menuCircuit, text = str(R2_3)+" Ω", bg = "white").place(x=580,y=335)
-            #Labels for Stage 2
-            Label(menuCircuit, text = str(RC_2)+" Ω", bg = "white").place(x=485,y=210)
-            Label(menuCircuit, text = str(RE_2)+" Ω", bg = "white").place(x=485,y=335)
-            Label(menuCircuit, text = str(R1_2)+" Ω", bg = "white").place(x=380,y=210)
-            Label(menuCircuit, text = str(R2_2)+" Ω", bg = "white").place(x=380,y=335)
-            #Labels for Stage 1
-            Label(menuCircuit, text = str(RC_1)+" Ω", bg = "white").place(x=280,y=210)
-            Label(menuCircuit, text = str(RE_1)+" Ω", bg = "white").place(x=280,y=335)
-            Label(menuCircuit, text = str(R1_1)+" Ω", bg = "white").place(x=175,y=210)
-            Label(menuCircuit, text = str(R2_1)+" Ω", bg = "white").place(x=175,y=335)
+            menuCircuit = showCircuit("Images/Casos/TresEtapasSeguidor.jpg", 17, 120, "Amplificador de tres etapas con seguidor", 250)
+            def show(result):
+                calculateThreeStagesF(result)
+                #Labels for the Follower Stage
+                value(menuCircuit, str(RB_S)+" Ω", 775, 210)
+                value(menuCircuit, str(RE_S)+" Ω", 850, 335)
+                value(menuCircuit, str(vccValue)+" V", 510, 155)
+                #Labels for Stage 3
+                value(menuCircuit, str(RC_3)+" Ω", 685, 210)
+                value(menuCircuit, str(RE_3)+" Ω", 685, 335)
+                value(menuCircuit, str(R1_3)+" Ω", 580, 210)
+                value(menuCircuit, str(R2_3)+" Ω", 580, 335)
+                #Labels for Stage 2
+                value(menuCircuit, str(RC_2)+" Ω", 485, 210)
+                value(menuCircuit, str(RE_2)+" Ω", 485, 335)
+                value(menuCircuit, str(R1_2)+" Ω", 380, 210)
+                value(menuCircuit, str(R2_2)+" Ω", 380, 335)
+                #Labels for Stage 1
+                value(menuCircuit, str(RC_1)+" Ω", 280, 210)
+                value(menuCircuit, str(RE_1)+" Ω", 280, 335)
+                value(menuCircuit, str(R1_1)+" Ω", 175, 210)
+                value(menuCircuit, str(R2_1)+" Ω", 175, 335)
+            compute(menuCircuit, "ThreeStagesF", show, appAccess)
     else:
         if 2<=gainValue<=5:
-            imageCircuit = ImageTk.PhotoImage(Image.open("Images/Casos/UnaEtapa.jpg"))
-            Label(menuCircuit, image = imageCircuit).place(x=300,y=100)
-            Label(menuCircuit, text = "Amplificador de una etapa", justify = "center", font=("Times New Roman", 20)).place(x=320,y=45)
-            calculateOneStage()
-            Label(menuCircuit, text = str(RC)+" Ω", bg = "white").place(x=600,y=210)
-            Label(menuCircuit, text = str(RE)+" Ω", bg = "white").place(x=600,y=320)
-            Label(menuCircuit, text = str(R1)+" Ω", bg = "white").place(x=480,y=210)
-            Label(menuCircuit, text = str(R2)+" Ω", bg = "white").place(x=480,y=320)
-            Label(menuCircuit, text = str(vccValue)+" V", bg = "white").place(x=580,y=150)
+            menuCircuit = showCircuit("Images/Casos/UnaEtapa.jpg", 300, 100, "Amplificador de una etapa", 320)
+            def show(result):
+                calculateOneStage(result)
+                value(menuCircuit, str(RC)+" Ω", 600, 210)
+                value(menuCircuit, str(RE)+" Ω", 600, 320)
+                value(menuCircuit, str(R1)+" Ω", 480, 210)
+                value(menuCircuit, str(R2)+" Ω", 480, 320)
+                value(menuCircuit, str(vccValue)+" V", 580, 150)
+            compute(menuCircuit, "OneStage", show, appAccess)
         elif 6<=gainValue<=25:
-            imageCircuit = ImageTk.PhotoImage(Image.open("Images/Casos/DosEtapas.jpg"))
-            Label(menuCircuit, image = imageCircuit).place(x=150,y=100)
-            Label(menuCircuit, text = "Amplificador de dos etapas", justify = "center", font=("Times New Roman", 20)).place(x=320,y=45)
-            calculateTwoStages()
-            #Labels for Stage 2
-            Label(menuCircuit, text = str(RC_2)+" Ω", bg = "white").place(x=690,y=210)
-            Label(menuCircuit, text = str(RE_2)+" Ω", bg = "white").place(x=690,y=350)
-            Label(menuCircuit, text = str(R1_2)+" Ω", bg = "white").place(x=570,y=210)
-            Label(menuCircuit, text = str(R2_2)+" Ω", bg = "white").place(x=570,y=350)
-            Label(menuCircuit, text = str(vccValue)+" V", bg = "white").place(x=530,y=145)
-            #Labels for Stage 1
-            Label(menuCircuit, text = str(RC_1)+" Ω", bg = "white").place(x=450,y=210)
-            Label(menuCircuit, text = str(RE_1)+" Ω", bg = "white").place(x=450,y=350)
-            Label(menuCircuit, text = str(R1_1)+" Ω", bg = "white").place(x=330,y=210)
-            Label(menuCircuit, text = str(R2_1)+" Ω", bg = "white").place(x=330,y=350)
+            menuCircuit = showCircuit("Images/Casos/DosEtapas.jpg", 150, 100, "Amplificador de dos etapas", 320)
+            def show(result):
+                calculateTwoStages(result)
+                #Labels for Stage 2
+                value(menuCircuit, str(RC_2)+" Ω", 690, 210)
+                value(menuCircuit, str(RE_2)+" Ω", 690, 350)
+                value(menuCircuit, str(R1_2)+" Ω", 570, 210)
+                value(menuCircuit, str(R2_2)+" Ω", 570, 350)
+                value(menuCircuit, str(vccValue)+" V", 530, 145)
+                #Labels for Stage 1
+                value(menuCircuit, str(RC_1)+" Ω", 450, 210)
+                value(menuCircuit, str(RE_1)+" Ω", 450, 350)
+                value(menuCircuit, str(R1_1)+" Ω", 330, 210)
+                value(menuCircuit, str(R2_1)+" Ω", 330, 350)
+            compute(menuCircuit, "TwoStages", show, appAccess)
         else:
-            imageCircuit = ImageTk.PhotoImage(Image.open("Images/Casos/TresEtapas.jpg"))
-            Label(menuCircuit, image = imageCircuit).place(x=45,y=110) 
-            Label(menuCircuit, text = "Amplificador de tres etapas", justify = "center", font=("Times New Roman", 20)).place(x=320,y=45)
-            calculateThreeStages()
-            #Labels for Stage 3
-            Label(menuCircuit, text = str(RC_3)+" Ω", bg = "white").place(x=820,y=210)
-            Label(menuCircuit, text = str(RE_3)+" Ω", bg = "white").place(x=820,y=355)
-            Label(menuCircuit, text = str(R1_3)+" Ω", bg = "white").place(x=700,y=210)
-            Label(menuCircuit, text = str(R2_3)+" Ω", bg = "white").place(x=700,y=355)
-            Label(menuCircuit, text = str(vccValue)+" V", bg = "white").place(x=630,y=155)
-            #Labels for Stage 2
-            Label(menuCircuit, text = str(RC_2)+" Ω", bg = "white").place(x=580,y=210)
-            Label(menuCircuit, text = str(RE_2)+" Ω", bg = "white").place(x=580,y=355)
-            Label(menuCircuit, text = str(R1_2)+" Ω", bg = "white").place(x=460,y=210)
-            Label(menuCircuit, text = str(R2_2)+" Ω", bg = "white").place(x=460,y=355)
-            #Labels for Stage 1
-            Label(menuCircuit, text = str(RC_1)+" Ω", bg = "white").place(x=345,y=210)
-            Label(menuCircuit, text = str(RE_1)+" Ω", bg = "white").place(x=345,y=355)
-            Label(menuCircuit, text = str(R1_1)+" Ω", bg = "white").place(x=225,y=210)
-            Label(menuCircuit, text = str(R2_1)+" Ω", bg = "white").place(x=225,y=355)
-    Button(menuCircuit, text = "Ver paso a paso", height = "2", width = "30", cursor = "hand2", command = StepByStep).place(x=660,y=450)
-    Button(menuCircuit, text = "←", height = "1", width = "2", cursor = "hand2", command = Reset).place(x=50,y=50)
-    #The loop where everything starts to work in this function, it is needed so the window stays in the screen, otherwise it would dissapear
-    menuCircuit.mainloop()
+            menuCircuit = showCircuit("Images/Casos/TresEtapas.jpg", 45, 110, "Amplificador de tres etapas", 320)
+            def show(result):
+                calculateThreeStages(result)
+                #Labels for Stage 3
+                value(menuCircuit, str(RC_3)+" Ω", 820, 210)
+                value(menuCircuit, str(RE_3)+" Ω", 820, 355)
+                value(menuCircuit, str(R1_3)+" Ω", 700, 210)
+                value(menuCircuit, str(R2_3)+" Ω", 700, 355)
+                value(menuCircuit, str(vccValue)+" V", 630, 155)
+                #Labels for Stage 2
+                value(menuCircuit, str(RC_2)+" Ω", 580, 210)
+                value(menuCircuit, str(RE_2)+" Ω", 580, 355)
+                value(menuCircuit, str(R1_2)+" Ω", 460, 210)
+                value(menuCircuit, str(R2_2)+" Ω", 460, 355)
+                #Labels for Stage 1
+                value(menuCircuit, str(RC_1)+" Ω", 345, 210)
+                value(menuCircuit, str(RE_1)+" Ω", 345, 355)
+                value(menuCircuit, str(R1_1)+" Ω", 225, 210)
+                value(menuCircuit, str(R2_1)+" Ω", 225, 355)
+            compute(menuCircuit, "ThreeStages", show, appAccess)
+
+def showCircuit(image, x, y, title, titleX):
+    """
+    Shows the screen of a schematic, each schematic has its own frame that is built only once
+
+        Parameters
+        ----------
+        image: str
+            Path of the schematic
+        x: Int
+            Horizontal position of the schematic
+        y: Int
+            Vertical position of the schematic
+        title: str
+            Title of the amplifier
+        titleX: Int
+            Horizontal position of the title
+
+        Return
+        -------
+        The Frame of the screen
+        
+    """
+
+    frame, new = showScreen(image, "920x518", "BJTpy - Circuito Amplificador")
+    if new:
+        #Background Image
+        Label(frame, image = loadImage("Images/MenuAmplificador.jpg")).place(x=0,y=0)
+        Label(frame, image = loadImage(image)).place(x=x,y=y)
+        Label(frame, text = title, justify = "center", font=("Times New Roman", 20)).place(x=titleX,y=45)
+        Button(frame, text = "Ver paso a paso", height = "2", width = "30", cursor = "hand2", command = StepByStep).place(x=660,y=450)
+        Button(frame, text = "Ver alternativas", height = "2", width = "20", cursor = "hand2", command = lambda: showFront(frame)).place(x=480,y=450)
+        Button(frame, text = "←", height = "1", width = "2", cursor = "hand2", command = Reset).place(x=50,y=50)
+        frame.values = {}
+        #Shown only while the design is calculated, see compute()
+        frame.progress = ttk.Progressbar(frame, mode = "indeterminate", length = 200)
+        frame.cancel = Button(frame, text = "Cancelar", height = "2", width = "12", cursor = "hand2")
+    return frame
+
+def compute(frame, name, show, back):
+    """
+    Calculates a design in a worker thread while the screen of the schematic shows a progress bar, so the
+    window keeps answering. The labels are written by show() when the design is ready
+
+        Parameters
+        ----------
+        frame: Frame
+            The screen of the schematic
+        name: str
+            Key of the design in engine.TABLES
+        show: function
+            Receives the Design in the Tk thread and writes its values
+        back: function
+            Screen shown if the user cancels the design
+
+        Return
+        -------
+        Void
+        
+    """
+
+    global pending
+    from concurrent.futures import Future
+    from engine import designTopology
+    stopDesign()
+    for label in frame.values.values():
+        label.config(text = "")
+    pending = job = Future()
+    job.frame = frame
+    frame.topology = name
+    inputs = (name, gainValue, betaValue, vccValue)
+
+    def work():
+        if job.set_running_or_notify_cancel():
+            try:
+                job.set_result(designTopology(*inputs))
+            except Exception as error:
+                job.set_exception(error)
+
+    def poll():
+        global pending
+        #A cancelled or replaced design is dropped when it finishes
+        if pending is not job:
+            return
+        if not job.done():
+            window.after(POLL, poll)
+            return
+        stopDesign()
+        try:
+            result = job.result()
+        except Exception:
+            errorWindow()
+            return
+        show(result)
+
+    frame.progress.place(x=360,y=250)
+    frame.progress.start()
+    frame.cancel.config(command = lambda: cancelDesign(back))
+    frame.cancel.place(x=415,y=280)
+    threading.Thread(target = work, daemon = True).start()
+    window.after(POLL, poll)
+
+def stopDesign():
+    """
+    Forgets the design being calculated and hides its progress bar, the worker thread ends by itself
+
+        Parameters
+        ----------
+        Void
+
+        Return
+        -------
+        Void
+        
+    """
+
+    global pending
+    if pending is not None:
+        pending.cancel()
+        pending.frame.progress.stop()
+        pending.frame.progress.place_forget()
+        pending.frame.cancel.place_forget()
+        pending = None
+
+def cancelDesign(back):
+    """
+    Cancels the design being calculated and goes back to the screen of the data
+
+        Parameters
+        ----------
+        back: function
+            The screen of the data
+
+        Return
+        -------
+        Void
+        
+    """
+
+    stopDesign()
+    back()
+
+@timed("screen.showFront")
+def showFront(frame):
+    """
+    Shows the Pareto front of the design of a schematic: the choices of RC, RE_S, Voffset and VC that
+    no other choice beats in supply current, gain error, input resistance and output swing at once.
+    The front is found in a worker thread, each heading sorts the table and each row shows its resistors
+
+        Parameters
+        ----------
+        frame: Frame
+            The screen of the schematic, its design was calculated by compute()
+
+        Return
+        -------
+        Void
+        
+    """
+
+    from concurrent.futures import Future
+    from batch import stageFields
+    from pareto import frontTopology
+    name = getattr(frame, "topology", None)
+    if name is None:
+        return
+    inputs = (name, gainValue, betaValue, vccValue)
+    frontWin = Toplevel(window)
+    frontWin.geometry("720x420")
+    frontWin.title("BJTpy - Alternativas de Diseño")
+    frontWin.resizable(False,False)
+    frontWin.iconbitmap("Images/BJTpy_ICO.ico")
+    Label(frontWin, text = "Diseños en los que ninguna otra elección mejora todos los valores a la vez:").place(x=20,y=10)
+    #Heading and scale of each column of the front
+    columns = {"current": ("Corriente (mA)", 1e3), "gainError": ("Error de ganancia (%)", 1e2),
+               "Rin": ("Rin (kΩ)", 1e-3), "swing": ("Excursión (Vpp)", 1)}
+    tree = ttk.Treeview(frontWin, columns = list(columns), show = "headings", height = 12)
+    for field, (text, scale) in columns.items():
+        tree.heading(field, text = text, command = lambda field=field: sort(field))
+        tree.column(field, width = 165, anchor = "e")
+    tree.place(x=20,y=40)
+    scroll = Scrollbar(frontWin, orient = "vertical", command = tree.yview)
+    scroll.place(x=685,y=40,height=265)
+    tree.config(yscrollcommand = scroll.set)
+    detail = Label(frontWin, text = "Calculando...", justify = "left", font = ("Courier New", 9))
+    detail.place(x=20,y=320)
+    job = Future()
+    order = {}
+
+    def work():
+        try:
+            job.set_result(frontTopology(*inputs))
+        except Exception as error:
+            job.set_exception(error)
+
+    def poll():
+        if not frontWin.winfo_exists():
+            return
+        if not job.done():
+            window.after(POLL, poll)
+            return
+        try:
+            front = job.result()
+        except Exception:
+            frontWin.destroy()
+            errorWindow()
+            return
+        for k, row in enumerate(front):
+            tree.insert("", END, iid = str(k), values = ["%.3f" % (row[field]*scale) for field, (_, scale) in columns.items()])
+        detail.config(text = "%d diseños. Seleccione uno para ver sus resistencias." % len(front))
+        tree.bind("<<TreeviewSelect>>", lambda event: select(front))
+
+    def select(front):
+        row = front[int(tree.selection()[0])]
+        lines = []
+        for suffix, fields in stageFields(name):
+            text = "  ".join("%s%s=%.2f Ω" % (field, suffix, row[field+suffix]) for field in fields if field != "IC")
+            if "VC"+suffix in row.dtype.names:
+                text += "  VC=%.2f V" % row["VC"+suffix]
+            lines.append(text)
+        if "voffset" in row.dtype.names:
+            lines[-1] += "  Voffset=%.2f V" % row["voffset"]
+        detail.config(text = "\n".join(lines))
+
+    def sort(field):
+        #Each click on a heading changes the direction
+        order[field] = not order.get(field, True)
+        rows = sorted(tree.get_children(), key = lambda item: float(tree.set(item, field)), reverse = order[field])
+        for k, item in enumerate(rows):
+            tree.move(item, "", k)
+
+    threading.Thread(target = work, daemon = True).start()
+    window.after(POLL, poll)
+
+def value(frame, text, x, y, font = None):
+    """
+    Writes a value over the schematic, the label of each position is created once and updated after
+
+        Parameters
+        ----------
+        frame: Frame
+            The screen of the schematic
+        text: str
+            The value with its unit
+        x: Int
+            Horizontal position of the value
+        y: Int
+            Vertical position of the value
+        font: tuple
+            Font of the value, the default one if it is None
+
+        Return
+        -------
+        Void
+        
+    """
+
+    label = frame.values.get((x,y))
+    if label is None:
+        label = frame.values[(x,y)] = Label(frame, bg = "white")
+        if font is not None:
+            label.config(font = font)
+        label.place(x=x,y=y)
+    label.config(text = text)
 
 def Reset():
     """
-    Destroys final window and comes back to the first one
+    Comes back to the first screen
 
         Parameters
         ----------
@@ -423,16 +892,16 @@ def Reset():
             
         Return
         -------
-        root
+        appMenu
         
     """
     
-    menuCircuit.destroy()
-    root()
+    stopDesign()
+    appMenu()
 
 def Reset2():
     """
-    Destroys final window and comes back to the first one
+    Comes back to the first screen
 
         Parameters
         ----------
@@ -440,12 +909,12 @@ def Reset2():
             
         Return
         -------
-        root
+        appMenu
         
     """
     
-    selectmenu.destroy()
-    root()
+    stopDesign()
+    appMenu()
 
 def StepByStep():
     """
@@ -464,12 +933,14 @@ def StepByStep():
     os.startfile("Help\PasoaPaso.pdf")
 
 
-def calculateOneStageF():
+def calculateOneStageF(result = None):
     """
     Calculates the values of the variables needed in the first stage in the amplifier, including the follower stage.
 
         Parameters
         ----------
+        result: Design
+            The design made by compute(), it is calculated here if it is None
         RC: Int
             Stores the value of RC in the first stage
         RE: Int
@@ -482,20 +953,6 @@ def calculateOneStageF():
             Stores the value of RB in the follower stage
         RE_S: Int
             Stores the value of RE in the follower stage
-        rand: randint
-            Stores a random number between one and three
-        vce: Int
-            Stores the value of vce
-        RL: Int
-            Stores the value of RL in the first stage
-        expr: expression
-            Stores the expression temporarily
-        solTemp: solve
-            It is the solution for the temporal expression
-        IC: Int
-            Stores the value of IC in the first stage
-        VB: Int
-            Stores the value of VB in the first stage
         
         Return
         -------
@@ -503,40 +960,21 @@ def calculateOneStageF():
         
     """
     global RC, RE, R1, R2, RB_S, RE_S
-    #FOLLOWER STAGE
-    vce=(vccValue)/2
-    rand = random.randint(1,3)
-    if rand == 1:
-        RE_S = 1000
-    elif rand == 2:
-        RE_S = 1500
-    else:
-        RE_S = 2000
-    RB_S=round((0.7+vce)/((vce/RE_S)/betaValue),2)
-    #FIRST INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC = 10500
-    elif rand == 2:
-        RC = 15500
-    else:
-        RC = 19500
-    RL = (1/RB_S+1/(((betaValue*0.025)/(vce/RE_S))+(betaValue+1)*RE_S))**-1
-    RE = symbols('RE')
-    expr = ((betaValue*(1/RC+1/RL)**-1)/((betaValue+1)*RE+((betaValue*0.025)/(vce/(RE+RC)))))-gainValue
-    solTemp = solve(expr)
-    RE = round(solTemp[0],2)
-    IC=vce/(RE+RC)
-    R2=round((betaValue)*RE/10,2)
-    VB=0.7+(IC*RE)
-    R1=round((vccValue*R2/VB)-R2,2)
-
-def calculateTwoStagesF():
+    if result is None:
+        from engine import designTopology
+        result = designTopology("OneStageF", gainValue, betaValue, vccValue)
+    stage1, stageS = result.stages
+    RB_S, RE_S = stageS.RB, stageS.RE
+    RC, RE, R1, R2 = stage1.RC, stage1.RE, stage1.R1, stage1.R2
+
+def calculateTwoStagesF(result = None):
     """
     Calculates the values of the variables needed in the two stages in the amplifier, including the follower stage.
         
         Parameters
         ----------
+        result: Design
+            The design made by compute(), it is calculated here if it is None
         RC_1: Int
             Stores the value of RC in the first stage
         RE_1: Int
@@ -557,26 +995,6 @@ def calculateTwoStagesF():
             Stores the value of RB in the follower stage
         RE_S: Int
             Stores the value of RE in the follower stage
-        vce: Int
-            Stores the value of vce
-        rand: randint
-            Stores a random number between one and three
-        RL_2: Int
-            Stores the value of RL in the second stage
-        RL_1: Int
-            Stores the value of RL in the first stage
-        expr: expression
-            Stores the expression temporarily
-        solTemp: solve
-            It is the solution for the temporal expression
-        IC_2: Int
-            Stores the value of IC in the second stage
-        VB_2: Int
-            Stores the value of VB in the second stage
-        IC_1: Int
-            Stores the value of IC in the first stage
-        VB_1: Int
-            Stores the value of VB in the first stage
         
         Return
         -------
@@ -585,57 +1003,22 @@ def calculateTwoStagesF():
     """
     
     global RC_1, RE_1, R1_1, R2_1, RC_2, RE_2, R1_2, R2_2, RB_S, RE_S
-    #FOLLOWER STAGE
-    vce=(vccValue)/2
-    rand = random.randint(1,3)
-    if rand == 1:
-        RE_S = 1000
-    elif rand == 2:
-        RE_S = 1500
-    else:
-        RE_S = 2000
-    RB_S=round((0.7+vce)/((vce/RE_S)/betaValue),2)
-    #SECOND INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_2 = 10500
-    elif rand == 2:
-        RC_2 = 13500
-    else:
-        RC_2 = 15500
-    RL_2 = (1/RB_S+1/(((betaValue*0.025)/(vce/RE_S))+(betaValue+1)*RE_S))**-1
-    RE_2 = symbols('RE_2')
-    expr = ((betaValue*(1/RC_2+1/RL_2)**-1)/((betaValue+1)*RE_2+((betaValue*0.025)/(vce/(RE_2+RC_2)))))-((gainValue)**(1/2))
-    solTemp = solve(expr)
-    RE_2 = round(solTemp[0],2)
-    IC_2=vce/(RE_2+RC_2)
-    R2_2=round((betaValue)*RE_2/10,2)
-    VB_2=0.7+(IC_2*RE_2)
-    R1_2=round((vccValue*R2_2/VB_2)-R2_2,2)
-    #FIRST INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_1 = 17500
-    elif rand == 2:
-        RC_1 = 18500
-    else:
-        RC_1 = 19500
-    RL_1 = (1/R1_2+1/R2_2+1/(((betaValue*0.025)/(vce/(RE_2+RC_2)))+(betaValue+1)*RE_2))**-1
-    RE_1 = symbols('RE_1')
-    expr = ((betaValue*(1/RC_1+1/RL_1)**-1)/((betaValue+1)*RE_1+((betaValue*0.025)/(vce/(RE_1+RC_1)))))-((gainValue)**(1/2))
-    solTemp = solve(expr)
-    RE_1 = round(solTemp[0],2)
-    IC_1=vce/(RE_1+RC_1)
-    R2_1=round(((betaValue)*RE_1/10),2)
-    VB_1=0.7+(IC_1*RE_1)
-    R1_1=round((vccValue*R2_1/VB_1)-R2_1,2)
-
-def calculateThreeStagesF():
+    if result is None:
+        from engine import designTopology
+        result = designTopology("TwoStagesF", gainValue, betaValue, vccValue)
+    stage1, stage2, stageS = result.stages
+    RB_S, RE_S = stageS.RB, stageS.RE
+    RC_2, RE_2, R1_2, R2_2 = stage2.RC, stage2.RE, stage2.R1, stage2.R2
+    RC_1, RE_1, R1_1, R2_1 = stage1.RC, stage1.RE, stage1.R1, stage1.R2
+
+def calculateThreeStagesF(result = None):
     """
     Calculates the values of the variables needed in the three stages in the amplifier, including the follower stage.
 
         Parameters
         ----------
+        result: Design
+            The design made by compute(), it is calculated here if it is None
         RC_1: Int
             Stores the value of RC in the first stage
         RE_1: Int
@@ -664,32 +1047,6 @@ def calculateThreeStagesF():
             Stores the value of RB in the follower stage
         RE_S: Int
             Stores the value of RE in the follower stage
-        vce: Int
-            Stores the value of vce
-        rand: randint
-            Stores a random number between one and three
-        RL_3: Int
-            Stores the value of RL in the third stage
-        RL_2: Int
-            Stores the value of RL in the second stage
-        RL_1: Int
-            Stores the value of RL in the first stage
-        expr: expression
-            Stores the expression temporarily
-        solTemp: solve
-            It is the solution for the temporal expression
-        IC_3: Int
-            Stores the value of IC in the third stage
-        VB_3: Int
-            Stores the value of VB in the third stage
-        IC_2: Int
-            Stores the value of IC in the second stage
-        VB_2: Int
-            Stores the value of VB in the second stage
-        IC_1: Int
-            Stores the value of IC in the first stage
-        VB_1: Int
-            Stores the value of VB in the first stage
         
         Return
         -------
@@ -698,74 +1055,23 @@ def calculateThreeStagesF():
     """
     
     global RC_1, RE_1, R1_1, R2_1, RC_2, RE_2, R1_2, R2_2, RC_3, RE_3, R1_3, R2_3, RB_S, RE_S
-    #FOLLOWER STAGE
-    vce=(vccValue)/2
-    rand = random.randint(1,3)
-    if rand == 1:
-        RE_S = 1000
-    elif rand == 2:
-        RE_S = 1500
-    else:
-        RE_S = 2000
-    RB_S=round((0.7+vce)/((vce/RE_S)/betaValue),2)
-    #THIRD INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_3 = 10500
-    elif rand == 2:
-        RC_3 = 13500
-    else:
-        RC_3 = 15500
-    RL_3 = (1/RB_S+1/(((betaValue*0.025)/(vce/RE_S))+(betaValue+1)*RE_S))**-1
-    RE_3 = symbols('RE_3')
-    expr = ((betaValue*(1/RC_3+1/RL_3)**-1)/((betaValue+1)*RE_3+((betaValue*0.025)/(vce/(RE_3+RC_3)))))-((gainValue)**(1/3))
-    solTemp = solve(expr)
-    RE_3 = round(solTemp[0],2)
-    IC_3=vce/(RE_3+RC_3)
-    R2_3=round((betaValue)*RE_3/10,2)
-    VB_3=0.7+(IC_3*RE_3)
-    R1_3=round((vccValue*R2_3/VB_3)-R2_3,2)
-    #SECOND INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_2 = 17500
-    elif rand == 2:
-        RC_2 = 18500
-    else:
-        RC_2 = 19500
-    RL_2 = (1/R1_3+1/R2_3+1/(((betaValue*0.025)/(vce/(RE_3+RC_3)))+(betaValue+1)*RE_3))**-1
-    RE_2 = symbols('RE_2')
-    expr = ((betaValue*(1/RC_2+1/RL_2)**-1)/((betaValue+1)*RE_2+((betaValue*0.025)/(vce/(RE_2+RC_2)))))-((gainValue)**(1/3))
-    solTemp = solve(expr)
-    RE_2 = round(solTemp[0],2)
-    IC_2=vce/(RE_2+RC_2)
-    R2_2=round((betaValue)*RE_2/10,2)
-    VB_2=0.7+(IC_2*RE_2)
-    R1_2=round((vccValue*R2_2/VB_2)-R2_2,2)
-    #FIRST INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_1 = 21500
-    elif rand == 2:
-        RC_1 = 23500
-    else:
-        RC_1 = 25500
-    RL_1 = (1/R1_2+1/R2_2+1/(((betaValue*0.025)/(vce/(RE_2+RC_2)))+(betaValue+1)*RE_2))**-1
-    RE_1 = symbols('RE_1')
-    expr = ((betaValue*(1/RC_1+1/RL_1)**-1)/((betaValue+1)*RE_1+((betaValue*0.025)/(vce/(RE_1+RC_1)))))-((gainValue)**(1/3))
-    solTemp = solve(expr)
-    RE_1 = round(solTemp[0],2)
-    IC_1=vce/(RE_1+RC_1)
-    R2_1=round(((betaValue)*RE_1/10),2)
-    VB_1=0.7+(IC_1*RE_1)
-    R1_1=round((vccValue*R2_1/VB_1)-R2_1,2)
-
-def calculateOneStage():
+    if result is None:
+        from engine import designTopology
+        result = designTopology("ThreeStagesF", gainValue, betaValue, vccValue)
+    stage1, stage2, stage3, stageS = result.stages
+    RB_S, RE_S = stageS.RB, stageS.RE
+    RC_3, RE_3, R1_3, R2_3 = stage3.RC, stage3.RE, stage3.R1, stage3.R2
+    RC_2, RE_2, R1_2, R2_2 = stage2.RC, stage2.RE, stage2.R1, stage2.R2
+    RC_1, RE_1, R1_1, R2_1 = stage1.RC, stage1.RE, stage1.R1, stage1.R2
+
+def calculateOneStage(result = None):
     """
     Calculates the values of the variables needed in the first stage of the amplifier.
 
         Parameters
         ----------
+        result: Design
+            The design made by compute(), it is calculated here if it is None
         RC: Int
             Stores the value of RC in the first stage
         RE: Int
@@ -774,18 +1080,6 @@ def calculateOneStage():
             Stores the value of R1 in the first stage
         R2: Int
             Stores the value of R2 in the first stage
-        vce: Int
-            Stores the value of vce
-        rand: randint
-            Stores a random number between one and three
-        expr: expression
-            Stores the expression temporarily
-        solTemp: solve
-            It is the solution for the temporal expression
-        IC: Int
-            Stores the value of IC in the first stage
-        VB: Int
-            Stores the value of VB in the first stage
         
         Return
         -------
@@ -794,29 +1088,20 @@ def calculateOneStage():
     """
     
     global RC, RE, R1, R2
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC = 10500
-    elif rand == 2:
-        RC = 15500
-    else:
-        RC = 19500
-    vce=(vccValue)/2
-    RE = symbols('RE')
-    expr = ((betaValue*RC)/(((betaValue*0.025)/(vce/(RE+RC)))+((betaValue+1)*RE)))-gainValue
-    solTemp = solve(expr)
-    RE = round(solTemp[0],2)
-    IC=vce/(RE+RC)
-    R2=round((betaValue)*RE/10,2)
-    VB=0.7+(IC*RE)
-    R1=round((vccValue*R2/VB)-R2,2)
-
-def calculateTwoStages():
+    if result is None:
+        from engine import designTopology
+        result = designTopology("OneStage", gainValue, betaValue, vccValue)
+    stage1, = result.stages
+    RC, RE, R1, R2 = stage1.RC, stage1.RE, stage1.R1, stage1.R2
+
+def calculateTwoStages(result = None):
     """
     Calculates the values of the variables needed in the two stages in the amplifier.
 
         Parameters
         ----------
+        result: Design
+            The design made by compute(), it is calculated here if it is None
         RC_1: Int
             Stores the value of RC in the first stage
         RE_1: Int
@@ -833,24 +1118,6 @@ def calculateTwoStages():
             Stores the value of R1 in the second stage
         R2_2: Int
             Stores the value of R2 in the second stage
-        vce: Int
-            Stores the value of vce
-        rand: randint
-            Stores a random number between one and three
-        RL: Int
-            Stores the value of RL in the first stage
-        expr: expression
-            Stores the expression temporarily
-        solTemp: solve
-            It is the solution for the temporal expression
-        IC_2: Int
-            Stores the value of IC in the second stage
-        VB_2: Int
-            Stores the value of VB in the second stage
-        IC_1: Int
-            Stores the value of IC in the first stage
-        VB_1: Int
-            Stores the value of VB in the first stage
         
         Return
         -------
@@ -859,41 +1126,21 @@ def calculateTwoStages():
     """
     
     global RC_1, RE_1, R1_1, R2_1, RC_2, RE_2, R1_2, R2_2
-    #SECOND INVERSOR STAGE
-    RC_2 = 10500
-    vce=(vccValue)/2
-    RE_2 = symbols('RE_2')
-    expr = ((betaValue*RC_2)/(((betaValue*0.025)/(vce/(RE_2+RC_2)))+((betaValue+1)*RE_2)))-((gainValue)**(1/2))
-    solTemp = solve(expr)
-    RE_2 = round(solTemp[0],2)
-    IC_2=vce/(RE_2+RC_2)
-    R2_2=round((betaValue)*RE_2/10,2)
-    VB_2=0.7+(IC_2*RE_2)
-    R1_2=round((vccValue*R2_2/VB_2)-R2_2,2)
-    #FIRST INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_1 = 12500
-    elif rand == 2:
-        RC_1 = 15500
-    else:
-        RC_1 = 19500
-    RL=(1/R1_2+1/R2_2+1/(((betaValue*0.025)/(vce/(RE_2+RC_2)))+(betaValue+1)*RE_2))**-1
-    RE_1 = symbols('RE_1')
-    expr = ((betaValue*(1/RC_1+1/RL)**-1)/((betaValue+1)*RE_1+((betaValue*0.025)/(vce/(RE_1+RC_1)))))-((gainValue)**(1/2))
-    solTemp = solve(expr)
-    RE_1 = round(solTemp[0],2)
-    IC_1=vce/(RE_1+RC_1)
-    R2_1=round((betaValue)*RE_1/10,2)
-    VB_1=0.7+(IC_1*RE_1)
-    R1_1=round((vccValue*R2_1/VB_1)-R2_1,2)
-
-def calculateThreeStages():
+    if result is None:
+        from engine import designTopology
+        result = designTopology("TwoStages", gainValue, betaValue, vccValue)
+    stage1, stage2 = result.stages
+    RC_2, RE_2, R1_2, R2_2 = stage2.RC, stage2.RE, stage2.R1, stage2.R2
+    RC_1, RE_1, R1_1, R2_1 = stage1.RC, stage1.RE, stage1.R1, stage1.R2
+
+def calculateThreeStages(result = None):
     """
     Calculates the values of the variables needed in the three stages in the amplifier.
 
         Parameters
         ----------
+        result: Design
+            The design made by compute(), it is calculated here if it is None
         RC_1: Int
             Stores the value of RC in the first stage
         RE_1: Int
@@ -918,30 +1165,6 @@ def calculateThreeStages():
             Stores the value of R1 in the third stage
         R2_3: Int
             Stores the value of R2 in the third stage
-        vce: Int
-            Stores the value of vce
-        rand: randint
-            Stores a random number between one and three
-        RL_2: Int
-            Stores the value of RL in the second stage
-        RL_1: Int
-            Stores the value of RL in the first stage
-        expr: expression
-            Stores the expression temporarily
-        solTemp: solve
-            It is the solution for the temporal expression
-        IC_3: Int
-            Stores the value of IC in the third stage
-        VB_3: Int
-            Stores the value of VB in the third stage
-        IC_2: Int
-            Stores the value of IC in the second stage
-        VB_2: Int
-            Stores the value of VB in the second stage
-        IC_1: Int
-            Stores the value of IC in the first stage
-        VB_1: Int
-            Stores the value of VB in the first stage
         
         Return
         -------
@@ -950,300 +1173,79 @@ def calculateThreeStages():
     """
     
     global RC_1, RE_1, R1_1, R2_1, RC_2, RE_2, R1_2, R2_2, RC_3, RE_3, R1_3, R2_3
-    #THIRD INVERSOR STAGE
-    RC_3 = 15500
-    vce=(vccValue)/2
-    RE_3 = symbols('RE_3')
-    expr = ((betaValue*RC_3)/(((betaValue*0.025)/(vce/(RE_3+RC_3)))+((betaValue+1)*RE_3)))-((gainValue)**(1/3))
-    solTemp = solve(expr)
-    RE_3 = round(solTemp[0],2)
-    IC_3=vce/(RE_3+RC_3)
-    R2_3=round((betaValue)*RE_3/10,2)
-    VB_3=0.7+(IC_3*RE_3)
-    R1_3=round((vccValue*R2_3/VB_3)-R2_3,2)
-    #SECOND INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_2 = 17500
-    elif rand == 2:
-        RC_2 = 18500
-    else:
-        RC_2 = 19500
-    RL_2 = (1/R1_3+1/R2_3+1/(((betaValue*0.025)/(vce/(RE_3+RC_3)))+(betaValue+1)*RE_3))**-1
-    RE_2 = symbols('RE_2')
-    expr = ((betaValue*(1/RC_2+1/RL_2)**-1)/((betaValue+1)*RE_2+((betaValue*0.025)/(vce/(RE_2+RC_2)))))-((gainValue)**(1/3))
-    solTemp = solve(expr)
-    RE_2 = round(solTemp[0],2)
-    IC_2=vce/(RE_2+RC_2)
-    R2_2=round(((betaValue)*RE_2/10),2)
-    VB_2=0.7+(IC_2*RE_2)
-    R1_2=round((vccValue*R2_2/VB_2)-R2_2,2)
-    #FIRST INVERSOR STAGE
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_1 = 22500
-    elif rand == 2:
-        RC_1 = 25500
-    else:
-        RC_1 = 28500
-    RL_1 = (1/R1_2+1/R2_2+1/(((betaValue*0.025)/(vce/(RE_2+RC_2)))+(betaValue+1)*RE_2))**-1
-    RE_1 = symbols('RE_1')
-    expr = ((betaValue*(1/RC_1+1/RL_1)**-1)/((betaValue+1)*RE_1+((betaValue*0.025)/(vce/(RE_1+RC_1)))))-((gainValue)**(1/3))
-    solTemp = solve(expr)
-    RE_1 = round(solTemp[0],2)
-    IC_1=vce/(RE_1+RC_1)
-    R2_1=round((betaValue)*RE_1/10,2)
-    VB_1=0.7+(IC_1*RE_1)
-    R1_1=round((vccValue*R2_1/VB_1)-R2_1,2)
-
+    if result is None:
+        from engine import designTopology
+        result = designTopology("ThreeStages", gainValue, betaValue, vccValue)
+    stage1, stage2, stage3 = result.stages
+    RC_3, RE_3, R1_3, R2_3 = stage3.RC, stage3.RE, stage3.R1, stage3.R2
+    RC_2, RE_2, R1_2, R2_2 = stage2.RC, stage2.RE, stage2.R1, stage2.R2
+    RC_1, RE_1, R1_1, R2_1 = stage1.RC, stage1.RE, stage1.R1, stage1.R2
+
+@timed("screen.makeCircuitDual")
 def makeCircuitDual():
-    gainEtapa4 = gainValue**(1/4)
-    gainEtapa3 = gainValue**(1/4)
-    gainEtapa2 = gainValue**(1/4)
-    gainEtapa1 = gainValue**(1/4)
-    veeValue = -vccValue
-    vce=(vccValue)/2
-
-    menuAccess.destroy()
+    """
+    The graffic controller to build the four stages amplifier with dual supply
+
+        Parameters
+        ----------
+        menuCircuit: Frame
+            The Third screen controller
+
+        Return
+        -------
+        Void
+        
+    """
+
     global menuCircuit
-    menuCircuit = Tk()
-    menuCircuit.geometry("920x518")
-    menuCircuit.title("BJTpy - Circuito Amplificador")
-    menuCircuit.resizable(False,False)
-    menuCircuit.iconbitmap("Images/BJTpy_ICO.ico")
-    #Background Image
-    menuAmplifier = ImageTk.PhotoImage(Image.open("Images/MenuAmplificador.jpg"))
-    Label(menuCircuit, image = menuAmplifier).place(x=0,y=0)
     #Process to build the schematic and organize all the variables
-    imageCircuit = ImageTk.PhotoImage(Image.open("Images/Casos/CuatroEtapas.jpg"))
-    Label(menuCircuit, image = imageCircuit).place(x=-20,y=100)
-    Label(menuCircuit, text = "Amplificador de cuatro etapas", justify = "center", font=("Times New Roman", 20)).place(x=280,y=45)
-    Button(menuCircuit, text = "←", height = "1", width = "2", cursor = "hand2", command = Reset).place(x=50,y=50)
-    Button(menuCircuit, text = "Ver paso a paso", height = "2", width = "30", cursor = "hand2", command = StepByStep).place(x=660,y=450)
-
-    #QUINTA ETAPA - SEGUIDORA NUEVA
-    rand = random.randint(1,3)
-    if rand == 1:
-        RE_S = 175
-    elif rand == 2:
-        RE_S = 200
-    else:
-        RE_S = 235
-    Voffset = -0.6 #VALOR DE OFFSET RARO XD
-    VE_S = Voffset
-    IE_S = (VE_S-veeValue)/RE_S
-    Rpi_S = (0.025*betaValue)/IE_S
-    Req_S = Rpi_S+((betaValue+1)*RE_S)
-    Rin_S = round((Req_S)/2,2)
-
-    Rth_S = symbols('Rth_S')
-    expr = ((1/Rth_S+1/Req_S)**-1)-Rin_S
-    solTemp = solve(expr)
-    Rth_S = round(solTemp[0],2)
-
-    VB_S = 0.7 + VE_S
-    IB_S = IE_S/betaValue
-    VTH_S = ((IB_S*Rth_S)+VB_S)+vccValue
-    Veq = VTH_S/((vccValue-veeValue)-VTH_S)
-
-    R1_S = symbols('R1_S')
-    expr = ((Veq/(1+Veq))*R1_S)-Rth_S
-    solTemp = solve(expr)
-    R1_S = round(solTemp[0],2)
-    R2_S = round(Veq*R1_S,2)
-
-    RB_S = (1/R1_S+1/R2_S)**-1
-
-    #Labels for Follower Stage
-    Label(menuCircuit, text = str(R1_S)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=790,y=210)
-    Label(menuCircuit, text = str(R2_S)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=790,y=370)
-    Label(menuCircuit, text = str(RE_S)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=870,y=370)
-
-    #CUARTA ETAPA - INVERSORA
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_3 = 4000
-    elif rand == 2:
-        RC_3 = 4250
-    else:
-        RC_3 = 4500
-    #ASUMIDA, DEBE SER MENOR A RIN_S
-    VC_3 = 1.2 #MIENTRAS MÁS CERCA A CERO, MEJOR
-    VRC_3 = vccValue-VC_3
-    IC_3 = VRC_3/RC_3
-    Rpi_3 = (0.025*betaValue)/IC_3
-
-    RE_3 = symbols('RE_3')
-    expr = ((betaValue*((1/RC_3+1/1/Rin_S)**-1))/(Rpi_3+((betaValue+1)*RE_3)))-gainEtapa4
-    solTemp = solve(expr)
-    RE_3 = round(solTemp[0],2)
-
-    Req_3 = Rpi_3+((betaValue+1)*RE_3)
-    Rin_3 = round(Req_3/2,2) #ASUMIDA, DEBE IR INCREMENTANDO
-
-    Rth_3 = symbols('Rth_3')
-    expr = ((1/Rth_3+1/Req_3)**-1)-Rin_3
-    solTemp = solve(expr)
-    Rth_3 = round(solTemp[0],2)
-
-    VRE_3 = RE_3*IC_3
-    VE_3 = VRE_3+veeValue
-    VB_3 = 0.7 + VE_3
-    IB_3 =IC_3/betaValue
-    VTH_3 = ((IB_3*Rth_3)+VB_3)+vccValue
-    Veq = VTH_3/((vccValue-veeValue)-VTH_3)
-
-    R1_3 = symbols('R1_3')
-    expr = ((Veq/(1+Veq))*R1_3)-Rth_3
-    solTemp = solve(expr)
-    R1_3 = round(solTemp[0],2)
-    R2_3 = round(Veq*R1_3,2)
-
-    #Labels for Fourth Stage
-    Label(menuCircuit, text = str(R1_3)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=620,y=210)
-    Label(menuCircuit, text = str(R2_3)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=620,y=370)
-    Label(menuCircuit, text = str(RC_3)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=700,y=210)
-    Label(menuCircuit, text = str(RE_3)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=700,y=370)
-
-    #TERCERA ETAPA - INVERSORA
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_2 = 5000
-    elif rand == 2:
-        RC_2 = 5250
-    else:
-        RC_2 = 5500
-    #ASUMIDA, DEBE SER MENOR A RIN_3
-    VC_2 = 1.2 #MIENTRAS MÁS CERCA A CERO, MEJOR
-    VRC_2 = vccValue-VC_2
-    IC_2 = VRC_2/RC_2
-    Rpi_2 = (0.025*betaValue)/IC_2
-
-    RE_2 = symbols('RE_2')
-    expr = ((betaValue*((1/RC_2+1/1/Rin_3)**-1))/(Rpi_2+((betaValue+1)*RE_2)))-gainEtapa3
-    solTemp = solve(expr)
-    RE_2 = round(solTemp[0],2)
-
-    Req_2 = Rpi_2+((betaValue+1)*RE_2)
-    Rin_2 = round(Req_2/2,2) #ASUMIDA, DEBE IR INCREMENTANDO
-
-    Rth_2 = symbols('Rth_2')
-    expr = ((1/Rth_2+1/Req_2)**-1)-Rin_2
-    solTemp = solve(expr)
-    Rth_2 = round(solTemp[0],2)
-
-    VRE_2 = RE_2*IC_2
-    VE_2 = VRE_2+veeValue
-    VB_2 = 0.7 + VE_2
-    IB_2 =IC_2/betaValue
-    VTH_2 = ((IB_2*Rth_2)+VB_2)+vccValue
-    Veq = VTH_2/((vccValue-veeValue)-VTH_2)
-
-    R1_2 = symbols('R1_2')
-    expr = ((Veq/(1+Veq))*R1_2)-Rth_2
-    solTemp = solve(expr)
-    R1_2 = round(solTemp[0],2)
-    R2_2 = round(Veq*R1_2,2)
-
-    #Labels for Third Stage
-    Label(menuCircuit, text = str(R1_2)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=440,y=210)
-    Label(menuCircuit, text = str(R2_2)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=440,y=370)
-    Label(menuCircuit, text = str(RC_2)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=520,y=210)
-    Label(menuCircuit, text = str(RE_2)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=520,y=370)
-
-    #SEGUNDA ETAPA - INVERSORA
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_1 = 6000
-    elif rand == 2:
-        RC_1 = 6250
-    else:
-        RC_1 = 6500
-    #ASUMIDA, DEBE SER MENOR A RIN_3
-    VC_1 = 1.2 #MIENTRAS MÁS CERCA A CERO, MEJOR
-    VRC_1 = vccValue-VC_1
-    IC_1 = VRC_1/RC_1
-    Rpi_1 = (0.025*betaValue)/IC_1
-
-    RE_1 = symbols('RE_1')
-    expr = ((betaValue*((1/RC_1+1/1/Rin_2)**-1))/(Rpi_1+((betaValue+1)*RE_1)))-gainEtapa2
-    solTemp = solve(expr)
-    RE_1 = round(solTemp[0],2)
-
-    Req_1 = Rpi_1+((betaValue+1)*RE_1)
-    Rin_1 = round(Req_1/2,2) #ASUMIDA, DEBE IR INCREMENTANDO
-
-    Rth_1 = symbols('Rth_1')
-    expr = ((1/Rth_1+1/Req_1)**-1)-Rin_1
-    solTemp = solve(expr)
-    Rth_1 = round(solTemp[0],2)
-
-    VRE_1 = RE_1*IC_1
-    VE_1 = VRE_1+veeValue
-    VB_1 = 0.7 + VE_1
-    IB_1 =IC_1/betaValue
-    VTH_1 = ((IB_1*Rth_1)+VB_1)+vccValue
-    Veq = VTH_1/((vccValue-veeValue)-VTH_1)
-
-    R1_1 = symbols('R1_1')
-    expr = ((Veq/(1+Veq))*R1_1)-Rth_1
-    solTemp = solve(expr)
-    R1_1 = round(solTemp[0],2)
-    R2_1 = round(Veq*R1_1,2)
-
-    #Labels for Second Stage
-    Label(menuCircuit, text = str(R1_1)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=270,y=210)
-    Label(menuCircuit, text = str(R2_1)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=270,y=370)
-    Label(menuCircuit, text = str(RC_1)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=350,y=210)
-    Label(menuCircuit, text = str(RE_1)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=350,y=370)
-
-    #PRIMERA ETAPA - INVERSORA
-    rand = random.randint(1,3)
-    if rand == 1:
-        RC_0 = 7000
-    elif rand == 2:
-        RC_0 = 7250
-    else:
-        RC_0 = 7500
-    #ASUMIDA, DEBE SER MENOR A RIN_3
-    VC_0 = 1.2 #MIENTRAS MÁS CERCA A CERO, MEJOR
-    VRC_0 = vccValue-VC_0
-    IC_0 = VRC_0/RC_0
-    Rpi_0 = (0.025*betaValue)/IC_0
-
-    RE_0 = symbols('RE_0')
-    expr = ((betaValue*((1/RC_0+1/1/Rin_1)**-1))/(Rpi_0+((betaValue+1)*RE_0)))-gainEtapa1
-    solTemp = solve(expr)
-    RE_0 = round(solTemp[0],2)
-
-    Req_0 = Rpi_0+((betaValue+1)*RE_0)
-    Rin_0 = round(Req_0/2,2) #ASUMIDA, DEBE IR INCREMENTANDO
-
-    Rth_0 = symbols('Rth_0')
-    expr = ((1/Rth_0+1/Req_0)**-1)-Rin_0
-    solTemp = solve(expr)
-    Rth_0 = round(solTemp[0],2)
-
-    VRE_0 = RE_0*IC_0
-    VE_0 = VRE_0+veeValue
-    VB_0 = 0.7 + VE_0
-    IB_0 =IC_0/betaValue
-    VTH_0 = ((IB_0*Rth_0)+VB_0)+vccValue
-    Veq = VTH_0/((vccValue-veeValue)-VTH_0)
-
-    R1_0 = symbols('R1_0')
-    expr = ((Veq/(1+Veq))*R1_0)-Rth_0
-    solTemp = solve(expr)
-    R1_0 = round(solTemp[0],2)
-    R2_0 = round(Veq*R1_0,2)
-
-    #Labels for First Stage
-    Label(menuCircuit, text = str(R1_0)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=95,y=210)
-    Label(menuCircuit, text = str(R2_0)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=95,y=370)
-    Label(menuCircuit, text = str(RC_0)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=175,y=210)
-    Label(menuCircuit, text = str(RE_0)+" Ω", bg = "white", font=("Times New Roman", 8)).place(x=175,y=370)
-
-    menuCircuit.mainloop()
+    menuCircuit = showCircuit("Images/Casos/CuatroEtapas.JPG", -20, 100, "Amplificador de cuatro etapas", 280)
+
+    def show(result):
+        stage0, stage1, stage2, stage3, stageS = result.stages
+
+        #Labels for Follower Stage
+        value(menuCircuit, str(stageS.R1)+" Ω", 790, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stageS.R2)+" Ω", 790, 370, ("Times New Roman", 8))
+        value(menuCircuit, str(stageS.RE)+" Ω", 870, 370, ("Times New Roman", 8))
+
+        #Labels for Fourth Stage
+        value(menuCircuit, str(stage3.R1)+" Ω", 620, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage3.R2)+" Ω", 620, 370, ("Times New Roman", 8))
+        value(menuCircuit, str(stage3.RC)+" Ω", 700, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage3.RE)+" Ω", 700, 370, ("Times New Roman", 8))
+
+        #Labels for Third Stage
+        value(menuCircuit, str(stage2.R1)+" Ω", 440, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage2.R2)+" Ω", 440, 370, ("Times New Roman", 8))
+        value(menuCircuit, str(stage2.RC)+" Ω", 520, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage2.RE)+" Ω", 520, 370, ("Times New Roman", 8))
+
+        #Labels for Second Stage
+        value(menuCircuit, str(stage1.R1)+" Ω", 270, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage1.R2)+" Ω", 270, 370, ("Times New Roman", 8))
+        value(menuCircuit, str(stage1.RC)+" Ω", 350, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage1.RE)+" Ω", 350, 370, ("Times New Roman", 8))
+
+        #Labels for First Stage
+        value(menuCircuit, str(stage0.R1)+" Ω", 95, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage0.R2)+" Ω", 95, 370, ("Times New Roman", 8))
+        value(menuCircuit, str(stage0.RC)+" Ω", 175, 210, ("Times New Roman", 8))
+        value(menuCircuit, str(stage0.RE)+" Ω", 175, 370, ("Times New Roman", 8))
+
+    compute(menuCircuit, "FourStagesDual", show, appAccess2)
 
 #This is the call to the main function, where everthing starts
-root()       
\ No newline at end of file
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["sweep"]:
+        sweep()
+    elif sys.argv[1:2] == ["benchmark"]:
+        benchmark()
+    elif sys.argv[1:2] == ["serve"]:
+        serve()
+    elif sys.argv[1:2] == ["pipeline"]:
+        pipeline()
+    elif sys.argv[1:2] == ["tables"]:
+        tables()
+    else:
+        root()       
\ No newline at end of file
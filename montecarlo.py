@@ -0,0 +1,100 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Monte Carlo tolerance analysis of a finished design
+
+Every resistor of the design is drawn uniformly inside its tolerance and the beta of every transistor
+uniformly inside a range, then the gain and the bias of all the samples are found at once with the
+`analysis` module. The report has the percentiles of the gain and of the Q point of each stage, and
+the yield: the fraction of samples with the gain inside a margin and no stage in saturation.
+
+..note::
+    This module depends on `numpy` and on the `analysis` module
+    <https://numpy.org/doc/stable/>
+"""
+
+import numpy as np #Used to draw and evaluate every sample at once
+
+from analysis import VCE_MIN, designStages, evaluateStages
+
+#Default tolerance of the resistors (0.01 or 0.05 for the usual 1% and 5% parts)
+TOLERANCE = 0.05
+#Default range of beta of the transistors
+BETA_RANGE = (100, 200)
+#Default margin of the gain, relative to the gain required, for a sample to be accepted
+GAIN_MARGIN = 0.1
+#Percentiles in the report
+PERCENTILES = (1, 5, 50, 95, 99)
+
+def samples(design, size=100000, tolerance=TOLERANCE, betaRange=BETA_RANGE, rng=None):
+    """
+    Draws the components of a design and evaluates every sample
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        size: Int
+            Number of samples
+        tolerance: Float
+            Tolerance of the resistors, 0.05 for +-5%
+        betaRange: tuple
+            Lowest and highest beta of the transistors, each transistor has its own beta
+        rng: Generator
+            NumPy random generator, a new one is created if it is None
+
+        Return
+        -------
+        The dict of analysis.evaluateStages, with the beta of each stage as beta_1 ... beta_S
+
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+    stages = []
+    betas = []
+    for suffix, resistors in designStages(design):
+        values = {field: value*rng.uniform(1-tolerance, 1+tolerance, size) for field, value in resistors.items()}
+        stages.append((suffix, values))
+        betas.append(rng.uniform(betaRange[0], betaRange[1], size))
+    out = evaluateStages(stages, betas, np.full(size, float(design.vcc)), design.dual)
+    for (suffix, _), beta in zip(stages, betas):
+        out["beta"+suffix] = beta
+    return out
+
+def report(design, size=100000, tolerance=TOLERANCE, betaRange=BETA_RANGE, margin=GAIN_MARGIN, rng=None):
+    """
+    Monte Carlo tolerance analysis of a design
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        size: Int
+            Number of samples
+        tolerance: Float
+            Tolerance of the resistors, 0.05 for +-5%
+        betaRange: tuple
+            Lowest and highest beta of the transistors
+        margin: Float
+            Accepted gain error relative to the gain of the design
+        rng: Generator
+            NumPy random generator, a new one is created if it is None
+
+        Return
+        -------
+        A dict with the number of samples, the yield, the percentiles (dicts keyed by PERCENTILES)
+        of gain, and of IC and VCE of each stage, with the suffixes of batch.stageFields
+
+    """
+
+    values = samples(design, size, tolerance, betaRange, rng)
+    suffixes = [suffix for suffix, _ in designStages(design)]
+    accepted = np.abs(values["gain"]-design.gain) <= margin*design.gain
+    for suffix in suffixes:
+        accepted &= values["VCE"+suffix] > VCE_MIN
+    out = {"samples": size, "yield": float(accepted.mean())}
+    fields = ["gain"]+[field+suffix for suffix in suffixes for field in ("IC", "VCE")]
+    for field in fields:
+        out[field] = dict(zip(PERCENTILES, np.percentile(values[field], PERCENTILES).tolist()))
+    return out
@@ -0,0 +1,263 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+DC operating point of the designed amplifiers
+
+The calculators assume VBE = 0.7 V and the collector current of each stage. This module checks the
+bias they give by solving the DC circuit of the whole amplifier: supplies, dividers, RC and RE of
+every stage, with Ebers-Moll transistors. The circuit is written as a modified nodal analysis (MNA)
+system, the node voltages plus the current of each supply, and solved with Newton iterations.
+
+The stamps of a design (which resistor goes between which nodes) only depend on its topology, so
+they are compiled once in a `Circuit` as a dense matrix, one row of n*n entries per resistor, and
+every iteration assembles the matrices of a whole batch of designs with one product. The circuits are
+small (three nodes per stage plus the supplies), so the matrices are kept dense and every Newton step
+is one batched np.linalg.solve. The coupling capacitors are open at DC, each stage is biased on its
+own but every stage shares the supplies.
+
+..note::
+    This module depends on `numpy` and on the `batch` module
+    <https://numpy.org/doc/stable/>
+"""
+
+import functools
+
+import numpy as np #Used to solve a batch of circuits at once
+
+from batch import recordType, stageFields
+
+#Thermal voltage used by the calculators
+VT = 0.025
+#Saturation current of the transistors
+IS = 1e-14
+#Reverse beta of the transistors
+BETA_R = 1.0
+#Above this junction voltage over VT the exponential is continued by its tangent, to avoid overflows
+XMAX = 40.0
+
+def _limexp(x):
+    e = np.exp(np.minimum(x, XMAX))
+    return np.where(x > XMAX, e*(1+x-XMAX), e), e
+
+class Circuit:
+    """
+    MNA stamps of a design, shared by every design of the same topology
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        size: Int
+            Number of unknowns, node voltages and supply currents
+        nodes: dict
+            Index of the base, collector and emitter of each stage, keyed by its suffix
+        resistors: list
+            (field, node, node) of every resistor, -1 is the ground
+
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.dual = name.endswith("Dual")
+        self.suffixes = [suffix for suffix, _ in stageFields(name)]
+        fields = dict(stageFields(name))
+        vcc = 0
+        vee = 1 if self.dual else -1
+        count = 2 if self.dual else 1
+        self.nodes = {}
+        self.resistors = []
+        for suffix in self.suffixes:
+            names = fields[suffix]
+            b, e = count, count+1
+            count += 2
+            if "RC" in names:
+                c = count
+                count += 1
+                self.resistors.append(("RC"+suffix, vcc, c))
+            else:
+                c = vcc
+            if "R1" in names:
+                self.resistors += [("R1"+suffix, vcc, b), ("R2"+suffix, b, vee)]
+            else:
+                self.resistors.append(("RB"+suffix, vcc, b))
+            self.resistors.append(("RE"+suffix, e, vee))
+            self.nodes[suffix] = (b, c, e)
+        self.supplies = [(vcc, count)]+([(vee, count+1)] if self.dual else [])
+        self.size = count+len(self.supplies)
+        #Stamps: every resistor adds its conductance to at most four entries of the dense matrix
+        n = self.size
+        pattern = np.zeros((len(self.resistors), n*n))
+        for k, (_, i, j) in enumerate(self.resistors):
+            for p, q, sign in ((i, i, 1), (j, j, 1), (i, j, -1), (j, i, -1)):
+                if p >= 0 and q >= 0:
+                    pattern[k, p*n+q] += sign
+        self.pattern = pattern
+        self.constant = np.zeros((n, n))
+        for node, branch in self.supplies:
+            self.constant[node, branch] = self.constant[branch, node] = 1
+
+    def solve(self, records, tol=1e-9, maxIter=100):
+        """
+        Finds the operating point of many designs of this topology
+
+            Parameters
+            ----------
+            records: ndarray
+                Structured array of the batch module (only the resistors, beta and vcc are used)
+            tol: Float
+                Largest change of a node voltage, in volts, to stop the iterations
+            maxIter: Int
+                Largest number of Newton iterations
+
+            Return
+            -------
+            A dict of arrays: VB, VC, VE, VBE, VCE, IB and IC of each stage with its suffix, current
+            drawn from Vcc, power given by the supplies, iterations and converged
+
+        """
+
+        size = len(records)
+        n = self.size
+        beta = np.asarray(records["beta"], dtype=np.float64)
+        vcc = np.asarray(records["vcc"], dtype=np.float64)
+        G = (np.stack([1/np.asarray(records[field], dtype=np.float64) for field, _, _ in self.resistors], axis=1)
+             @ self.pattern).reshape(size, n, n)+self.constant
+        rhs = np.zeros((size, n))
+        rhs[:, self.supplies[0][1]] = vcc
+        if self.dual:
+            rhs[:, self.supplies[1][1]] = -vcc
+        x = self._guess(records, vcc, beta)
+        converged = np.zeros(size, dtype=bool)
+        rows = np.arange(size)
+        for iteration in range(1, maxIter+1):
+            J = G.copy()
+            F = np.einsum("bij,bj->bi", G, x)-rhs
+            for suffix in self.suffixes:
+                b, c, e = self.nodes[suffix]
+                IB, IC, dB, dC = self._transistor(x[:, b]-x[:, e], x[:, b]-x[:, c], beta)
+                F[:, b] += IB
+                F[:, c] += IC
+                F[:, e] -= IB+IC
+                for row, d in ((b, dB), (c, dC), (e, [-(p+q) for p, q in zip(dB, dC)])):
+                    #d has the derivatives over VBE and VBC, turned into derivatives over VB, VC and VE
+                    J[rows, row, b] += d[0]+d[1]
+                    J[rows, row, c] -= d[1]
+                    J[rows, row, e] -= d[0]
+            dx = np.linalg.solve(J, -F[..., None])[..., 0]
+            x = x+dx
+            converged = np.abs(dx[:, :n-len(self.supplies)]).max(axis=1) < tol
+            if converged.all():
+                break
+        out = {}
+        for suffix in self.suffixes:
+            b, c, e = self.nodes[suffix]
+            VB, VC, VE = x[:, b], x[:, c], x[:, e]
+            IB, IC, _, _ = self._transistor(VB-VE, VB-VC, beta)
+            out.update({"VB"+suffix: VB, "VC"+suffix: VC, "VE"+suffix: VE, "VBE"+suffix: VB-VE,
+                        "VCE"+suffix: VC-VE, "IB"+suffix: IB, "IC"+suffix: IC})
+        #The branch current of a source is the current that enters its positive terminal
+        current = -x[:, self.supplies[0][1]]
+        out["current"] = current
+        out["power"] = current*vcc+(x[:, self.supplies[1][1]]*vcc if self.dual else 0)
+        out["iterations"] = iteration
+        out["converged"] = converged
+        return out
+
+    def _transistor(self, vbe, vbc, beta):
+        #Ebers-Moll transport model, currents entering the base and the collector and their derivatives
+        ef, gf = _limexp(vbe/VT)
+        er, gr = _limexp(vbc/VT)
+        ef, er = IS*ef, IS*er
+        gf, gr = IS*gf/VT, IS*gr/VT
+        IC = ef-er-(er-IS)/BETA_R
+        IB = (ef-IS)/beta+(er-IS)/BETA_R
+        return IB, IC, (gf/beta, gr/BETA_R), (gf, -gr*(1+1/BETA_R))
+
+    def _guess(self, records, vcc, beta):
+        #Starts from the bias of the unloaded dividers
+        x = np.zeros((len(records), self.size))
+        vee = -vcc if self.dual else 0*vcc
+        x[:, 0] = vcc
+        if self.dual:
+            x[:, 1] = vee
+        for suffix in self.suffixes:
+            b, c, e = self.nodes[suffix]
+            if "R1"+suffix in records.dtype.names:
+                R1, R2 = records["R1"+suffix], records["R2"+suffix]
+                VB = vee+(vcc-vee)*R2/(R1+R2)
+            else:
+                RB, RE = records["RB"+suffix], records["RE"+suffix]
+                VB = vee+(vcc-0.65-vee)*(beta+1)*RE/(RB+(beta+1)*RE)+0.65
+            #One correction of VBE with the emitter current it gives
+            IC = np.maximum(VB-0.65-vee, 1e-3)/records["RE"+suffix]*beta/(beta+1)
+            VE = np.maximum(VB-VT*np.log(IC/IS), vee)
+            IC = (VE-vee)/records["RE"+suffix]*beta/(beta+1)
+            x[:, b], x[:, e] = VB, VE
+            if c != 0:
+                x[:, c] = np.maximum(vcc-IC*records["RC"+suffix], VE+0.2)
+        return x
+
+@functools.lru_cache(maxsize=None)
+def circuit(name):
+    """
+    The Circuit of a design, compiled once per topology
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+
+        Return
+        -------
+        The Circuit
+
+    """
+
+    return Circuit(name)
+
+def records(designs):
+    """
+    Structured array of the batch module from designs of the engine module
+
+        Parameters
+        ----------
+        designs: list
+            Designs of the same topology
+
+        Return
+        -------
+        The structured array
+
+    """
+
+    name = designs[0].topology
+    out = np.zeros(len(designs), dtype=recordType(name))
+    for k, design in enumerate(designs):
+        out[k]["index"], out[k]["gain"], out[k]["beta"], out[k]["vcc"] = k, design.gain, design.beta, design.vcc
+        out[k]["choices"] = design.choices
+        for (suffix, fields), stage in zip(stageFields(name), design.stages):
+            for field in fields:
+                out[k][field+suffix] = getattr(stage, field)
+    return out
+
+def operatingPoint(design, tol=1e-9, maxIter=100):
+    """
+    Finds the operating point of one design
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        tol: Float
+            Largest change of a node voltage, in volts, to stop the iterations
+        maxIter: Int
+            Largest number of Newton iterations
+
+        Return
+        -------
+        A dict with the values of Circuit.solve as floats
+
+    """
+
+    out = circuit(design.topology).solve(records([design]), tol, maxIter)
+    return {field: value if np.isscalar(value) else value[0].item() for field, value in out.items()}
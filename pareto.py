@@ -0,0 +1,217 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Pareto front of the free choices of a design
+
+The calculators pick the RC of every stage (and the RE of the follower) randomly from its table, and
+the dual supply design assumes the emitter voltage of its follower (VOFFSET) and the collector
+voltage of its inversors (VC_DUAL). None of them is set by the gain, so each one trades the supply
+current, the gain error, the input resistance and the output swing. This module designs large
+populations of those choices in batches with the `batch` module, evaluates them with the `analysis`
+module and keeps the non-dominated ones: no other design is as good in the four objectives and
+better in one of them.
+
+..note::
+    This module depends on `numpy`, on the `batch` module and on the `analysis` module
+    <https://numpy.org/doc/stable/>
+"""
+
+import numpy as np #Used to design and compare whole populations at once
+
+from analysis import VCE_MIN, evaluateStages, stageArrays
+from batch import designTopologyBatch, pickChoices, recordType, stageFields
+from candidates import allChoices
+from engine import TABLES, VC_DUAL, VOFFSET, topology
+
+#Objectives of the front and True for the ones that are better when they are larger
+OBJECTIVES = {"current": False, "gainError": False, "Rin": True, "swing": True}
+#Range of the emitter voltage of the dual supply follower tried
+VOFFSET_RANGE = (-3.0, 0.0)
+#Range of the collector voltage of the dual supply inversors tried
+VC_RANGE = (0.0, 5.0)
+#Default number of designs of a dual supply population
+POPULATION = 50000
+#Designs evaluated at once
+BATCH_SIZE = 10000
+
+def nonDominated(objectives):
+    """
+    Indexes of the points that no other point dominates, every objective is minimized
+
+        Parameters
+        ----------
+        objectives: ndarray
+            An array (points, objectives)
+
+        Return
+        -------
+        An array with the indexes of the non-dominated points, repeated points are kept once
+
+    """
+
+    index = np.arange(len(objectives))
+    i = 0
+    while i < len(objectives):
+        #Points that beat the i-th one in some objective, the rest are dominated by it (or equal)
+        keep = np.any(objectives < objectives[i], axis=1)
+        keep[i] = True
+        index, objectives = index[keep], objectives[keep]
+        i = np.count_nonzero(keep[:i])+1
+    return index
+
+def _swing(name, records, values):
+    #Peak to peak swing of the output stage, limited by saturation and by cutoff with the output open
+    suffix, stage = stageArrays(name, records)[-1]
+    headroom = values["VCE"+suffix]-VCE_MIN
+    if "RC" in stage:
+        return 2*np.maximum(np.minimum(headroom, values["IC"+suffix]*stage["RC"]), 0)
+    IE = values["IC"+suffix]+values["IB"+suffix]
+    return 2*np.maximum(np.minimum(headroom, IE*stage["RE"]), 0)
+
+def evaluatePopulation(name, gain, beta, vcc, choices, voffset=VOFFSET, vc=VC_DUAL):
+    """
+    Designs and evaluates a population of choices
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        choices: ndarray
+            An array (size, stages) with the index used in each table
+        voffset: ndarray
+            Emitter voltage of the dual supply follower of each design
+        vc: ndarray
+            Collector voltage of the dual supply inversors, an array (size, inversors)
+
+        Return
+        -------
+        A structured array with the fields of the batch module, voffset and VC_1 ... of the dual
+        supply design, the objectives and valid (False for negative resistors or saturated stages)
+
+    """
+
+    size = len(choices)
+    dual = name.endswith("Dual")
+    records = designTopologyBatch(name, np.full(size, gain), np.full(size, beta), np.full(size, vcc), choices,
+                                  voffset=voffset, vc=vc)
+    values = evaluateStages(stageArrays(name, records), records["beta"], records["vcc"], dual)
+    valid = np.ones(size, dtype=bool)
+    for field in records.dtype.names:
+        if field[:2] in ("RC", "RE", "R1", "R2", "RB"):
+            valid &= records[field] > 0
+    for field, VCE in values.items():
+        if field.startswith("VCE"):
+            valid &= VCE > VCE_MIN
+    with np.errstate(invalid="ignore"):
+        objectives = {"current": values["current"], "gainError": np.abs(values["gain"]-gain)/gain,
+                      "Rin": values["Rin"], "swing": _swing(name, records, values)}
+    for value in objectives.values():
+        valid &= np.isfinite(value)
+    inversors = [suffix for suffix, fields in stageFields(name) if "RC" in fields]
+    extra = [("voffset", np.float64)]+[("VC"+suffix, np.float64) for suffix in inversors] if dual else []
+    dtype = recordType(name)
+    out = np.empty(size, dtype=np.dtype(dtype.descr+extra+[(field, np.float64) for field in OBJECTIVES]+[("valid", bool)]))
+    for field in dtype.names:
+        out[field] = records[field]
+    if dual:
+        out["voffset"] = np.broadcast_to(voffset, (size,))
+        vc = np.asarray(vc, dtype=np.float64)
+        vc = np.broadcast_to(vc if vc.ndim == 2 else vc[..., None], (size, len(inversors)))
+        for k, suffix in enumerate(inversors):
+            out["VC"+suffix] = vc[:, k]
+    for field, value in objectives.items():
+        out[field] = value
+    out["valid"] = valid
+    return out
+
+def _minimized(population):
+    return np.stack([-population[field] if larger else population[field] for field, larger in OBJECTIVES.items()], axis=1)
+
+def frontTopology(name, gain, beta, vcc, size=POPULATION, batchSize=BATCH_SIZE, rng=None):
+    """
+    Pareto front of the choices of a design. Every combination of the tables is tried with the
+    assumptions of the calculators, and the dual supply design also tries size random choices with
+    random VOFFSET and VC of each inversor, batchSize at a time
+
+        Parameters
+        ----------
+        name: str
+            Key of the design in TABLES
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        size: Int
+            Number of random designs of the dual supply design
+        batchSize: Int
+            Designs evaluated at once
+        rng: Generator
+            NumPy random generator, a new one is created if it is None
+
+        Return
+        -------
+        The structured array of evaluatePopulation with the valid designs of the front, sorted by current
+
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+    dual = name.endswith("Dual")
+    inversors = len(TABLES[name])-1 if dual else 0
+
+    def batches():
+        yield allChoices(name), VOFFSET, VC_DUAL
+        if dual:
+            #VC can't reach vcc, the inversors would have no collector current
+            high = min(VC_RANGE[1], vcc-1)
+            for start in range(0, size, batchSize):
+                n = min(batchSize, size-start)
+                yield pickChoices(name, n, rng), rng.uniform(*VOFFSET_RANGE, n), rng.uniform(VC_RANGE[0], high, (n, inversors))
+
+    best = None
+    for choices, voffset, vc in batches():
+        population = evaluatePopulation(name, gain, beta, vcc, choices, voffset, vc)
+        population = population[population["valid"]]
+        if best is not None:
+            population = np.concatenate([best, population])
+        best = population[nonDominated(_minimized(population))]
+    return best[np.argsort(best["current"], kind="stable")]
+
+def front(gain, beta, vcc, follower=False, dual=False, size=POPULATION, batchSize=BATCH_SIZE, rng=None):
+    """
+    Same as frontTopology, for the design that makeCircuit would pick for the gain
+
+        Parameters
+        ----------
+        gain: Float
+            The gain value in the amplifier
+        beta: Float
+            The beta value in the amplifier
+        vcc: Float
+            The vcc value in the amplifier
+        follower: bool
+            True if a follower stage is added
+        dual: bool
+            True for the dual supply design
+        size: Int
+            Number of random designs of the dual supply design
+        batchSize: Int
+            Designs evaluated at once
+        rng: Generator
+            NumPy random generator, a new one is created if it is None
+
+        Return
+        -------
+        The structured array of frontTopology
+
+    """
+
+    return frontTopology(topology(gain, follower, dual), gain, beta, vcc, size, batchSize, rng)
@@ -0,0 +1,290 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Streaming batch pipeline: design requests in, resistor sets out
+
+The requests are read line by line from a CSV file (with a header: gain, beta, vcc and optionally
+follower, dual, seed, series, topology) or from a JSONL file, from a path or from stdin. Each row is
+checked with the ranges of makeAmp and makeAmp2 and designed with the engine, the results are written
+as soon as they are ready with the RC, RE, R1, R2 of every stage and RB_S, RE_S of the follower. An
+invalid row gives a line with its reason instead of the error window. The rows are read in chunks
+that can be designed by a pool of processes, the output keeps the order of the input and only a few
+chunks are in memory at once, so any size of input runs in constant memory.
+
+..note::
+    This module depends on `csv`, `json`, `concurrent.futures`, `argparse` and on the `engine` module
+    <https://docs.python.org/3/library/csv.html>
+"""
+
+import argparse #Used to read the options of the command
+import csv #Used to read and write the CSV rows
+import itertools #Used to split the input in chunks
+import json #Used to read and write the JSONL rows
+import os #Used to count the cores
+import random #Used to pick the resistors of each design
+import sys #Used for stdin, stdout and the summary
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import checkRequest, design, designTopology
+
+#Resistors of the CSV output: the inversors of makeAmp2 and the follower
+COLUMNS = (["line", "status", "reason", "topology", "gain", "beta", "vcc", "follower", "dual"]+
+           [field+suffix for suffix in ("_1", "_2", "_3", "_4") for field in ("RC", "RE", "R1", "R2")]+
+           ["RB_S", "RE_S", "R1_S", "R2_S"])
+#Values read as True in the follower and dual columns of a CSV file
+TRUE = ("1", "true", "yes", "si", "sí", "y")
+#Default number of rows of each chunk
+CHUNK_SIZE = 1000
+
+def _number(text):
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+def parseRow(row):
+    """
+    Turns the text values of a CSV row in the values of a JSON request
+
+        Parameters
+        ----------
+        row: dict
+            The row, keyed by the header
+
+        Return
+        -------
+        The request as a dict, it raises ValueError if a number can't be read
+
+    """
+
+    request = {}
+    for field, text in row.items():
+        if field is None or text is None:
+            continue
+        text = text.strip()
+        if text == "":
+            continue
+        if field in ("gain", "beta", "vcc"):
+            try:
+                request[field] = _number(text)
+            except ValueError:
+                raise ValueError("%s must be a number" % field)
+        elif field == "seed":
+            try:
+                request[field] = int(text)
+            except ValueError:
+                raise ValueError("seed must be an integer")
+        elif field in ("follower", "dual"):
+            request[field] = text.lower() in TRUE
+        elif field in ("series", "topology"):
+            request[field] = text
+    return request
+
+def resistors(result):
+    """
+    Resistors of every stage of a design
+
+        Parameters
+        ----------
+        result: Design
+            The design of the engine module
+
+        Return
+        -------
+        A dict with RC, RE, R1, R2 of each inversor (suffixes _1, _2 ...) and RE, RB (and R1, R2 in the
+        dual supply) of the follower (suffix _S)
+
+    """
+
+    n = len(result.stages)-result.follower
+    suffixes = ["_%d" % (i+1) for i in range(n)]+(["_S"] if result.follower else [])
+    out = {}
+    for suffix, stage in zip(suffixes, result.stages):
+        for field in ("RC", "RE", "R1", "R2", "RB"):
+            value = getattr(stage, field)
+            if value is not None:
+                out[field+suffix] = value
+    return out
+
+def processChunk(lines, start, header=None, seed=None):
+    """
+    Checks and designs a chunk of rows, it runs inside the worker processes
+
+        Parameters
+        ----------
+        lines: list
+            Text lines of the input
+        start: Int
+            Line number of the first line in the input
+        header: list
+            Columns of a CSV input, None for JSONL
+        seed: Int
+            Seed of the run, the rows without seed use a generator derived from it and from their line,
+            so the results don't depend on the chunks. None gives random results
+
+        Return
+        -------
+        A list with a dict for each row that is not empty: line, status ("ok" or "error"), reason and
+        the values of the design
+
+    """
+
+    rng = random.Random()
+    out = []
+    for line, text in enumerate(lines, start):
+        if not text.strip():
+            continue
+        try:
+            request = parseRow(dict(zip(header, next(csv.reader([text]))))) if header is not None else json.loads(text)
+            name, gain, beta, vcc, follower, dual, choices, rowSeed, series = checkRequest(request)
+        except ValueError as error:
+            out.append({"line": line, "status": "error", "reason": str(error)})
+            continue
+        rng.seed(rowSeed if rowSeed is not None else (None if seed is None else "%d:%d" % (seed, line)))
+        try:
+            #The rows of a large input rarely repeat, the design cache would only add evictions
+            if name is None:
+                result = design(gain, beta, vcc, follower, dual, choices, rng, cache=None, series=series)
+            else:
+                result = designTopology(name, gain, beta, vcc, choices, rng, cache=None, series=series)
+        except Exception as error:
+            out.append({"line": line, "status": "error", "reason": "%s: %s" % (type(error).__name__, error)})
+            continue
+        values = {"line": line, "status": "ok", "reason": "", "topology": result.topology, "gain": gain,
+                  "beta": beta, "vcc": vcc, "follower": result.follower, "dual": result.dual}
+        values.update(resistors(result))
+        out.append(values)
+    return out
+
+def iterPipeline(lines, header=None, chunkSize=CHUNK_SIZE, workers=1, seed=None, start=1):
+    """
+    Designs the rows of an input, yielding the results in the order of the rows
+
+        Parameters
+        ----------
+        lines: iterable
+            Text lines of the input, without the header, it may be a file
+        header: list
+            Columns of a CSV input, None for JSONL
+        chunkSize: Int
+            Number of lines designed at once
+        workers: Int
+            Number of processes, 1 designs in this process and None uses every core
+        seed: Int
+            Seed for reproducible resistor picks
+        start: Int
+            Line number of the first line
+
+        Return
+        -------
+        A generator of the dicts of processChunk
+
+    """
+
+    workers = workers or os.cpu_count() or 1
+    lines = iter(lines)
+    chunks = iter(lambda: list(itertools.islice(lines, chunkSize)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from processChunk(chunk, start, header, seed)
+            start += len(chunk)
+        return
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunks:
+            pending.append(executor.submit(processChunk, chunk, start, header, seed))
+            start += len(chunk)
+            #Keeps only a couple of chunks per worker in memory
+            if len(pending) >= 2*workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def run(source, output, inputFormat="csv", outputFormat="csv", chunkSize=CHUNK_SIZE, workers=1, seed=None):
+    """
+    Reads the requests of a file and writes the results to another one
+
+        Parameters
+        ----------
+        source: file
+            Text file with the requests
+        output: file
+            Text file for the results
+        inputFormat: str
+            "csv" or "jsonl"
+        outputFormat: str
+            "csv" or "jsonl"
+        chunkSize: Int
+            Number of lines designed at once
+        workers: Int
+            Number of processes, 1 designs in this process and None uses every core
+        seed: Int
+            Seed for reproducible resistor picks
+
+        Return
+        -------
+        A tuple (rows, invalid rows)
+
+    """
+
+    header = None
+    start = 1
+    if inputFormat == "csv":
+        first = source.readline()
+        header = [field.strip().lower() for field in next(csv.reader([first]), [])]
+        start = 2
+    if outputFormat == "csv":
+        writer = csv.DictWriter(output, fieldnames=COLUMNS, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+    rows = invalid = 0
+    for values in iterPipeline(source, header, chunkSize, workers, seed, start):
+        rows += 1
+        if values["status"] == "ok" and outputFormat == "csv" and any(key not in COLUMNS for key in values):
+            #A cascade longer than the columns of the CSV output
+            values = {"line": values["line"], "status": "error", "reason": "the design has more stages than the CSV columns, use JSONL"}
+        if values["status"] != "ok":
+            invalid += 1
+        if outputFormat == "csv":
+            writer.writerow(values)
+        else:
+            output.write(json.dumps(values)+"\n")
+    return rows, invalid
+
+def main(argv=None):
+    """
+    Command line of the pipeline
+
+        Parameters
+        ----------
+        argv: list
+            The arguments, sys.argv[1:] if it is None
+
+        Return
+        -------
+        1 if some row is invalid, 0 otherwise
+
+    """
+
+    parser = argparse.ArgumentParser(prog="BJTpy pipeline", description="Designs the requests of a CSV or JSONL file, line by line")
+    parser.add_argument("input", nargs="?", default="-", help="file with the requests, - for stdin")
+    parser.add_argument("--output", default="-", help="file for the results, - for stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None, help="format of the input, from its extension by default")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], default=None, help="format of the results, the one of the input by default")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="lines designed at once")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes, 0 for every core")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible resistor picks")
+    args = parser.parse_args(argv)
+    inputFormat = args.format or ("jsonl" if args.input.endswith((".jsonl", ".json", ".ndjson")) else "csv")
+    outputFormat = args.output_format or inputFormat
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        rows, invalid = run(source, output, inputFormat, outputFormat, args.chunk, args.workers or None, args.seed)
+    finally:
+        for file in (source, output):
+            if file not in (sys.stdin, sys.stdout):
+                file.close()
+    sys.stderr.write("%d rows, %d invalid\n" % (rows, invalid))
+    return 1 if invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,483 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Local HTTP/JSON design service, so scripts and lab benches can get designs without the windows
+
+The service checks the inputs with engine.checkRequest, as makeAmp and makeAmp2 do, and designs with the same engine of the
+calculators. It runs on asyncio: every request goes to a bounded queue and a dispatcher sends the
+queued requests to a pool of processes in batches, so many small requests share one trip to a
+worker. When the queue is full the request is answered at once with 503 and Retry-After instead of
+waiting, and only a few batches per worker are in flight at the same time.
+
+    POST /design    {"gain": 60, "beta": 150, "vcc": 12, "follower": true} gives one design
+    POST /designs   {"requests": [{...}, {...}]} gives a list, in the same order
+    GET  /metrics   latency percentiles, queue depth, batches and counters
+    GET  /health    {"status": "ok"}
+
+Besides gain, beta, vcc, follower and dual a request may have topology (one of the calculators or
+a cascade of up to engine.MAX_STAGES inversors, matching follower and dual, used instead of the one
+makeCircuit picks), choices, seed and series (see engine.designTopology).
+
+..note::
+    This module depends on `asyncio`, `concurrent.futures`, `json`, `argparse` and on the `engine` module
+    <https://docs.python.org/3/library/asyncio.html>
+"""
+
+import argparse #Used to read the options of the command
+import asyncio #Used to serve many connections in one thread
+import json #Used to read the requests and to write the answers
+import multiprocessing #Used to start the workers without the sockets of the connections
+import os #Used to count the cores
+import random #Used to pick the resistors of each design
+import re #Used to read the Content-Length
+import time #Used to measure the latency
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from engine import checkRequest, design, designTopology
+
+#Address of the service, it only listens on this machine
+HOST = "127.0.0.1"
+PORT = 8765
+#Requests waiting for a worker, above it the requests are rejected with 503
+QUEUE_SIZE = 1000
+#Largest number of requests sent to a worker at once
+BATCH_SIZE = 64
+#Seconds the dispatcher waits for more requests to fill a batch
+BATCH_WAIT = 0.002
+#Largest body of a request, in bytes
+MAX_BODY = 1 << 20
+#Longest request line or header, in bytes
+MAX_LINE = 1 << 16
+#Latencies kept for the percentiles of /metrics
+LATENCIES = 10000
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 503: "Service Unavailable"}
+
+def solve(points):
+    """
+    Designs a batch of checked requests, it runs inside the worker processes
+
+        Parameters
+        ----------
+        points: list
+            Tuples of checkRequest()
+
+        Return
+        -------
+        A list with a (True, design as a dict) or a (False, reason) for each point
+
+    """
+
+    from sweep import toDict
+    rng = random.Random()
+    out = []
+    for name, gain, beta, vcc, follower, dual, choices, seed, series in points:
+        rng.seed(seed)
+        try:
+            if name is None:
+                result = design(gain, beta, vcc, follower, dual, choices, rng, series=series)
+            else:
+                result = designTopology(name, gain, beta, vcc, choices, rng, series=series)
+            out.append((True, toDict(result)))
+        except Exception as error:
+            out.append((False, "%s: %s" % (type(error).__name__, error)))
+    return out
+
+class Service:
+    """
+    Queue, dispatcher and metrics of the service
+
+        Parameters
+        ----------
+        workers: Int
+            Number of processes, all the cores if it is None
+        queueSize: Int
+            Requests waiting for a worker, above it they are rejected
+        batchSize: Int
+            Largest number of requests sent to a worker at once
+        batchWait: Float
+            Seconds the dispatcher waits for more requests to fill a batch
+
+    """
+
+    def __init__(self, workers=None, queueSize=QUEUE_SIZE, batchSize=BATCH_SIZE, batchWait=BATCH_WAIT):
+        self.workers = workers or os.cpu_count() or 1
+        self.batchSize = batchSize
+        self.batchWait = batchWait
+        self.queue = asyncio.Queue(maxsize=queueSize)
+        #Only a couple of batches per worker are in flight, the rest wait in the queue
+        self.slots = asyncio.Semaphore(2*self.workers)
+        self.executor = self._pool()
+        self.latencies = deque(maxlen=LATENCIES)
+        self.counters = {"requests": 0, "designs": 0, "errors": 0, "rejected": 0, "batches": 0, "restarts": 0}
+        self.inFlight = 0
+        self.started = time.time()
+        self._dispatcher = None
+
+    def _pool(self):
+        #A forked worker would keep the sockets open when they are accepted before the pool starts (or
+        #restarts), so the clients wouldn't see the end of the answers. The forkserver starts clean ones
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver") if "forkserver" in methods else None
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def start(self):
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, points):
+        """
+        Queues checked requests, all of them or none
+
+            Parameters
+            ----------
+            points: list
+                Tuples of checkRequest()
+
+            Return
+            -------
+            A list with the Future of each point, None if the queue has no room for all of them
+
+        """
+
+        if self.queue.maxsize-self.queue.qsize() < len(points):
+            self.counters["rejected"] += len(points)
+            return None
+        loop = asyncio.get_running_loop()
+        futures = []
+        for point in points:
+            future = loop.create_future()
+            self.queue.put_nowait((point, future))
+            futures.append(future)
+        return futures
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time()+self.batchWait
+            while len(batch) < self.batchSize:
+                if self.queue.empty():
+                    timeout = deadline-loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+            await self.slots.acquire()
+            self.counters["batches"] += 1
+            self.inFlight += len(batch)
+            executor = self.executor
+            try:
+                task = loop.run_in_executor(executor, solve, [point for point, _ in batch])
+            except Exception as error:
+                #A pool broken by a worker that died refuses new work, the dispatcher must go on
+                self._fail(executor, error, batch)
+            else:
+                task.add_done_callback(lambda task, batch=batch, executor=executor: self._finish(task, batch, executor))
+
+    def _restart(self, executor):
+        #Only the first failed batch of a broken pool replaces it
+        if executor is self.executor:
+            self.counters["restarts"] += 1
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._pool()
+
+    def _fail(self, executor, error, batch):
+        self.slots.release()
+        self.inFlight -= len(batch)
+        if isinstance(error, BrokenProcessPool):
+            self._restart(executor)
+        for _, future in batch:
+            if not future.done():
+                if isinstance(error, BrokenProcessPool):
+                    future.set_exception(error)
+                else:
+                    future.set_result((False, "%s: %s" % (type(error).__name__, error)))
+
+    def _finish(self, task, batch, executor):
+        try:
+            results = task.result()
+        except Exception as error:
+            self._fail(executor, error, batch)
+            return
+        self.slots.release()
+        self.inFlight -= len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def metrics(self):
+        """
+        Latency and queue values of the service
+
+            Parameters
+            ----------
+            Void
+
+            Return
+            -------
+            A dict with the counters, queueDepth, inFlight, workers, uptime, meanBatch and the latency
+            percentiles (p50, p90, p99, max) in milliseconds of the last LATENCIES requests
+
+        """
+
+        latencies = sorted(self.latencies)
+        out = dict(self.counters)
+        out.update({"queueDepth": self.queue.qsize(), "queueSize": self.queue.maxsize, "inFlight": self.inFlight,
+                    "workers": self.workers, "uptime": time.time()-self.started,
+                    "meanBatch": self.counters["designs"]/self.counters["batches"] if self.counters["batches"] else 0.0})
+        latency = {}
+        if latencies:
+            for p in (50, 90, 99):
+                latency["p%d" % p] = 1000*latencies[min(len(latencies)-1, len(latencies)*p//100)]
+            latency["max"] = 1000*latencies[-1]
+        out["latency"] = latency
+        return out
+
+    async def designs(self, requests):
+        """
+        Designs a list of requests
+
+            Parameters
+            ----------
+            requests: list
+                JSON objects of the requests
+
+            Return
+            -------
+            (status, answer): 400 with the reason of the first invalid request (or if there are more
+            requests than the size of the queue), 503 if the queue is full or if a worker died (the
+            pool is started again) or 200 with a list of designs (or of {"error": reason} for the
+            designs that failed)
+
+        """
+
+        try:
+            points = [checkRequest(request) for request in requests]
+        except ValueError as error:
+            return 400, {"error": str(error)}
+        if len(points) > self.queue.maxsize:
+            return 400, {"error": "at most %d requests can be sent at once" % self.queue.maxsize}
+        futures = self.submit(points)
+        if futures is None:
+            return 503, {"error": "the queue is full, try again later"}
+        try:
+            results = await asyncio.gather(*futures)
+        except BrokenProcessPool:
+            return 503, {"error": "a worker stopped, try again later"}
+        self.counters["designs"] += len(results)
+        out = []
+        for ok, value in results:
+            if not ok:
+                self.counters["errors"] += 1
+            out.append(value if ok else {"error": value})
+        return 200, out
+
+    async def handle(self, method, path, body):
+        """
+        Answers one HTTP request
+
+            Parameters
+            ----------
+            method: str
+                The HTTP method
+            path: str
+                The path, without the query
+            body: bytes
+                The body of the request
+
+            Return
+            -------
+            (status, answer as a JSON value)
+
+        """
+
+        routes = {"/design": "POST", "/designs": "POST", "/metrics": "GET", "/health": "GET"}
+        if path not in routes:
+            return 404, {"error": "unknown path %s" % path}
+        if method != routes[path]:
+            return 405, {"error": "%s needs %s" % (path, routes[path])}
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics()
+        try:
+            request = json.loads(body or b"null")
+        except ValueError:
+            return 400, {"error": "the body is not valid JSON"}
+        if path == "/design":
+            status, answer = await self.designs([request])
+            if status == 200:
+                answer = answer[0]
+                if "error" in answer:
+                    status = 400
+            return status, answer
+        if not isinstance(request, dict) or not isinstance(request.get("requests"), list):
+            return 400, {"error": "the body must be {\"requests\": [...]}"}
+        return await self.designs(request["requests"])
+
+    async def _reply(self, writer, status, answer, keepAlive=False):
+        data = json.dumps(answer).encode()
+        head = ["HTTP/1.1 %d %s" % (status, REASONS[status]), "Content-Type: application/json",
+                "Content-Length: %d" % len(data), "Connection: %s" % ("keep-alive" if keepAlive else "close")]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head)+"\r\n\r\n").encode()+data)
+        await writer.drain()
+
+    async def connection(self, reader, writer):
+        """
+        Serves the HTTP/1.1 requests of one connection, it is kept open unless the client closes it or
+        sends a request that can't be read (answered with 400 or 413 before closing)
+        """
+
+        try:
+            while True:
+                try:
+                    line, headers = await readHead(reader)
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._reply(writer, 413, {"error": "the request line or a header is longer than %d bytes" % MAX_LINE})
+                    break
+                if not line:
+                    break
+                start = time.perf_counter()
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    await self._reply(writer, 400, {"error": "the request line must be METHOD PATH VERSION"})
+                    break
+                length = headers.get("content-length", "0") or "0"
+                length = int(length) if re.fullmatch(r"[0-9]+", length) else None
+                path = target.split("?", 1)[0]
+                body = None
+                if length is None:
+                    #The end of the body is unknown, so the connection is closed after the answer
+                    status, answer = 400, {"error": "Content-Length must be a non-negative integer"}
+                elif length > MAX_BODY:
+                    status, answer = 413, {"error": "the body is larger than %d bytes" % MAX_BODY}
+                else:
+                    try:
+                        body = await reader.readexactly(length) if length else b""
+                    except asyncio.IncompleteReadError:
+                        status, answer = 400, {"error": "the body is shorter than Content-Length"}
+                    else:
+                        self.counters["requests"] += 1
+                        status, answer = await self.handle(method, path, body)
+                keepAlive = body is not None and headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                await self._reply(writer, status, answer, keepAlive)
+                if path in ("/design", "/designs"):
+                    self.latencies.append(time.perf_counter()-start)
+                if not keepAlive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def readHead(reader):
+    """
+    Reads the request line and the headers of an HTTP request
+
+        Parameters
+        ----------
+        reader: StreamReader
+            The stream of the connection
+
+        Return
+        -------
+        (request line, dict of headers with lowercase keys), the line is empty if the connection was
+        closed. It raises ValueError if a line is longer than the limit of the reader
+
+    """
+
+    line = await reader.readline()
+    headers = {}
+    while line:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = header.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return line, headers
+
+async def serve(host=HOST, port=PORT, workers=None, queueSize=QUEUE_SIZE, batchSize=BATCH_SIZE, batchWait=BATCH_WAIT, ready=None):
+    """
+    Runs the service until it is cancelled
+
+        Parameters
+        ----------
+        host: str
+            Address of the service
+        port: Int
+            Port of the service, 0 for any free port
+        workers: Int
+            Number of processes, all the cores if it is None
+        queueSize: Int
+            Requests waiting for a worker, above it they are rejected
+        batchSize: Int
+            Largest number of requests sent to a worker at once
+        batchWait: Float
+            Seconds the dispatcher waits for more requests to fill a batch
+        ready: function
+            Called with the (host, port) of the service when it starts listening
+
+        Return
+        -------
+        Void
+
+    """
+
+    service = Service(workers, queueSize, batchSize, batchWait)
+    service.start()
+    server = await asyncio.start_server(service.connection, host, port, limit=MAX_LINE)
+    try:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    """
+    Command line of the service
+
+        Parameters
+        ----------
+        argv: list
+            The arguments, sys.argv[1:] if it is None
+
+        Return
+        -------
+        Void
+
+    """
+
+    parser = argparse.ArgumentParser(prog="BJTpy serve", description="Serves the designs over HTTP/JSON on this machine")
+    parser.add_argument("--host", default=HOST, help="address of the service")
+    parser.add_argument("--port", type=int, default=PORT, help="port of the service")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, all the cores by default")
+    parser.add_argument("--queue", type=int, default=QUEUE_SIZE, help="requests waiting for a worker before rejecting")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="largest number of requests sent to a worker at once")
+    args = parser.parse_args(argv)
+
+    def ready(address):
+        print("BJTpy service on http://%s:%d" % address, flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue, args.batch, ready=ready))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Numeric solver for the design equations of the amplifier stages
+
+Every equation solved in the calculators is a rational equation in one unknown of the form
+num(x)/den(x) = target, where num and den are polynomials of degree two or less. Clearing the
+denominator leaves a linear or quadratic equation that is solved analytically, the root is then
+checked against the original equation and polished with a guarded Newton iteration if needed.
+
+..note::
+    This module depends on `math` and on the `instrument` module
+    <https://docs.python.org/3/library/math.html>
+"""
+
+import math #Used for the square root of the quadratic formula
+
+from instrument import timed
+
+#Relative residual accepted for a root before falling back to Newton
+TOLERANCE = 1e-12
+#Maximum number of iterations of the Newton fallback
+MAX_ITERATIONS = 60
+
+def polyval(coefficients, x):
+    """
+    Evaluates a polynomial given by its coefficients in ascending order
+
+        Parameters
+        ----------
+        coefficients: tuple
+            Coefficients c0, c1, c2... of the polynomial
+        x: Float
+            Point where the polynomial is evaluated
+
+        Return
+        -------
+        The value of the polynomial in x
+
+    """
+
+    value = 0.0
+    for c in reversed(coefficients):
+        value = value*x+c
+    return value
+
+def solveQuadratic(a, b, c):
+    """
+    Finds the real roots of a*x**2 + b*x + c = 0, it also handles the linear case (a = 0)
+
+        Parameters
+        ----------
+        a: Float
+            Quadratic coefficient
+        b: Float
+            Linear coefficient
+        c: Float
+            Independent coefficient
+
+        Return
+        -------
+        A sorted list with the real roots, empty if there is none
+
+    """
+
+    if a == 0:
+        if b == 0:
+            return []
+        return [-c/b]
+    disc = b*b-4*a*c
+    if disc < 0:
+        return []
+    #Numerically stable form, avoids the cancellation between -b and the square root
+    q = -0.5*(b+math.copysign(math.sqrt(disc),b))
+    if q == 0:
+        return [0.0]
+    return sorted({q/a, c/q})
+
+@timed("solve.newton")
+def newton(f, x0, tol=TOLERANCE, maxIter=MAX_ITERATIONS):
+    """
+    Guarded Newton iteration with a numeric derivative, each step is halved until the residual decreases
+
+        Parameters
+        ----------
+        f: function
+            The function whose root is searched
+        x0: Float
+            Starting point of the iteration
+        tol: Float
+            Relative tolerance of the step to stop the iteration
+        maxIter: Int
+            Maximum number of iterations
+
+        Return
+        -------
+        The root of f
+
+    """
+
+    x = float(x0)
+    fx = f(x)
+    for _ in range(maxIter):
+        if fx == 0:
+            return x
+        h = 1e-7*max(abs(x),1.0)
+        dfx = (f(x+h)-f(x-h))/(2*h)
+        if dfx == 0 or not math.isfinite(dfx):
+            break
+        step = fx/dfx
+        #Guard: halve the step while it does not reduce the residual
+        for _ in range(30):
+            xNew = x-step
+            fNew = f(xNew)
+            if math.isfinite(fNew) and abs(fNew) < abs(fx):
+                break
+            step /= 2
+        else:
+            break
+        x, fx = xNew, fNew
+        if abs(step) <= tol*max(abs(x),1.0):
+            return x
+    if math.isfinite(fx) and abs(fx) <= math.sqrt(tol)*max(abs(x),1.0):
+        return x
+    raise ValueError("The design equation has no solution")
+
+@timed("solve")
+def solveRational(num, den, target):
+    """
+    Solves num(x)/den(x) = target, where num and den are polynomials of degree two or less
+
+        Parameters
+        ----------
+        num: tuple
+            Coefficients of the numerator in ascending order
+        den: tuple
+            Coefficients of the denominator in ascending order
+        target: Float
+            Value that the ratio must take
+
+        Return
+        -------
+        The root of the equation, the first one if there are two (same choice as sympy)
+
+    """
+
+    #num(x) - target*den(x) = 0
+    coefficients = [0.0, 0.0, 0.0]
+    for i, c in enumerate(num):
+        coefficients[i] += c
+    for i, c in enumerate(den):
+        coefficients[i] -= target*c
+    c, b, a = coefficients
+    f = lambda x: polyval(num, x)-target*polyval(den, x)
+    scale = max(abs(target*polyval(den, 1.0)), abs(polyval(num, 1.0)), 1e-300)
+    for x in solveQuadratic(a, b, c):
+        if polyval(den, x) == 0:
+            continue
+        if abs(f(x)) <= TOLERANCE*scale*max(abs(x),1.0)**2:
+            return x
+        return newton(f, x)
+    #No analytic root passed the check, the Newton fallback starts from the origin
+    return newton(f, 1.0)
+
+def emitterResistance(gain, beta, vce, RC, RL=None):
+    """
+    Solves RE in the gain equation of an inversor stage with single supply
+
+        Parameters
+        ----------
+        gain: Float
+            The gain required in the stage
+        beta: Float
+            The beta value of the transistor
+        vce: Float
+            The voltage between collector and emitter
+        RC: Float
+            The collector resistor of the stage
+        RL: Float
+            The load resistor of the stage, None if the stage has no load
+
+        Return
+        -------
+        The value of RE
+
+    """
+
+    Rp = RC if RL is None else (1/RC+1/RL)**-1
+    #rpi = beta*0.025/(vce/(RE+RC)) is linear in RE
+    k = (beta*0.025)/vce
+    return solveRational((beta*Rp,), (k*RC, (beta+1)+k), gain)
+
+def emitterResistanceDual(gain, beta, Rpi, RC, RL):
+    """
+    Solves RE in the gain equation of an inversor stage with dual supply
+
+        Parameters
+        ----------
+        gain: Float
+            The gain required in the stage
+        beta: Float
+            The beta value of the transistor
+        Rpi: Float
+            The input resistance of the transistor
+        RC: Float
+            The collector resistor of the stage
+        RL: Float
+            The input resistance of the next stage
+
+        Return
+        -------
+        The value of RE
+
+    """
+
+    Rp = (1/RC+1/RL)**-1
+    return solveRational((beta*Rp,), (Rpi, beta+1), gain)
+
+def theveninResistance(Req, Rin):
+    """
+    Solves Rth in (1/Rth+1/Req)**-1 = Rin
+
+        Parameters
+        ----------
+        Req: Float
+            The resistance seen in the base of the transistor
+        Rin: Float
+            The input resistance required in the stage
+
+        Return
+        -------
+        The value of Rth
+
+    """
+
+    return solveRational((0.0, Req), (Req, 1.0), Rin)
+
+def dividerResistance(Veq, Rth):
+    """
+    Solves R1 in (Veq/(1+Veq))*R1 = Rth
+
+        Parameters
+        ----------
+        Veq: Float
+            The relation between R2 and R1 in the voltage divider
+        Rth: Float
+            The Thevenin resistance of the voltage divider
+
+        Return
+        -------
+        The value of R1
+
+    """
+
+    return solveRational((0.0, Veq/(1+Veq)), (1.0,), Rth)
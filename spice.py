@@ -0,0 +1,200 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+SPICE netlists of the designed amplifiers
+
+Each netlist follows the schematics of Images/Casos: the stages from the input to the output with
+the names of makeCircuit (RC_1, RE_1, R1_1, R2_1, ... and RB_S, RE_S for the follower), coupling
+capacitors between them and a single Vcc or a dual Vcc/-Vee supply. The writers take any iterable
+of designs and write each netlist as soon as it is made, one file per design or one tar archive,
+so a sweep of millions of designs is exported in constant memory.
+
+..note::
+    This module depends on `tarfile`, `gzip`, `os` and `time`
+    <https://docs.python.org/3/library/tarfile.html>
+"""
+
+import gzip #Used to compress the archives
+import os #Used to build the paths of the files
+import tarfile #Used to write the headers of the archives
+import time #Used for the date of the files in the archives
+
+#Default coupling capacitor between the stages, at the input and at the output
+COUPLING = 10e-6
+#Model of the transistors, BF is replaced by the beta of the design
+MODEL = ".model QBJT NPN(IS=1e-14 BF={beta} BR=1 VAF=100 CJC=2p TF=0.5n)"
+#Analyses run by the netlist
+ANALYSIS = (".op", ".ac dec 20 1 1G")
+#Size of the blocks of a tar archive
+BLOCK = 512
+
+def _suffixes(design):
+    n = len(design.stages)-design.follower
+    return [str(i+1) for i in range(n)]+(["S"] if design.follower else [])
+
+def _value(value):
+    #Shortest text that reads back as the same float, so the netlist keeps every digit of the design
+    return repr(float(value))
+
+def netlist(design, coupling=COUPLING, load=None, title=None):
+    """
+    SPICE netlist of a design
+
+        Parameters
+        ----------
+        design: Design
+            The design of the engine module
+        coupling: Float
+            Coupling capacitor at the input, between the stages and at the output
+        load: Float
+            Load resistor at the output, None to leave the output open
+        title: str
+            First line of the netlist, it describes the design if it is None
+
+        Return
+        -------
+        The netlist as a str
+
+    """
+
+    if title is None:
+        title = "* BJTpy %s gain=%s beta=%s vcc=%s" % (design.topology, _value(design.gain), _value(design.beta), _value(design.vcc))
+    vee = "VEE" if design.dual else "0"
+    lines = [title, "VCC VCC 0 DC %s" % _value(design.vcc)]
+    if design.dual:
+        lines.append("VEE VEE 0 DC %s" % _value(-design.vcc))
+    lines.append("VIN IN 0 DC 0 AC 1 SIN(0 10m 1k)")
+    previous, capacitor = "IN", "CIN"
+    for suffix, stage in zip(_suffixes(design), design.stages):
+        b, c, e = "B"+suffix, "C"+suffix if stage.RC is not None else "VCC", "E"+suffix
+        lines.append("%s %s %s %s" % (capacitor, previous, b, _value(coupling)))
+        lines.append("Q%s %s %s %s QBJT" % (suffix, c, b, e))
+        if stage.RC is not None:
+            lines.append("RC_%s VCC %s %s" % (suffix, c, _value(stage.RC)))
+        if stage.R1 is not None:
+            lines.append("R1_%s VCC %s %s" % (suffix, b, _value(stage.R1)))
+            lines.append("R2_%s %s %s %s" % (suffix, b, vee, _value(stage.R2)))
+        else:
+            lines.append("RB_%s VCC %s %s" % (suffix, b, _value(stage.RB)))
+        lines.append("RE_%s %s %s %s" % (suffix, e, vee, _value(stage.RE)))
+        previous, capacitor = c if stage.RC is not None else e, "CC_"+suffix
+    lines.append("COUT %s OUT %s" % (previous, _value(coupling)))
+    lines.append("RL OUT 0 %s" % (_value(load) if load is not None else "1G"))
+    lines.append(MODEL.format(beta=_value(design.beta)))
+    lines += list(ANALYSIS)
+    lines.append(".end")
+    return "\n".join(lines)+"\n"
+
+def netlists(designs, coupling=COUPLING, load=None):
+    """
+    Generator of the netlists of many designs
+
+        Parameters
+        ----------
+        designs: iterable
+            Designs of the engine module, it may be a generator
+        coupling: Float
+            Coupling capacitor at the input, between the stages and at the output
+        load: Float
+            Load resistor at the output, None to leave the output open
+
+        Return
+        -------
+        A generator of (file name, netlist)
+
+    """
+
+    for i, design in enumerate(designs):
+        yield "%08d_%s.cir" % (i, design.topology), netlist(design, coupling, load)
+
+def writeFiles(designs, directory, coupling=COUPLING, load=None):
+    """
+    Writes one netlist file per design
+
+        Parameters
+        ----------
+        designs: iterable
+            Designs of the engine module, it may be a generator
+        directory: str
+            Directory of the files, it is created if needed
+        coupling: Float
+            Coupling capacitor at the input, between the stages and at the output
+        load: Float
+            Load resistor at the output, None to leave the output open
+
+        Return
+        -------
+        The number of files written
+
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for name, text in netlists(designs, coupling, load):
+        with open(os.path.join(directory, name), "w") as file:
+            file.write(text)
+        count += 1
+    return count
+
+def writeTar(designs, path, coupling=COUPLING, load=None):
+    """
+    Writes the netlists in a tar archive, compressed with gzip if the path ends with .gz or .tgz. The
+    archive is written member by member, without keeping the list of members that tarfile keeps
+
+        Parameters
+        ----------
+        designs: iterable
+            Designs of the engine module, it may be a generator
+        path: str
+            Path of the archive
+        coupling: Float
+            Coupling capacitor at the input, between the stages and at the output
+        load: Float
+            Load resistor at the output, None to leave the output open
+
+        Return
+        -------
+        The number of netlists written
+
+    """
+
+    count = 0
+    now = int(time.time())
+    with (gzip.open(path, "wb") if path.endswith((".gz", ".tgz")) else open(path, "wb")) as file:
+        for name, text in netlists(designs, coupling, load):
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size, info.mtime, info.mode = len(data), now, 0o644
+            file.write(info.tobuf(format=tarfile.USTAR_FORMAT))
+            file.write(data)
+            file.write(b"\0"*(-len(data) % BLOCK))
+            count += 1
+        #The end of an archive is marked by two empty blocks
+        file.write(b"\0"*(2*BLOCK))
+    return count
+
+def write(designs, path, coupling=COUPLING, load=None):
+    """
+    Writes the netlists with writeTar if the path is a .tar, .tar.gz or .tgz file and with writeFiles
+    otherwise
+
+        Parameters
+        ----------
+        designs: iterable
+            Designs of the engine module, it may be a generator
+        path: str
+            Path of the archive or of the directory
+        coupling: Float
+            Coupling capacitor at the input, between the stages and at the output
+        load: Float
+            Load resistor at the output, None to leave the output open
+
+        Return
+        -------
+        The number of netlists written
+
+    """
+
+    if path.endswith((".tar", ".tar.gz", ".tgz")):
+        return writeTar(designs, path, coupling, load)
+    return writeFiles(designs, path, coupling, load)
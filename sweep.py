@@ -0,0 +1,251 @@
+"""
+BJTpy (Bipolar Junction Transistor in Python)
+----------------------------------------------
+Design space sweep, runs the engine over a grid of inputs using every core
+
+The grid is split in chunks that are designed by a pool of processes, the results come back in
+the same order of the inputs and a progress callback is called after each chunk. Only a few chunks
+are in flight at the same time, so the memory stays flat for any size of grid.
+
+..note::
+    This module depends on `concurrent.futures`, `itertools`, `argparse`, `json` and on the `engine` module
+    <https://docs.python.org/3/library/concurrent.futures.html>
+"""
+
+import argparse #Used to read the options of the command
+import itertools #Used to build the grid and to split it in chunks
+import json #Used to write the designs
+import os #Used to count the cores
+import random #Used to pick the resistors of each design
+import sys #Used to write the progress
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import design
+
+def grid(gains, betas, vccs, followers=(False,), duals=(False,)):
+    """
+    Builds every combination of the inputs, the dual designs always have a follower stage
+
+        Parameters
+        ----------
+        gains: iterable
+            The gain values
+        betas: iterable
+            The beta values
+        vccs: iterable
+            The vcc values
+        followers: iterable
+            Options for the follower stage
+        duals: iterable
+            Options for the dual supply
+
+        Return
+        -------
+        A generator of points (gain, beta, vcc, follower, dual)
+
+    """
+
+    for dual in duals:
+        for follower in ((True,) if dual else followers):
+            for gain, beta, vcc in itertools.product(gains, betas, vccs):
+                yield (gain, beta, vcc, follower, dual)
+
+def linspace(start, stop, count):
+    """
+    Values evenly spaced between start and stop, both included
+
+        Parameters
+        ----------
+        start: Float
+            First value
+        stop: Float
+            Last value
+        count: Int
+            Number of values
+
+        Return
+        -------
+        A list of values
+
+    """
+
+    if count == 1:
+        return [start]
+    return [start+(stop-start)*i/(count-1) for i in range(count)]
+
+#DesignStore opened by each worker process, by path
+_stores = {}
+
+def designChunk(points, start=0, seed=None, store=None):
+    """
+    Designs a chunk of points, it runs inside the worker processes
+
+        Parameters
+        ----------
+        points: list
+            Points (gain, beta, vcc, follower, dual)
+        start: Int
+            Position of the first point in the whole sweep
+        seed: Int
+            Seed of the sweep, each point uses its own generator derived from it and from its position,
+            so the results don't depend on the size of the chunks. None gives random results
+        store: str
+            Path of a SQLite design store, the designs found there are not calculated again
+
+        Return
+        -------
+        A list with the Design of each point
+
+    """
+
+    rng = random.Random()
+    cache = None
+    if store is not None:
+        if store not in _stores:
+            from designstore import DesignStore
+            _stores[store] = DesignStore(store)
+        cache = _stores[store]
+    designs = []
+    for i, (gain, beta, vcc, follower, dual) in enumerate(points):
+        if seed is not None:
+            rng.seed("%d:%d" % (seed, start+i))
+        #Every point of a grid is different, the design cache would only add evictions
+        designs.append(design(gain, beta, vcc, follower, dual, rng=rng, cache=cache))
+    if cache is not None:
+        cache.flush()
+    return designs
+
+def iterSweep(points, chunkSize=2000, workers=None, seed=None, progress=None, store=None):
+    """
+    Designs every point with a pool of processes, yielding the results in the order of the points
+
+        Parameters
+        ----------
+        points: iterable
+            Points (gain, beta, vcc, follower, dual), it may be a generator
+        chunkSize: Int
+            Number of points sent to a worker at once
+        workers: Int
+            Number of processes, all the cores if it is None
+        seed: Int
+            Seed for reproducible results
+        progress: function
+            Called with (chunks done, points in the chunk) after each chunk
+        store: str
+            Path of a SQLite design store shared by the workers
+
+        Return
+        -------
+        A generator of Design
+
+    """
+
+    workers = workers or os.cpu_count() or 1
+    points = iter(points)
+    pending = deque()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        start = 0
+        for chunk in iter(lambda: list(itertools.islice(points, chunkSize)), []):
+            pending.append(executor.submit(designChunk, chunk, start, seed, store))
+            start += len(chunk)
+            #Keeps only a couple of chunks per worker in flight
+            if len(pending) >= 2*workers:
+                done, designs = _collect(pending, done, progress)
+                yield from designs
+        while pending:
+            done, designs = _collect(pending, done, progress)
+            yield from designs
+
+def _collect(pending, done, progress):
+    designs = pending.popleft().result()
+    done += 1
+    if progress is not None:
+        progress(done, len(designs))
+    return done, designs
+
+def sweep(points, chunkSize=2000, workers=None, seed=None, progress=None, store=None):
+    """
+    Same as iterSweep, returning a list with every Design
+    """
+
+    return list(iterSweep(points, chunkSize, workers, seed, progress, store))
+
+def toDict(result):
+    """
+    Converts a Design to plain values that can be written as JSON
+
+        Parameters
+        ----------
+        result: Design
+            The design
+
+        Return
+        -------
+        A dict
+
+    """
+
+    values = result._asdict()
+    values["stages"] = [stage._asdict() for stage in result.stages]
+    return values
+
+def main(argv=None):
+    """
+    Command line of the sweep, writes one JSON line per design or the SPICE netlists
+
+        Parameters
+        ----------
+        argv: list
+            The arguments, sys.argv[1:] if it is None
+
+        Return
+        -------
+        Void
+
+    """
+
+    parser = argparse.ArgumentParser(prog="BJTpy sweep", description="Designs every amplifier of a grid of inputs")
+    parser.add_argument("--gain", nargs=3, type=float, default=[2, 125, 124], metavar=("START", "STOP", "COUNT"))
+    parser.add_argument("--beta", nargs=3, type=float, default=[100, 200, 11], metavar=("START", "STOP", "COUNT"))
+    parser.add_argument("--vcc", nargs=3, type=float, default=[10, 20, 11], metavar=("START", "STOP", "COUNT"))
+    parser.add_argument("--follower", choices=["no", "yes", "both"], default="both")
+    parser.add_argument("--dual", choices=["no", "yes", "both"], default="no")
+    parser.add_argument("--chunk", type=int, default=2000, help="points per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, all the cores by default")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible resistor picks")
+    parser.add_argument("--output", default="-", help="file for the results, - for stdout")
+    parser.add_argument("--store", default=None, metavar="PATH", help="SQLite file to reuse and keep the designs")
+    parser.add_argument("--netlists", default=None, metavar="PATH",
+                        help="write SPICE netlists instead of JSON, to a directory or to a .tar/.tar.gz archive")
+    args = parser.parse_args(argv)
+    options = {"no": (False,), "yes": (True,), "both": (False, True)}
+    axes = [linspace(start, stop, int(count)) for start, stop, count in (args.gain, args.beta, args.vcc)]
+    followers, duals = options[args.follower], options[args.dual]
+    points = grid(*axes, followers=followers, duals=duals)
+    count = sum(1 if dual else len(followers) for dual in duals)*len(axes[0])*len(axes[1])*len(axes[2])
+    total = -(-count//args.chunk)
+
+    def report(chunks, size):
+        sys.stderr.write("\rChunk %d/%d" % (chunks, total))
+        sys.stderr.flush()
+
+    if args.netlists is not None:
+        import spice
+        try:
+            spice.write(iterSweep(points, args.chunk, args.workers, args.seed, report, args.store), args.netlists)
+        finally:
+            sys.stderr.write("\n")
+        return
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in iterSweep(points, args.chunk, args.workers, args.seed, report, args.store):
+            output.write(json.dumps(toDict(result))+"\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        sys.stderr.write("\n")
+
+if __name__ == "__main__":
+    main()
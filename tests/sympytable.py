@@ -0,0 +1,87 @@
+"""
+Writes the SYMPY table of test_solver.py: every case is designed by the engine with its four stage
+solvers replaced by sympy.solve() over the expressions of the original calculators, so the resistors
+are the ones they showed. Run it from the tests directory with python3 sympytable.py, sympy is needed.
+"""
+
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+
+#(topology, gain, beta, vcc, choices) of the recorded designs
+CASES = [("OneStage", 4, 150, 12, (1,)), ("TwoStages", 20, 120, 15, (0, 2)),
+         ("ThreeStages", 60, 150, 12, (0, 1, 2)), ("OneStageF", 3, 180, 10, (2, 0)),
+         ("TwoStagesF", 15, 150, 18, (1, 1, 0)), ("ThreeStagesF", 100, 110, 20, (0, 2, 1, 0)),
+         ("FourStagesDual", 200, 150, 12, (2, 1, 0, 1, 2)), ("FourStagesDual", 126, 100, 20, (0, 0, 0, 0, 0))]
+
+def sympySolvers():
+    """
+    The stage solvers of the original calculators, each one returns the first root found by sympy
+    converted to a float before the engine rounds it
+    """
+
+    from sympy import solve, symbols
+
+    def emitterResistance(gain, beta, vce, RC, RL=None):
+        RE = symbols("RE")
+        if RL is None:
+            return float(solve(((beta*RC)/(((beta*0.025)/(vce/(RE+RC)))+((beta+1)*RE)))-gain)[0])
+        return float(solve(((beta*(1/RC+1/RL)**-1)/((beta+1)*RE+((beta*0.025)/(vce/(RE+RC)))))-gain)[0])
+
+    def emitterResistanceDual(gain, beta, Rpi, RC, RL):
+        RE = symbols("RE")
+        return float(solve(((beta*((1/RC+1/RL)**-1))/(Rpi+((beta+1)*RE)))-gain)[0])
+
+    def theveninResistance(Req, Rin):
+        Rth = symbols("Rth")
+        return float(solve(((1/Rth+1/Req)**-1)-Rin)[0])
+
+    def dividerResistance(Veq, Rth):
+        R1 = symbols("R1")
+        return float(solve(((Veq/(1+Veq))*R1)-Rth)[0])
+
+    return {"emitterResistance": emitterResistance, "emitterResistanceDual": emitterResistanceDual,
+            "theveninResistance": theveninResistance, "dividerResistance": dividerResistance}
+
+@contextlib.contextmanager
+def sympyEngine():
+    #The solvers of the engine are replaced only inside the block
+    solvers = sympySolvers()
+    original = {name: getattr(engine, name) for name in solvers}
+    for name, function in solvers.items():
+        setattr(engine, name, function)
+    try:
+        yield engine
+    finally:
+        for name, function in original.items():
+            setattr(engine, name, function)
+
+def table(cases=CASES):
+    """
+    The recorded rows: the case and the (RC, RE, R1, R2, RB) of each stage from the input to the output
+    """
+
+    rows = []
+    with sympyEngine():
+        for name, gain, beta, vcc, choices in cases:
+            result = engine.designTopology(name, gain, beta, vcc, choices, cache=None)
+            stages = [tuple(None if value is None else float(value) for value in (stage.RC, stage.RE, stage.R1, stage.R2, stage.RB))
+                      for stage in result.stages]
+            rows.append((name, gain, beta, vcc, choices, stages))
+    return rows
+
+def main():
+    print("SYMPY = [")
+    for name, gain, beta, vcc, choices, stages in table():
+        print("    (%r, %r, %r, %r, %r, [" % (name, gain, beta, vcc, choices))
+        for stage in stages:
+            print("        %r," % (stage,))
+        print("    ]),")
+    print("]")
+
+if __name__ == "__main__":
+    main()
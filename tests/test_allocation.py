@@ -0,0 +1,43 @@
+"""
+The share of the gain between the inversors keeps the gain and beats the equal share
+"""
+
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from allocation import MIN_IMPROVEMENT, MIN_STAGE_GAIN, allocate, evaluateShares
+from engine import TABLES, design
+
+#Designs of every kind of the calculators: gain, beta, vcc, follower and dual
+DESIGNS = [(20, 120, 15, False, False), (60, 150, 12, False, False), (100, 110, 20, True, False),
+           (15, 180, 18, True, False), (200, 150, 12, True, True), (250, 100, 20, True, True)]
+
+def _equal(result):
+    n = len(TABLES[result.topology])-result.follower
+    gains = np.full((1, n), result.gain**(1/n))
+    values = evaluateShares(result.topology, result.gain, result.beta, result.vcc, result.choices, gains)
+    return {field: value[0] for field, value in values.items()}
+
+@pytest.mark.parametrize("gain, beta, vcc, follower, dual", DESIGNS)
+@pytest.mark.parametrize("objective", ["swing", "current"])
+def test_allocate(gain, beta, vcc, follower, dual, objective):
+    original = design(gain, beta, vcc, follower, dual, rng=random.Random(0), cache=None)
+    result = allocate(original, objective)
+    assert math.prod(result.gains) == pytest.approx(gain, rel=1e-9)
+    assert min(result.gains) >= MIN_STAGE_GAIN or result.design is original
+    assert result.design.choices == original.choices
+    equal = _equal(original)
+    assert result.gainError <= equal["gainError"]+1e-12
+    #A new share is only taken when it is MIN_IMPROVEMENT better
+    factor = 1+MIN_IMPROVEMENT if result.design is not original else 1
+    if objective == "swing":
+        assert result.swing >= equal["swing"]*factor*(1-1e-12)
+    else:
+        assert result.current*factor <= equal["current"]*(1+1e-12)
+    #The inversors of the design have the gains reported, from the input to the output
+    inversors = [stage.gain for stage in result.design.stages if stage.RC is not None]
+    assert inversors == pytest.approx(list(result.gains), rel=1e-9)
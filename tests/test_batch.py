@@ -0,0 +1,57 @@
+"""
+The batch designer against the engine, design by design
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch import designBatch, designTopologyBatch, stageFields
+from engine import NAMED, designTopology
+
+#Relative difference accepted, the kernels and the solver only differ in the last bits
+RELATIVE = 1e-9
+#Difference accepted when a value falls on a rounding tie of the two decimals
+CENT = 0.01+1e-6
+
+#Grid of the inputs, with the gains of every range of makeCircuit and makeAmp2
+GAINS = (2, 4.5, 5, 6, 13, 25, 26, 80, 125)
+GAINS_DUAL = (126, 180, 250, 300)
+BETAS = (100, 150, 200)
+VCCS = (10, 15, 20)
+
+def _grid(gains):
+    gain, beta, vcc = np.meshgrid(gains, BETAS, VCCS, indexing="ij")
+    return gain.ravel(), beta.ravel(), vcc.ravel()
+
+def _compare(name, record):
+    expected = designTopology(name, record["gain"], record["beta"], record["vcc"], tuple(record["choices"].tolist()), cache=None)
+    assert expected.topology == name
+    for (suffix, fields), stage in zip(stageFields(name), expected.stages):
+        for field in fields:
+            value = getattr(stage, field)
+            assert record[field+suffix] == pytest.approx(value, rel=RELATIVE, abs=CENT if field != "RC" else 0)
+
+@pytest.mark.parametrize("follower, dual", [(False, False), (True, False), (True, True)])
+def test_designBatchMatchesEngine(follower, dual):
+    gain, beta, vcc = _grid(GAINS_DUAL if dual else GAINS)
+    results = designBatch(gain, beta, vcc, follower, dual, rng=np.random.default_rng(1))
+    assert sorted(np.concatenate([records["index"] for records in results.values()]).tolist()) == list(range(gain.size))
+    for name, records in results.items():
+        for record in records:
+            assert record["gain"] == gain[record["index"]]
+            _compare(name, record)
+
+def test_everyNamedTopology():
+    #Every design of the calculators is reached by the grids above
+    names = set()
+    for follower, dual in [(False, False), (True, False), (True, True)]:
+        gain, beta, vcc = _grid(GAINS_DUAL if dual else GAINS)
+        names |= set(designBatch(gain, beta, vcc, follower, dual, rng=np.random.default_rng(1)))
+    assert set(NAMED) <= names
+
+@pytest.mark.parametrize("name", ["Cascade5", "Cascade5F", "Cascade6Dual"])
+def test_cascadeMatchesEngine(name):
+    gain, beta, vcc = _grid((300,) if name.endswith("Dual") else (60, 125))
+    for record in designTopologyBatch(name, gain, beta, vcc, rng=np.random.default_rng(2)):
+        _compare(name, record)
@@ -0,0 +1,43 @@
+"""
+Ranking of every resistor combination of a design
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from candidates import allChoices, bestChoices, rank, rankTopology
+from engine import NAMED, TABLES, designTopology
+
+#Gain designed with each topology
+GAINS = {"OneStage": 4, "TwoStages": 20, "ThreeStages": 60, "OneStageF": 3, "TwoStagesF": 15, "ThreeStagesF": 100,
+         "FourStagesDual": 200}
+
+@pytest.mark.parametrize("name", NAMED)
+def test_allChoices(name):
+    choices = allChoices(name)
+    assert len(choices) == np.prod([len(options) for options in TABLES[name]])
+    assert len(set(map(tuple, choices.tolist()))) == len(choices)
+    assert (choices >= 0).all() and (choices < [len(options) for options in TABLES[name]]).all()
+
+@pytest.mark.parametrize("name", NAMED)
+def test_rankTopology(name):
+    ranked = rankTopology(name, GAINS[name], 150, 12)
+    assert len(ranked) == len(allChoices(name))
+    assert (np.diff(ranked["score"][np.isfinite(ranked["score"])]) >= 0).all()
+    #The best combination is a valid design of the engine, ranked the same every time
+    best = bestChoices(name, GAINS[name], 150, 12)
+    assert best == tuple(ranked[0]["choices"].tolist()) == bestChoices(name, GAINS[name], 150, 12)
+    assert np.isfinite(ranked[0]["score"])
+    result = designTopology(name, GAINS[name], 150, 12, best, cache=None)
+    assert all(value is None or value > 0 for stage in result.stages for value in (stage.RC, stage.RE, stage.R1, stage.R2))
+
+def test_weights():
+    #With only the gain error in the score the first combination has the smallest error
+    ranked = rankTopology("ThreeStagesF", 100, 110, 20, {"gainError": 1.0, "current": 0.0, "power": 0.0})
+    valid = ranked[np.isfinite(ranked["score"])]
+    assert valid[0]["gainError"] == valid["gainError"].min()
+
+def test_rankPicksTheTopologyOfMakeCircuit():
+    assert rank(20, 150, 12, follower=True).dtype == rankTopology("TwoStagesF", 20, 150, 12).dtype
+    assert designTopology("FourStagesDual", 200, 150, 12, "best", cache=None).choices == bestChoices("FourStagesDual", 200, 150, 12)
@@ -0,0 +1,47 @@
+"""
+Chains of any number of stages and their agreement with the designs of the calculators
+"""
+
+import math
+import random
+
+import pytest
+
+from engine import MAX_GAIN_DUAL, NAMED, TABLES, cascade, design, designCascade, designTopology, dualStages
+
+def test_cascadeNames():
+    assert [cascade(n) for n in (1, 2, 3, 4)] == ["OneStage", "TwoStages", "ThreeStages", "Cascade4"]
+    assert [cascade(n, follower=True) for n in (3, 7)] == ["ThreeStagesF", "Cascade7F"]
+    assert [cascade(n, dual=True) for n in (4, 5)] == ["FourStagesDual", "Cascade5Dual"]
+
+def test_cascadeTables():
+    #The tables continue the ones of the named designs, from the last stage to the first one
+    assert TABLES["Cascade5F"][0] == TABLES["ThreeStagesF"][0]
+    assert len(TABLES["Cascade5F"]) == 6 and len(TABLES["Cascade6Dual"]) == 7
+    assert TABLES["Cascade6Dual"][0] == TABLES["FourStagesDual"][0]
+    for name in ("Cascade0", "Cascade05", "Cascade3X"):
+        with pytest.raises(KeyError):
+            TABLES[name]
+
+def test_dualStages():
+    assert dualStages(126) == dualStages(MAX_GAIN_DUAL) == 4
+    assert dualStages(MAX_GAIN_DUAL*1.01) == 5
+    for gain in (300, 1000, 1e5):
+        stages = dualStages(gain)
+        assert MAX_GAIN_DUAL**((stages-1)/4) < gain <= MAX_GAIN_DUAL**(stages/4)
+
+@pytest.mark.parametrize("name", NAMED)
+def test_namedDesignsAreCascades(name):
+    #Every calculator is the cascade of its resistors
+    result = designTopology(name, 200 if name.endswith("Dual") else 20, 150, 12, rng=random.Random(3), cache=None)
+    resistors = [options[i] for options, i in zip(TABLES[name], result.choices)][::-1]
+    assert designCascade(result.gain, result.beta, result.vcc, resistors, result.follower, result.dual) == result.stages
+
+@pytest.mark.parametrize("stages, follower, dual, gain", [(5, False, False, 300), (6, True, False, 2000), (6, False, True, 1000)])
+def test_longCascades(stages, follower, dual, gain):
+    result = design(gain, 150, 15, follower, dual, rng=random.Random(4), cache=None, stages=stages)
+    assert result.topology == cascade(stages, follower or dual, dual)
+    inversors = [stage for stage in result.stages if stage.RC is not None]
+    assert len(inversors) == stages and len(result.stages) == stages+(follower or dual)
+    assert math.prod(stage.gain for stage in inversors) == pytest.approx(gain, rel=1e-9)
+    assert all(value > 0 for stage in result.stages for value in (stage.RE, stage.R1 or 1, stage.R2 or 1))
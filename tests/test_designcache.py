@@ -0,0 +1,49 @@
+"""
+Counters and order of the least recently used cache of designs
+"""
+
+from designcache import DesignCache
+
+def _calculate(key, calls):
+    def calculate():
+        calls.append(key)
+        return ("design", key)
+    return calculate
+
+def test_hitsMissesEvictions():
+    cache = DesignCache(2)
+    calls = []
+    assert cache.get("a", _calculate("a", calls)) == ("design", "a")
+    assert cache.get("a", _calculate("a", calls)) == ("design", "a")
+    cache.get("b", _calculate("b", calls))
+    cache.get("c", _calculate("c", calls))
+    assert calls == ["a", "b", "c"]
+    assert cache.stats() == {"size": 2, "maxSize": 2, "hits": 1, "misses": 3, "evictions": 1, "hitRate": 0.25}
+
+def test_leastRecentlyUsedIsDropped():
+    cache = DesignCache(2)
+    calls = []
+    cache.get("a", _calculate("a", calls))
+    cache.get("b", _calculate("b", calls))
+    #Using a makes b the oldest one
+    cache.get("a", _calculate("a", calls))
+    cache.get("c", _calculate("c", calls))
+    cache.get("a", _calculate("a", calls))
+    cache.get("b", _calculate("b", calls))
+    assert calls == ["a", "b", "c", "b"]
+
+def test_resizeAndDisable():
+    cache = DesignCache(3)
+    calls = []
+    for key in "abc":
+        cache.get(key, _calculate(key, calls))
+    cache.resize(1)
+    assert cache.stats()["size"] == 1 and cache.stats()["evictions"] == 2
+    cache.get("c", _calculate("c", calls))
+    assert calls == ["a", "b", "c"]
+    cache.resize(0)
+    cache.get("c", _calculate("c", calls))
+    cache.get("c", _calculate("c", calls))
+    assert calls == ["a", "b", "c", "c", "c"]
+    cache.clear()
+    assert cache.stats() == {"size": 0, "maxSize": 0, "hits": 0, "misses": 0, "evictions": 0, "hitRate": 0.0}
@@ -0,0 +1,43 @@
+"""
+Designs written to the SQLite store come back the same, by key and by range
+"""
+
+from designstore import DesignStore
+from engine import designTopology
+
+def _designs():
+    return [designTopology("OneStage", gain, beta, 12, (1,), cache=None) for gain in (2, 3.5, 5) for beta in (100, 150)]+[
+            designTopology("TwoStagesF", 20, 150, vcc, (0, 1, 2), cache=None) for vcc in (10, 20)]
+
+def test_roundTrip(tmp_path):
+    designs = _designs()
+    with DesignStore(str(tmp_path/"designs.sqlite"), batchSize=3) as store:
+        store.putMany(designs)
+    #A new connection to the same file reads what the first one wrote
+    with DesignStore(str(tmp_path/"designs.sqlite")) as store:
+        assert len(store) == len(designs)
+        for design in designs:
+            key = (design.topology, design.gain, design.beta, design.vcc, design.choices)
+            assert store.get(key, lambda: None) == design
+        assert store.stats()["hits"] == len(designs) and store.stats()["misses"] == 0
+
+def test_getCalculatesOnce():
+    design = designTopology("OneStage", 4, 150, 12, (1,), cache=None)
+    calls = []
+    with DesignStore(":memory:") as store:
+        for _ in range(2):
+            assert store.get(("OneStage", 4, 150, 12, (1,)), lambda: calls.append(1) or design) == design
+        assert calls == [1]
+        assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+def test_queryRanges():
+    designs = _designs()
+    with DesignStore(":memory:") as store:
+        store.putMany(designs)
+        #The bounds are included
+        found = list(store.query(topology="OneStage", gain=(2, 3.5), beta=(150, 150)))
+        assert sorted(found) == sorted(d for d in designs if d.topology == "OneStage" and d.gain <= 3.5 and d.beta == 150)
+        assert len(found) == 2
+        assert sorted(store.query(stages=2, follower=True, vcc=(10, 10))) == [designs[-2]]
+        assert list(store.query(gain=(5.01, 6))) == []
+        assert len(list(store.query(dual=False))) == len(designs)
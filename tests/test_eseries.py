@@ -0,0 +1,60 @@
+"""
+Standard values of the E-series and the search of the values of a whole design
+"""
+
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from analysis import VCE_MIN, designStages, evaluateStages
+from engine import NAMED, design
+from eseries import BIAS, SERIES, nearest, search, snap, table
+
+#Inputs of each topology: gain range, follower and dual
+INPUTS = {"OneStage": ((2, 5), False, False), "TwoStages": ((6, 25), False, False), "ThreeStages": ((26, 125), False, False),
+          "OneStageF": ((2, 5), True, False), "TwoStagesF": ((6, 25), True, False), "ThreeStagesF": ((26, 125), True, False),
+          "FourStagesDual": ((126, 250), True, True)}
+
+@pytest.mark.parametrize("value, expected", [(0.5, 1.0), (1.0, 1.0), (9.53, 9.1), (9.54, 10.0), (10.0, 10.0),
+                                             (95.3, 91.0), (95.4, 100.0), (9539, 9100.0), (9540, 10000.0),
+                                             (10000.0, 10000.0), (99999.0, 100000.0), (2e7, 1e7)])
+def test_nearestAtDecades(value, expected):
+    #The midpoint between 9.1 and 10 is sqrt(91) = 9.539, the same in every decade
+    assert nearest(value, "E24") == expected
+    assert nearest(np.array([value]), "E24")[0] == expected
+
+@pytest.mark.parametrize("series", SERIES)
+def test_nearestByRatio(series):
+    values = np.array(table(series)[0])
+    rng = random.Random(0)
+    samples = [10**rng.uniform(0, 7) for _ in range(500)]+list(values)+[value*(1+1e-12) for value in values]
+    found = nearest(np.array(samples), series)
+    for sample, value in zip(samples, found):
+        assert value == nearest(sample, series)
+        assert abs(math.log(value/sample)) <= np.abs(np.log(values/sample)).min()+1e-12
+
+def _keepsBias(result, original):
+    #The same check of search(): the collector currents of the design evaluated again
+    stages = [(suffix, {field: np.float64(value) for field, value in values.items()}) for suffix, values in designStages(original)]
+    nominal = evaluateStages(stages, np.float64(original.beta), np.float64(original.vcc), original.dual)
+    return all(abs(result.values["IC"+suffix]/nominal["IC"+suffix]-1) <= BIAS and result.values["VCE"+suffix] > VCE_MIN
+               for suffix, _ in stages)
+
+@pytest.mark.parametrize("name", NAMED)
+def test_searchNotWorseThanSnap(name):
+    (low, high), follower, dual = INPUTS[name]
+    rng = random.Random(1)
+    for _ in range(10):
+        original = design(rng.uniform(low, high), rng.randint(100, 200), rng.randint(10, 20), follower, dual, rng=rng, cache=None)
+        assert original.topology == name
+        for series in ("E12", "E24", "E96"):
+            found, nearestValues = search(original, series), snap(original, series)
+            #The nearest values are only beaten by values that keep the bias when they don't
+            if _keepsBias(nearestValues, original):
+                assert abs(found.error) <= abs(nearestValues.error)
+            for stage in found.design.stages:
+                for value in (stage.RC, stage.RE, stage.R1, stage.R2):
+                    assert value is None or value in table(series)[0]
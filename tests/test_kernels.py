@@ -0,0 +1,49 @@
+"""
+The NumPy kernels of the batch tools against the closed form solver of the engine
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import kernels
+import solver
+
+#Relative difference accepted between a kernel and the solver
+RELATIVE = 1e-9
+
+#Inputs of each equation: gain, beta, vce or Rpi, RC and RL, as the stages use them
+STAGES = [(4, 150, 5.5, 15500, None), (2.7, 120, 6.2, 10500, 180000), (1.5, 100, 3.1, 4000, 35000),
+          (6.0, 200, 9.0, 28500, 520000)]
+DUAL = [(4.2, 150, 4500, 7500, 700000), (3.1, 100, 2600, 4000, 17822), (2.0, 180, 9000, 5000, 250000)]
+THEVENIN = [(210000, 48000), (1.2e6, 300000), (9000, 4500)]
+DIVIDER = [(0.18, 48000), (2.5, 300000), (0.05, 36000)]
+
+@pytest.fixture(scope="module")
+def functions():
+    try:
+        return kernels.load()
+    except ImportError:
+        pytest.skip("sympy is needed to build the kernels")
+
+def _check(kernel, expected, *arguments):
+    #Every case at once, as the batch module calls them
+    values = kernel(*(np.array(column, dtype=float) for column in zip(*arguments)))
+    assert values == pytest.approx(expected, rel=RELATIVE)
+
+def test_emitterResistance(functions):
+    loaded = [row for row in STAGES if row[4] is not None]
+    _check(functions["emitterResistance"], [solver.emitterResistance(*row) for row in loaded], *loaded)
+
+def test_emitterResistanceUnloaded(functions):
+    unloaded = [row[:4] for row in STAGES]
+    _check(functions["emitterResistanceUnloaded"], [solver.emitterResistance(*row, RL=None) for row in unloaded], *unloaded)
+
+def test_emitterResistanceDual(functions):
+    _check(functions["emitterResistanceDual"], [solver.emitterResistanceDual(*row) for row in DUAL], *DUAL)
+
+def test_theveninResistance(functions):
+    _check(functions["theveninResistance"], [solver.theveninResistance(*row) for row in THEVENIN], *THEVENIN)
+
+def test_dividerResistance(functions):
+    _check(functions["dividerResistance"], [solver.dividerResistance(*row) for row in DIVIDER], *DIVIDER)
@@ -0,0 +1,64 @@
+"""
+The interpolated designs of the tables against the exact ones
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch import stageFields
+from engine import designTopology
+from lookuptable import GAINS, LookupTable, build
+
+#Relative difference accepted between an interpolated value and the exact one, with the default grid
+RELATIVE = 3e-3
+#Queries of each design
+QUERIES = 200
+
+@pytest.fixture(scope="module")
+def directory(tmp_path_factory):
+    path = tmp_path_factory.mktemp("Tables")
+    for name in GAINS:
+        build(name, str(path))
+    return str(path)
+
+def _queries(table, rng):
+    low, high = GAINS[table.name]
+    gain = np.exp(rng.uniform(np.log(low), np.log(high), QUERIES))
+    beta, vcc = rng.uniform(100, 200, QUERIES), rng.uniform(10, 20, QUERIES)
+    choices = np.stack([rng.integers(0, size, QUERIES) for size in table.sizes], axis=1)
+    return gain, beta, vcc, choices
+
+@pytest.mark.parametrize("name", GAINS)
+def test_lookupMatchesRefine(directory, name):
+    table = LookupTable(name, directory)
+    gain, beta, vcc, choices = _queries(table, np.random.default_rng(0))
+    found = table.lookup(gain, beta, vcc, choices)
+    exact = table.lookup(gain, beta, vcc, choices, refine=True)
+    assert (found["choices"] == choices).all()
+    for field in table.fields:
+        assert found[field] == pytest.approx(exact[field], rel=RELATIVE)
+    #The exact values are the designs of the engine
+    for k in range(0, QUERIES, 40):
+        expected = designTopology(name, gain[k], beta[k], vcc[k], tuple(choices[k].tolist()), cache=None)
+        for (suffix, fields), stage in zip(stageFields(name), expected.stages):
+            for field in fields:
+                assert exact[k][field+suffix] == pytest.approx(getattr(stage, field), rel=1e-9, abs=0.01+1e-6)
+
+def test_lookupOnTheGrid(directory):
+    #At the points of the grid the table gives the values it saved
+    table = LookupTable("TwoStagesF", directory)
+    gain = np.clip(np.exp(np.linspace(np.log(5), np.log(26), 48))[[0, 7, 20, 47]], 5, 26)
+    found = table.lookup(gain, 150, 20, (1, 2, 0))
+    exact = table.lookup(gain, 150, 20, (1, 2, 0), refine=True)
+    for field in table.fields:
+        assert found[field] == pytest.approx(exact[field], rel=1e-9)
+
+def test_lookupRejects(directory):
+    table = LookupTable("OneStage", directory)
+    with pytest.raises(ValueError, match="gain outside"):
+        table.lookup(7, 150, 12, (0,))
+    with pytest.raises(ValueError, match="needs 1 choices"):
+        table.lookup(4, 150, 12, (0, 1))
+    with pytest.raises(ValueError, match="between 0 and"):
+        table.lookup(4, 150, 12, (3,))
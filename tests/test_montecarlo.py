@@ -0,0 +1,39 @@
+"""
+Monte Carlo tolerance analysis of the designs
+"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from engine import design
+from montecarlo import PERCENTILES, report, samples
+
+#Designs of every kind of the calculators: gain, beta, vcc, follower and dual
+DESIGNS = [(4, 150, 12, False, False), (60, 150, 12, False, False), (20, 120, 15, True, False), (200, 150, 12, True, True)]
+
+@pytest.mark.parametrize("gain, beta, vcc, follower, dual", DESIGNS)
+def test_withoutToleranceEverySampleIsTheDesign(gain, beta, vcc, follower, dual):
+    original = design(gain, beta, vcc, follower, dual, rng=random.Random(0), cache=None)
+    values = samples(original, 100, 0.0, (beta, beta), np.random.default_rng(0))
+    assert np.ptp(values["gain"]) == 0
+    assert values["gain"][0] == pytest.approx(gain, rel=0.05)
+    result = report(original, 100, 0.0, (beta, beta), rng=np.random.default_rng(0))
+    assert result["yield"] == 1.0
+
+@pytest.mark.parametrize("gain, beta, vcc, follower, dual", DESIGNS)
+def test_report(gain, beta, vcc, follower, dual):
+    original = design(gain, beta, vcc, follower, dual, rng=random.Random(0), cache=None)
+    tight = report(original, 20000, 0.01, rng=np.random.default_rng(1))
+    loose = report(original, 20000, 0.2, rng=np.random.default_rng(1))
+    assert tight == report(original, 20000, 0.01, rng=np.random.default_rng(1))
+    assert 0 <= loose["yield"] <= tight["yield"] <= 1
+    for field, percentiles in tight.items():
+        if isinstance(percentiles, dict):
+            assert list(percentiles) == list(PERCENTILES)
+            assert list(percentiles.values()) == sorted(percentiles.values())
+    #Wider tolerances spread the gain more
+    assert loose["gain"][99]-loose["gain"][1] > tight["gain"][99]-tight["gain"][1]
+    assert tight["gain"][1] <= gain*1.1 and tight["gain"][99] >= gain*0.9
@@ -0,0 +1,54 @@
+"""
+The DC operating point against the bias solved by hand and its convergence in every topology
+"""
+
+import math
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from engine import NAMED, designTopology
+from operatingpoint import IS, VT, circuit, operatingPoint, records
+
+#Largest number of Newton iterations expected from the first guess
+ITERATIONS = 8
+#Gain designed with each topology
+GAINS = {"OneStage": 4, "TwoStages": 20, "ThreeStages": 60, "OneStageF": 4, "TwoStagesF": 20, "ThreeStagesF": 60,
+         "FourStagesDual": 200, "Cascade5": 100, "Cascade5F": 100, "Cascade6Dual": 230}
+
+def _thevenin(R1, R2, RC, RE, beta, vcc):
+    #Thevenin equivalent of the divider, VBE from the exponential of the transistor until it settles
+    VTh, RTh = vcc*R2/(R1+R2), R1*R2/(R1+R2)
+    VBE = 0.7
+    for _ in range(100):
+        IB = (VTh-VBE)/(RTh+(beta+1)*RE)
+        VBE = VT*math.log(beta*IB/IS+1)
+    IC = beta*IB
+    return IC, vcc-IC*RC-(IC+IB)*RE
+
+def test_oneStageThevenin():
+    result = designTopology("OneStage", 4, 150, 12, (1,), cache=None)
+    stage = result.stages[0]
+    IC, VCE = _thevenin(stage.R1, stage.R2, stage.RC, stage.RE, 150, 12)
+    values = operatingPoint(result)
+    assert values["converged"]
+    assert values["IC_1"] == pytest.approx(IC, rel=1e-6)
+    assert values["VCE_1"] == pytest.approx(VCE, rel=1e-6)
+    #The calculators assume VBE = 0.7 V, the current they expect is close to the real one
+    assert values["IC_1"] == pytest.approx(stage.IC, rel=0.05)
+
+@pytest.mark.parametrize("name", GAINS)
+def test_converges(name):
+    gain = GAINS[name]
+    rng = random.Random(0)
+    designs = [designTopology(name, gain, beta, vcc, rng=rng, cache=None) for beta in (100, 150, 200) for vcc in (10, 15, 20)]
+    values = circuit(name).solve(records(designs))
+    assert values["converged"].all()
+    assert values["iterations"] <= ITERATIONS
+    for suffix in circuit(name).suffixes:
+        assert (values["VCE"+suffix] > 0.2).all()
+
+def test_everyNamedTopology():
+    assert set(NAMED) <= set(GAINS)
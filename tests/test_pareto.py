@@ -0,0 +1,52 @@
+"""
+The non-dominated points and the fronts of the free choices of a design
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from candidates import rankTopology
+from pareto import OBJECTIVES, front, frontTopology, nonDominated
+
+def _dominates(a, b):
+    return bool(np.all(a <= b) and np.any(a < b))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_nonDominated(seed):
+    rng = np.random.default_rng(seed)
+    #Few levels so there are ties and repeated points
+    points = rng.integers(0, 6, (200, 3)).astype(float)
+    index = nonDominated(points)
+    kept = points[index]
+    assert len(set(map(tuple, kept))) == len(kept)
+    for a in kept:
+        assert not any(_dominates(b, a) for b in kept)
+    #Every other point is dominated by a kept point or repeats one
+    for i, point in enumerate(points):
+        if i not in index:
+            assert any(_dominates(b, point) or np.array_equal(b, point) for b in kept)
+
+def test_nonDominatedEdges():
+    assert nonDominated(np.zeros((0, 2))).tolist() == []
+    assert nonDominated(np.array([[1.0, 2.0]])).tolist() == [0]
+    assert nonDominated(np.array([[1.0, 2.0], [2.0, 1.0], [2.0, 2.0]])).tolist() == [0, 1]
+
+def _minimized(population):
+    return np.stack([-population[field] if larger else population[field] for field, larger in OBJECTIVES.items()], axis=1)
+
+@pytest.mark.parametrize("gain, follower, dual", [(20, True, False), (60, False, False), (200, True, True)])
+def test_front(gain, follower, dual):
+    population = front(gain, 150, 12, follower, dual, size=2000, batchSize=500, rng=np.random.default_rng(0))
+    assert len(population) > 0 and population["valid"].all()
+    assert (np.diff(population["current"]) >= 0).all()
+    objectives = _minimized(population)
+    for i in range(len(objectives)):
+        assert not any(_dominates(objectives[j], objectives[i]) for j in range(len(objectives)) if j != i)
+
+def test_frontTopologyKeepsTheCalculatorsChoices():
+    #With the assumptions of the calculators every combination is tried, the best gain error is on the front
+    population = frontTopology("ThreeStagesF", 60, 150, 12, rng=np.random.default_rng(0))
+    ranked = rankTopology("ThreeStagesF", 60, 150, 12)
+    best = ranked[np.argmin(np.where(np.isfinite(ranked["score"]), ranked["gainError"], np.inf))]
+    assert population["gainError"].min() == pytest.approx(best["gainError"])
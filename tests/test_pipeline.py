@@ -0,0 +1,46 @@
+"""
+The pipeline reports the invalid rows and designs the rest
+"""
+
+import csv
+import io
+import random
+
+from engine import design
+from pipeline import parseRow, processChunk, run
+
+CSV = """gain,beta,vcc,follower,seed
+4,150,12,,1
+60,150,abc,,2
+20,120,15,yes,3
+
+300,150,12,,4
+"""
+
+def test_parseRow():
+    request = parseRow({"gain": " 4 ", "beta": "150.5", "vcc": "", "follower": "Sí", "seed": "7", None: "extra"})
+    assert request == {"gain": 4, "beta": 150.5, "follower": True, "seed": 7}
+
+def test_processChunk():
+    lines = CSV.splitlines()
+    header = lines[0].split(",")
+    out = processChunk(lines[1:], 2, header)
+    #The empty line gives no result, the rest keep their line numbers
+    assert [values["line"] for values in out] == [2, 3, 4, 6]
+    assert [values["status"] for values in out] == ["ok", "error", "ok", "error"]
+    assert out[1]["reason"] == "vcc must be a number"
+    assert out[3]["reason"] == "gain must be between 2 and 125"
+    #A row with a seed gets the design of the engine with that seed
+    expected = design(4, 150, 12, rng=random.Random(1), cache=None)
+    assert out[0]["topology"] == "OneStage"
+    assert (out[0]["RC_1"], out[0]["RE_1"], out[0]["R1_1"], out[0]["R2_1"]) == (expected.stages[0].RC, expected.stages[0].RE, expected.stages[0].R1, expected.stages[0].R2)
+    assert out[2]["topology"] == "TwoStagesF" and out[2]["follower"]
+
+def test_run():
+    output = io.StringIO()
+    rows, invalid = run(io.StringIO(CSV), output, seed=5)
+    assert (rows, invalid) == (4, 2)
+    written = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert [row["status"] for row in written] == ["ok", "error", "ok", "error"]
+    assert written[1]["line"] == "3" and written[1]["RC_1"] == ""
+    assert float(written[2]["RE_S"]) > 0
@@ -0,0 +1,104 @@
+"""
+The HTTP service answers, rejects and recovers as its clients expect
+"""
+
+import asyncio
+import json
+import os
+
+from concurrent.futures.process import BrokenProcessPool
+
+from service import MAX_BODY, MAX_LINE, Service
+
+#Seconds allowed to each test
+TIMEOUT = 60
+
+def _run(test, **options):
+    #Serves on a free port of this machine while the test runs, the test gets the service and the port
+    async def main():
+        service = Service(workers=1, **options)
+        service.start()
+        server = await asyncio.start_server(service.connection, "127.0.0.1", 0, limit=MAX_LINE)
+        try:
+            await asyncio.wait_for(test(service, server.sockets[0].getsockname()[1]), TIMEOUT)
+        finally:
+            server.close()
+            await service.close()
+    asyncio.run(main())
+
+async def _request(port, method, path, body=b"", headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = ["%s %s HTTP/1.1" % (method, path), "Connection: close"]
+    head += headers if headers is not None else ["Content-Length: %d" % len(body)]
+    writer.write(("\r\n".join(head)+"\r\n\r\n").encode()+body)
+    await writer.drain()
+    answer = await reader.read()
+    writer.close()
+    start, _, data = answer.partition(b"\r\n\r\n")
+    lines = start.decode().split("\r\n")
+    return int(lines[0].split()[1]), lines[1:], json.loads(data)
+
+def _design(request):
+    return json.dumps(request).encode()
+
+def test_design():
+    async def test(service, port):
+        status, _, answer = await _request(port, "POST", "/design", _design({"gain": 20, "beta": 120, "vcc": 15, "seed": 3}))
+        assert status == 200
+        assert answer["topology"] == "TwoStages" and len(answer["stages"]) == 2
+        status, _, answer = await _request(port, "GET", "/metrics")
+        assert status == 200 and answer["designs"] == 1 and answer["batches"] == 1 and "p50" in answer["latency"]
+    _run(test)
+
+def test_badTopology():
+    async def test(service, port):
+        status, _, answer = await _request(port, "POST", "/design", _design({"gain": 20, "beta": 120, "vcc": 15, "topology": "Cascade9"}))
+        assert status == 400 and "unknown topology" in answer["error"]
+        status, _, answer = await _request(port, "POST", "/design", _design({"gain": 20, "beta": 120, "vcc": 15, "topology": "TwoStagesF"}))
+        assert status == 400 and "doesn't match" in answer["error"]
+    _run(test)
+
+def test_oversized():
+    async def test(service, port):
+        status, _, answer = await _request(port, "POST", "/design", headers=["Content-Length: %d" % (MAX_BODY+1)])
+        assert status == 413
+        status, _, answer = await _request(port, "GET", "/health", headers=["X-Long: " + "a"*MAX_LINE])
+        assert status == 413
+        status, _, answer = await _request(port, "POST", "/design", headers=["Content-Length: -1"])
+        assert status == 400
+    _run(test)
+
+def test_shortBody():
+    async def test(service, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /design HTTP/1.1\r\nContent-Length: 100\r\n\r\n{}")
+        writer.write_eof()
+        answer = await reader.read()
+        writer.close()
+        assert answer.startswith(b"HTTP/1.1 400")
+    _run(test)
+
+def test_queueFull():
+    async def test(service, port):
+        #The dispatcher is stopped, so the request already queued keeps the only place
+        service._dispatcher.cancel()
+        assert service.submit([(None, 20, 120, 15, False, False, None, None, None)]) is not None
+        status, headers, answer = await _request(port, "POST", "/design", _design({"gain": 20, "beta": 120, "vcc": 15}))
+        assert status == 503 and "Retry-After: 1" in headers
+        assert service.metrics()["rejected"] == 1
+    _run(test, queueSize=1)
+
+def test_brokenPool():
+    async def test(service, port):
+        #A worker that dies breaks the pool, the requests get 503 and the next ones a new pool
+        broken = service.executor
+        try:
+            await asyncio.wrap_future(broken.submit(os._exit, 1))
+        except BrokenProcessPool:
+            pass
+        status, headers, _ = await _request(port, "POST", "/design", _design({"gain": 20, "beta": 120, "vcc": 15}))
+        assert status == 503 and "Retry-After: 1" in headers
+        assert service.executor is not broken and service.metrics()["restarts"] == 1
+        status, _, answer = await _request(port, "POST", "/design", _design({"gain": 20, "beta": 120, "vcc": 15}))
+        assert status == 200 and answer["topology"] == "TwoStages"
+    _run(test)
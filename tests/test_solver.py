@@ -0,0 +1,77 @@
+"""
+The closed form solver against the results of the sympy calculators it replaced
+
+SYMPY was written by sympytable.py, which designs every case with the engine and its four stage
+solvers replaced by sympy.solve() over the expressions of the original calculators. The calculators
+show every resistor rounded to two decimals, so every value must match at that rounding.
+"""
+
+import pytest
+
+from engine import designTopology
+
+#Decimals of the resistors shown by the calculators
+DECIMALS = 2
+
+#(topology, gain, beta, vcc, choices, (RC, RE, R1, R2, RB) of each stage from the input to the output)
+SYMPY = [
+    ('OneStage', 4, 150, 12, (1,), [
+        (15500.0, 3769.58, 305579.29, 56543.7, None),
+    ]),
+    ('TwoStages', 20, 120, 15, (0, 2), [
+        (19500.0, 2213.85, 245504.43, 26566.2, None),
+        (10500.0, 2286.2, 174188.7, 27434.4, None),
+    ]),
+    ('ThreeStages', 60, 150, 12, (0, 1, 2), [
+        (28500.0, 4036.56, 442493.71, 60548.4, None),
+        (18500.0, 3236.33, 317063.53, 48544.95, None),
+        (15500.0, 3852.94, 308275.44, 57794.1, None),
+    ]),
+    ('OneStageF', 3, 180, 10, (2, 0), [
+        (10500.0, 3232.65, 251816.98, 58187.7, None),
+        (None, 2000.0, None, None, 410400.0),
+    ]),
+    ('TwoStagesF', 15, 150, 18, (1, 1, 0), [
+        (17500.0, 2983.95, 355859.92, 44759.25, None),
+        (13500.0, 3059.48, 303716.33, 45892.2, None),
+        (None, 1500.0, None, None, 242500.0),
+    ]),
+    ('ThreeStagesF', 100, 110, 20, (0, 2, 1, 0), [
+        (21500.0, 2141.44, 269828.77, 23555.84, None),
+        (18500.0, 2144.36, 247738.44, 23587.96, None),
+        (15500.0, 2558.98, 237780.5, 28148.78, None),
+        (None, 1000.0, None, None, 117700.0),
+    ]),
+    ('FourStagesDual', 200, 150, 12, (2, 1, 0, 1, 2), [
+        (7500.0, 1844.36, 1114295.49, 375940.83, None),
+        (6250.0, 1532.55, 928284.0, 312125.72, None),
+        (5000.0, 1219.31, 742173.54, 247939.99, None),
+        (4250.0, 896.31, 620076.31, 175554.14, None),
+        (None, 235.0, 36163.52, 2139081.16, 35562.30019663038),
+    ]),
+    ('FourStagesDual', 126, 100, 20, (0, 0, 0, 0, 0), [
+        (7000.0, 1896.96, 702300.01, 265233.04, None),
+        (6000.0, 1618.53, 601801.98, 225943.52, None),
+        (5000.0, 1310.79, 500608.95, 181220.49, None),
+        (4000.0, 808.81, 393131.3, 103965.7, None),
+        (None, 175.0, 17822.77, 2519411.05, 17697.57415562453),
+    ]),
+]
+
+def _shown(values):
+    return tuple(None if value is None else round(value, DECIMALS) for value in values)
+
+@pytest.mark.parametrize("name, gain, beta, vcc, choices, stages", SYMPY, ids=["%s-%s" % (row[0], row[1]) for row in SYMPY])
+def test_designMatchesSympy(name, gain, beta, vcc, choices, stages):
+    result = designTopology(name, gain, beta, vcc, choices, cache=None)
+    assert len(result.stages) == len(stages)
+    for stage, expected in zip(result.stages, stages):
+        assert _shown((stage.RC, stage.RE, stage.R1, stage.R2, stage.RB)) == _shown(expected)
+
+def test_tableIsUpToDate():
+    #Written again with sympy, the recorded table must be the one sympytable.py prints
+    pytest.importorskip("sympy")
+    import sympytable
+    assert [row[:5] for row in SYMPY] == sympytable.CASES
+    for recorded, written in zip(SYMPY, sympytable.table()):
+        assert [_shown(stage) for stage in recorded[5]] == [_shown(stage) for stage in written[5]]
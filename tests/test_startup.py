@@ -0,0 +1,51 @@
+"""
+Startup budget of main: importing it must stay cheap so the first window is drawn at once, the design
+engine, PIL, NumPy and sympy are only imported when they are used
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+#Seconds allowed to import main, three times the about 25 ms it takes (PIL is not part of it, it is
+#imported when the first image is loaded)
+BUDGET = 0.075
+#Modules that must not be imported by main at startup
+HEAVY = ("sympy", "PIL", "numpy", "engine", "sweep", "concurrent.futures")
+#The best of a few runs is compared, so a busy machine doesn't fail the test
+RUNS = 5
+
+CODE = """
+import sys, time
+start = time.perf_counter()
+import main
+print(time.perf_counter()-start)
+print(",".join(module for module in %r if module in sys.modules))
+""" % (HEAVY,)
+
+def _importMain():
+    output = subprocess.run([sys.executable, "-c", CODE], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    seconds, modules = output.splitlines()
+    return float(seconds), [module for module in modules.split(",") if module]
+
+def test_importMainSkipsHeavyModules():
+    assert _importMain()[1] == []
+
+def test_importMainBudget():
+    best = min(_importMain()[0] for _ in range(RUNS))
+    assert best < BUDGET, "import main took %.0f ms, the budget is %.0f ms" % (best*1e3, BUDGET*1e3)
+
+def test_imagesExist():
+    #The names are compared as they are on disk, some schematics end in .JPG
+    with open(os.path.join(ROOT, "main.py"), encoding="utf-8") as file:
+        paths = set(re.findall(r"Images/[A-Za-z/]+\.(?:jpg|JPG)", file.read()))
+    assert paths
+    for path in paths:
+        folder, name = os.path.split(os.path.join(ROOT, path))
+        assert name in os.listdir(folder), path